@@ -0,0 +1,129 @@
+"""
+Benchmark of approximate nearest-neighbour retrieval: IVFIndex against exact search.
+
+Builds an IVFIndex over synthetic chunk embeddings of each corpus size
+and compares it with the exact search of NumpyVectorStore on held-out
+queries. Reports recall@k (the share of the exact top k the index also
+returns), the median query latency and the share of rows scored, for a
+range of n_probe, the default marked with *. The matrix is kept in list
+order, as NumpyVectorStore.persist() writes it.
+
+The embeddings mimic sentence embeddings, which vary along few
+directions: chunks scatter around document topics in a 32 dimensional
+latent space that is projected to dim dimensions, plus a little
+isotropic noise. Queries are drawn the same way. Topics overlap, so the
+nearest chunks are often in neighbouring lists.
+
+Usage:
+    python -m benchmarks.bench_ann [--sizes 10000 100000 1000000] [--k 4]
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from rag.ivf_index import IVFIndex, default_n_probe
+from rag.numpy_vector_store import top_k
+
+CHUNKS_PER_TOPIC = 200
+LATENT_DIM = 32
+TOPIC_SPREAD = 1.0
+NOISE = 0.02
+_BLOCK_ROWS = 65536
+
+
+def synthetic_embeddings(n_rows, topics, projection, seed):
+    """(n_rows, dim) unit vectors of chunks around random topics."""
+    rng = np.random.default_rng(seed)
+    vectors = np.empty((n_rows, projection.shape[1]), dtype=np.float32)
+    for start in range(0, n_rows, _BLOCK_ROWS):
+        block = vectors[start : start + _BLOCK_ROWS]
+        latent = topics[rng.integers(0, len(topics), len(block))]
+        latent += TOPIC_SPREAD * rng.standard_normal(latent.shape, dtype=np.float32)
+        block[:] = latent @ projection
+        block += NOISE * rng.standard_normal(block.shape, dtype=np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+    return vectors
+
+
+def timed_search(matrix, queries, k, index=None):
+    """(rows of every query, median seconds, mean rows scored)."""
+    results, seconds, scanned = [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        rows, _ = top_k(matrix, query, k, ann_index=index)
+        seconds.append(time.perf_counter() - start)
+        results.append(rows)
+        if index is None:
+            scanned.append(len(matrix))
+        else:
+            scanned.append(np.diff(index.offsets)[index.probe(query)].sum())
+    return results, statistics.median(seconds), statistics.mean(scanned)
+
+
+def recall(exact, approximate):
+    """Mean share of the exact top k that the approximate search found."""
+    return statistics.mean(
+        len(np.intersect1d(truth, found)) / len(truth)
+        for truth, found in zip(exact, approximate)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=4, help="similarity_top_k")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument(
+        "--n-probe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64]
+    )
+    args = parser.parse_args()
+
+    print(f"{args.dim} dimensions, recall@{args.k}, {args.queries} queries")
+    print(
+        f"\n{'chunks':>9s} {'lists':>6s} {'build s':>8s} {'n_probe':>8s}"
+        f" {'recall':>7s} {'ms':>8s} {'speedup':>8s} {'scanned':>8s}"
+    )
+    for size in args.sizes:
+        rng = np.random.default_rng(size)
+        topics = rng.standard_normal(
+            (max(1, size // CHUNKS_PER_TOPIC), LATENT_DIM), dtype=np.float32
+        )
+        projection = rng.standard_normal(
+            (LATENT_DIM, args.dim), dtype=np.float32
+        ) / np.sqrt(LATENT_DIM)
+        matrix = synthetic_embeddings(size, topics, projection, seed=1)
+        queries = synthetic_embeddings(args.queries, topics, projection, seed=2)
+
+        start = time.perf_counter()
+        index = IVFIndex.build(matrix)
+        build_seconds = time.perf_counter() - start
+        index, order = index.compact(np.arange(size), matrix)
+        matrix = matrix[order]
+        exact, exact_seconds, _ = timed_search(matrix, queries, args.k)
+        print(
+            f"{size:9d} {'-':>6s} {'-':>8s} {'exact':>8s} {1.0:7.3f}"
+            f" {exact_seconds * 1e3:8.2f} {1.0:7.1f}x {100.0:7.1f}%"
+        )
+        default = default_n_probe(index.n_lists)
+        for n_probe in sorted(set(args.n_probe) | {default}):
+            if n_probe > index.n_lists:
+                break
+            index.n_probe = n_probe
+            found, seconds, scanned = timed_search(matrix, queries, args.k, index)
+            label = f"{n_probe}{'*' if n_probe == default else ''}"
+            print(
+                f"{size:9d} {index.n_lists:6d} {build_seconds:8.1f} {label:>8s}"
+                f" {recall(exact, found):7.3f} {seconds * 1e3:8.2f}"
+                f" {exact_seconds / seconds:7.1f}x {100 * scanned / size:7.1f}%"
+            )
+        del matrix
+
+
+if __name__ == "__main__":
+    main()
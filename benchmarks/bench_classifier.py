@@ -0,0 +1,79 @@
+"""
+Benchmark for the combined classifier call.
+
+Compares model.predict + model.predict_proba (two ensemble passes, as the
+frame callbacks did) with a single Classifier.predict pass, and shows the
+per-row cost of Classifier.predict_batch for the batch sizes the inference
+worker builds from concurrent sessions. Uses the trained
+model when it exists, otherwise a random forest on synthetic data.
+
+Usage:
+    python -m benchmarks.bench_classifier [--model PATH] [--runs 200]
+"""
+
+import argparse
+import os
+import timeit
+
+import numpy as np
+
+from hand_signs_engine.classifier import Classifier
+from hand_signs_engine.features import FEATURE_LENGTH
+from hand_signs_engine.mediapipe_config import MODEL_PATH, load_model
+
+
+def synthetic_model(n_classes=29, n_samples=3000, seed=0):
+    """Train a random forest with string class ids like the real model."""
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(seed)
+    x_train = rng.random((n_samples, FEATURE_LENGTH), dtype=np.float32)
+    y_train = rng.integers(0, n_classes, n_samples).astype(str)
+    return RandomForestClassifier(n_estimators=100, random_state=seed).fit(
+        x_train, y_train
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    if os.path.exists(args.model):
+        model = load_model(args.model)
+        print(f"Model: {args.model}")
+    else:
+        model = synthetic_model()
+        print("Model: synthetic RandomForestClassifier(n_estimators=100)")
+
+    classifier = Classifier(model)
+    features = np.random.default_rng(1).random(FEATURE_LENGTH, dtype=np.float32)
+    x_input = features.reshape(1, -1)
+
+    def two_passes():
+        prediction = model.predict(x_input)
+        prediction_proba = model.predict_proba(x_input)
+        return int(prediction[0]), max(prediction_proba[0])
+
+    legacy = timeit.timeit(two_passes, number=args.runs) / args.runs * 1e3
+    single = (
+        timeit.timeit(lambda: classifier.predict(features), number=args.runs)
+        / args.runs
+        * 1e3
+    )
+    print(f"predict + predict_proba: {legacy:7.3f} ms/prediction")
+    print(f"Classifier.predict:      {single:7.3f} ms/prediction")
+    print(f"speedup x{legacy / single:.2f}")
+
+    rng = np.random.default_rng(2)
+    for batch_size in (1, 4, 8, 16, 32):
+        batch = rng.random((batch_size, FEATURE_LENGTH), dtype=np.float32)
+        runs = max(1, args.runs // batch_size)
+        seconds = timeit.timeit(lambda: classifier.predict_batch(batch), number=runs)
+        per_row = seconds / runs / batch_size * 1e3
+        print(f"predict_batch({batch_size:2d}):       {per_row:7.3f} ms/row")
+
+
+if __name__ == "__main__":
+    main()
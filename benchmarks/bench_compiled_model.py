@@ -0,0 +1,62 @@
+"""
+Benchmark of the compiled tree ensemble against scikit-learn.
+
+Compares model.predict_proba with CompiledForest.predict_proba on one
+feature vector and on batches, and reports the largest difference of the
+probabilities. Uses the trained model when it exists, otherwise a random
+forest on synthetic data.
+
+Usage:
+    python -m benchmarks.bench_compiled_model [--model PATH] [--runs 200]
+"""
+
+import argparse
+import os
+import timeit
+
+import numpy as np
+
+from benchmarks.bench_classifier import synthetic_model
+from hand_signs_engine.compiled_model import CompiledForest
+from hand_signs_engine.features import FEATURE_LENGTH
+from hand_signs_engine.mediapipe_config import MODEL_PATH, load_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    if os.path.exists(args.model):
+        model = load_model(args.model)
+        print(f"Model: {args.model}")
+    else:
+        model = synthetic_model()
+        print("Model: synthetic RandomForestClassifier(n_estimators=100)")
+
+    compiled = CompiledForest.from_estimator(model)
+    print(
+        f"{len(compiled.roots)} trees, {len(compiled.feature)} nodes, "
+        f"depth {compiled.depth}"
+    )
+
+    rng = np.random.default_rng(1)
+    x = rng.random((1000, FEATURE_LENGTH), dtype=np.float32)
+    difference = np.abs(model.predict_proba(x) - compiled.predict_proba(x)).max()
+    print(f"max probability difference: {difference:.2g}")
+
+    print(f"\n{'rows':>5s} {'sklearn ms/row':>15s} {'compiled ms/row':>16s} {'x':>6s}")
+    for batch_size in (1, 8, 32, 256):
+        batch = x[:batch_size]
+        runs = max(1, args.runs // batch_size)
+        reference = timeit.timeit(lambda: model.predict_proba(batch), number=runs)
+        fast = timeit.timeit(lambda: compiled.predict_proba(batch), number=runs)
+        print(
+            f"{batch_size:5d} {reference / runs / batch_size * 1e3:15.3f} "
+            f"{fast / runs / batch_size * 1e3:16.3f} {reference / fast:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Microbenchmark for landmark feature extraction.
+
+Compares the original two-pass list implementation of the frame callbacks
+with hand_signs_engine.features.extract_features on synthetic landmarks.
+
+Usage:
+    python -m benchmarks.bench_features [--frames 20000]
+"""
+
+import argparse
+import random
+import timeit
+from types import SimpleNamespace
+
+from hand_signs_engine.features import create_feature_buffer, extract_features
+
+
+def make_hands(n_hands, seed=0):
+    """Build synthetic MediaPipe-like hands with 21 landmarks each."""
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            landmark=[
+                SimpleNamespace(x=rng.random(), y=rng.random(), z=0.0)
+                for _ in range(21)
+            ]
+        )
+        for _ in range(n_hands)
+    ]
+
+
+def legacy_extract(multi_hand_landmarks, expected_length=84):
+    """Feature extraction as it was copy-pasted into every frame callback."""
+    data_aux = []
+    x_ = []
+    y_ = []
+    for hand_landmarks in multi_hand_landmarks:
+        for i in range(len(hand_landmarks.landmark)):
+            x_.append(hand_landmarks.landmark[i].x)
+            y_.append(hand_landmarks.landmark[i].y)
+    for hand_landmarks in multi_hand_landmarks:
+        for i in range(len(hand_landmarks.landmark)):
+            x = hand_landmarks.landmark[i].x
+            y = hand_landmarks.landmark[i].y
+            data_aux.append(x - min(x_))
+            data_aux.append(y - min(y_))
+    if len(data_aux) < expected_length:
+        data_aux += [0] * (expected_length - len(data_aux))
+    return data_aux, min(x_), min(y_)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    buffer = create_feature_buffer()
+    for n_hands in (1, 2):
+        hands = make_hands(n_hands)
+        legacy = timeit.timeit(lambda: legacy_extract(hands), number=args.frames)
+        shared = timeit.timeit(
+            lambda: extract_features(hands, buffer), number=args.frames
+        )
+        legacy_us = legacy / args.frames * 1e6
+        shared_us = shared / args.frames * 1e6
+        print(
+            f"{n_hands} hand(s): legacy {legacy_us:7.2f} us/frame, "
+            f"extract_features {shared_us:7.2f} us/frame, "
+            f"speedup x{legacy_us / shared_us:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark for the per-frame image conversions of the frame callback.
+
+Compares the original conversion chain (bgr24 decode, BGR->RGB, flip, copy
+for drawing, RGB->BGR, encode) with the buffer-reusing pipeline of
+hand_signs_engine.frame_engine (rgb24 decode, flip into the stream's
+buffer, draw and encode from it) on synthetic yuv420p frames as WebRTC
+delivers them. MediaPipe is not part of the measurement. Reports the mean
+time per stage and the bytes allocated per stage (traced with tracemalloc)
+as a number of full-frame buffers.
+
+Usage:
+    python -m benchmarks.bench_frame_pipeline [--frames 300]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import av
+import cv2
+import numpy as np
+
+from hand_signs_engine.frame_buffer import FrameBuffer
+
+RESOLUTIONS = ((640, 480), (1280, 720), (1920, 1080))
+
+
+def make_frame(width, height, seed=0):
+    """Random yuv420p frame like the ones streamlit-webrtc hands over."""
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return av.VideoFrame.from_ndarray(image, format="bgr24").reformat(format="yuv420p")
+
+
+def draw(image):
+    cv2.putText(
+        image, "Hammer", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2
+    )
+    return image
+
+
+def legacy_stages():
+    """Conversion chain as it was in every frame callback."""
+    return [
+        ("decode", lambda frame: frame.to_ndarray(format="bgr24")),
+        ("to_rgb", lambda image: cv2.cvtColor(image, cv2.COLOR_BGR2RGB)),
+        ("flip", lambda image: cv2.flip(image, 1)),
+        ("copy", lambda image: image.copy()),
+        ("draw", draw),
+        ("to_bgr", lambda image: cv2.cvtColor(image, cv2.COLOR_RGB2BGR)),
+        ("encode", lambda image: av.VideoFrame.from_ndarray(image, format="bgr24")),
+    ]
+
+
+def buffered_stages():
+    """Conversion chain of hand_signs_engine.frame_engine."""
+    frame_buffer = FrameBuffer()
+    return [
+        ("decode", lambda frame: frame.to_ndarray(format="rgb24")),
+        ("flip", frame_buffer.mirror),
+        ("draw", draw),
+        ("encode", lambda image: av.VideoFrame.from_ndarray(image, format="rgb24")),
+    ]
+
+
+def run(stages, frame, n_frames):
+    """Return {stage: (mean_us, allocated_bytes_per_frame)}."""
+    times = dict.fromkeys((name for name, _ in stages), 0)
+    allocated = dict.fromkeys(times, 0)
+
+    # Warm up, so buffers that are reused already exist
+    value = frame
+    for _, stage in stages:
+        value = stage(value)
+
+    tracemalloc.start()
+    for _ in range(n_frames):
+        value = frame
+        for name, stage in stages:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter_ns()
+            value = stage(value)
+            times[name] += time.perf_counter_ns() - start
+            allocated[name] += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return {
+        name: (times[name] / n_frames / 1e3, allocated[name] / n_frames)
+        for name in times
+    }
+
+
+def report(label, results, frame_bytes):
+    total_us = sum(us for us, _ in results.values())
+    total_bytes = sum(size for _, size in results.values())
+    print(
+        f"  {label:8s} {total_us:8.1f} us/frame, "
+        f"{total_bytes / frame_bytes:4.1f} frame buffers allocated"
+    )
+    for name, (us, size) in results.items():
+        print(f"    {name:7s} {us:8.1f} us  {size / frame_bytes:4.1f} buffers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    for width, height in RESOLUTIONS:
+        frame = make_frame(width, height)
+        frame_bytes = width * height * 3
+        print(f"{width}x{height}:")
+        report("legacy", run(legacy_stages(), frame, args.frames), frame_bytes)
+        report("buffered", run(buffered_stages(), frame, args.frames), frame_bytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark of parsing and splitting the RAG documents with worker processes.
+
+Runs the parse stage of rag.ingestion (SimpleDirectoryReader plus the
+SentenceSplitter, without embedding) over the documents once per worker
+count and reports the wall time, the speedup over one worker and the
+files that took longest to parse.
+
+Usage:
+    python -m benchmarks.bench_ingestion [--workers 1 2 4] [--limit 20]
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from rag.ingestion import DOCUMENTS_PATH, parse_files, scan_documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", default=str(DOCUMENTS_PATH))
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1})
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Parse N files")
+    args = parser.parse_args()
+
+    documents_dir = Path(args.documents)
+    paths = list(scan_documents(documents_dir))[: args.limit]
+    print(f"{len(paths)} files, {os.cpu_count()} cores")
+
+    print(
+        f"\n{'workers':>7s} {'seconds':>9s} {'files/s':>8s}"
+        f" {'nodes':>7s} {'speedup':>8s}"
+    )
+    baseline = None
+    seconds_per_file = {}
+    for workers in args.workers:
+        start = time.perf_counter()
+        n_nodes = 0
+        for parsed in parse_files(documents_dir, paths, workers):
+            n_nodes += len(parsed.nodes)
+            seconds_per_file[parsed.path] = parsed.seconds
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"{workers:7d} {elapsed:9.1f} {len(paths) / elapsed:8.2f}"
+            f" {n_nodes:7d} {baseline / elapsed:7.2f}x"
+        )
+
+    print("\nSlowest files (last run):")
+    slowest = sorted(seconds_per_file.items(), key=lambda item: item[1], reverse=True)
+    for path, seconds in slowest[:10]:
+        print(f"{seconds:8.2f} s  {path}")
+
+
+if __name__ == "__main__":
+    main()
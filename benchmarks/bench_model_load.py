@@ -0,0 +1,140 @@
+"""
+Benchmark of the model cold start: pickle against the model artifact.
+
+Starts a fresh interpreter per run and measures the time to load the
+model and make one prediction, together with the resident memory the
+model added and how much of it is shared file pages (which all Streamlit
+worker processes mapping the same artifact use only once). Uses the
+trained model when it exists, otherwise a random forest on synthetic data
+written to a temporary directory.
+
+Usage:
+    python -m benchmarks.bench_model_load [--model PATH] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+
+VARIANTS = ("pickle", "pickle+compile", "artifact", "artifact (no mmap)")
+
+
+def statm():
+    """(resident, shared) bytes of this process."""
+    with open("/proc/self/statm") as statm_file:
+        fields = statm_file.read().split()
+    page = os.sysconf("SC_PAGE_SIZE")
+    return int(fields[1]) * page, int(fields[2]) * page
+
+
+def child(variant, model_path, artifact_path):
+    """Load the model in this fresh process and print the measurements."""
+    import time
+
+    import numpy as np
+
+    from hand_signs_engine.compiled_model import compile_model
+    from hand_signs_engine.model_artifact import load_artifact
+
+    features = np.zeros((1, 84), dtype=np.float32)
+    rss_before, shared_before = statm()
+    start = time.perf_counter()
+    if variant.startswith("pickle"):
+        with open(model_path, "rb") as model_file:
+            model = pickle.load(model_file)["model"]
+        if variant == "pickle+compile":
+            model = compile_model(model)
+    else:
+        model = load_artifact(artifact_path, mmap=variant == "artifact").model
+    loaded = time.perf_counter()
+    model.predict_proba(features)
+    predicted = time.perf_counter()
+    rss_after, shared_after = statm()
+    print(
+        json.dumps(
+            {
+                "load_ms": (loaded - start) * 1e3,
+                "first_prediction_ms": (predicted - loaded) * 1e3,
+                "rss_mb": (rss_after - rss_before) / 2**20,
+                "shared_mb": (shared_after - shared_before) / 2**20,
+            }
+        )
+    )
+
+
+def prepare(model_path, directory):
+    """Return (pickle, artifact) paths, creating them when needed."""
+    from hand_signs_engine.mediapipe_config import labels_dict, model_artifact_path
+    from hand_signs_engine.model_artifact import is_artifact, save_artifact
+
+    if not os.path.exists(model_path):
+        from benchmarks.bench_classifier import synthetic_model
+
+        print("Model: synthetic RandomForestClassifier(n_estimators=100)")
+        model_path = os.path.join(directory, "model.p")
+        with open(model_path, "wb") as model_file:
+            pickle.dump({"model": synthetic_model()}, model_file)
+    else:
+        print(f"Model: {model_path}")
+    artifact_path = model_artifact_path(model_path)
+    if not is_artifact(artifact_path):
+        artifact_path = os.path.join(directory, "artifact")
+        with open(model_path, "rb") as model_file:
+            model = pickle.load(model_file)["model"]
+        save_artifact(artifact_path, model, labels_dict, version="benchmark")
+    return model_path, artifact_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    from hand_signs_engine.mediapipe_config import MODEL_PATH
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path, artifact_path = prepare(args.model or MODEL_PATH, directory)
+        print(
+            f"\n{'variant':20s} {'load ms':>9s} {'1st predict ms':>15s}"
+            f" {'RSS MB':>8s} {'shared MB':>10s}"
+        )
+        for variant in VARIANTS:
+            runs = []
+            for _ in range(args.runs):
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "benchmarks.bench_model_load",
+                        "--child",
+                        variant,
+                        model_path,
+                        artifact_path,
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+            median = {
+                key: statistics.median(run[key] for run in runs) for key in runs[0]
+            }
+            print(
+                f"{variant:20s} {median['load_ms']:9.1f}"
+                f" {median['first_prediction_ms']:15.1f}"
+                f" {median['rss_mb']:8.1f} {median['shared_mb']:10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
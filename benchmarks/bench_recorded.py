@@ -0,0 +1,332 @@
+"""
+Benchmark of the classifier path on recorded landmarks.
+
+Replays landmark recordings (see hand_signs_engine.recording, written by
+benchmarks.replay --record) without MediaPipe and reports the throughput
+of feature normalization, predict_proba and the prediction policies. It
+then simulates fixed skip intervals, majority smoothing windows, the
+PredictionSmoother (moving average with hysteresis) and the
+AdaptiveScheduler on the same frames and reports the accuracy, the
+reaction time after the sign changed and the number of classifier runs
+of each setting.
+
+Without recordings a synthetic session of held signs is generated and a
+random forest is trained on the same class prototypes.
+
+Usage:
+    python -m benchmarks.bench_recorded [RECORDING.npz ...] [--model PATH]
+"""
+
+import argparse
+import os
+import time
+from collections import Counter, deque
+from types import SimpleNamespace
+
+import numpy as np
+
+from hand_signs_engine.classifier import Classifier, Prediction
+from hand_signs_engine.features import FEATURE_SHAPE
+from hand_signs_engine.mediapipe_config import MODEL_PATH, labels_dict, load_model
+from hand_signs_engine.motion import MotionGate
+from hand_signs_engine.policies import ChallengePolicy, FreeRecognitionPolicy
+from hand_signs_engine.recording import (
+    NO_LABEL,
+    LandmarkRecording,
+    load_recording,
+    normalize_landmarks,
+)
+from hand_signs_engine.scheduler import AdaptiveScheduler
+from hand_signs_engine.smoothing import PredictionSmoother
+from hand_signs_recognition.prediction_state import PredictionState
+from hand_signs_recognition_for_quiz.prediction_state_quiz import PredictionStateQuiz
+
+SKIP_INTERVALS = (1, 2, 5, 10)
+SMOOTHING_WINDOWS = (1, 5, 10)
+
+
+def synthetic_session(
+    n_classes=29, n_signs=60, fps=30, noise=0.12, gap_every=4, seed=0
+):
+    """
+    Generate a labelled recording of held signs and a model for it.
+
+    Every class is a prototype hand; a sign is held for one to three
+    seconds at a drifting position with per-frame landmark noise, and
+    every gap_every-th sign is followed by half a second without a hand.
+
+    Returns:
+        (LandmarkRecording, RandomForestClassifier)
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(seed)
+    hand_shape = FEATURE_SHAPE[1:]
+    prototypes = rng.uniform(0.0, 0.3, (n_classes,) + hand_shape)
+
+    def noisy(class_id, n):
+        return prototypes[class_id] + rng.normal(0.0, noise, (n,) + hand_shape)
+
+    landmarks, hands, labels = [], [], []
+    for index in range(n_signs):
+        class_id = int(rng.integers(n_classes))
+        n = int(rng.integers(fps, 3 * fps))
+        start, end = rng.uniform(0.1, 0.6, (2, 2))
+        position = np.linspace(start, end, n)[:, None, :]
+        frames = np.zeros((n,) + FEATURE_SHAPE, dtype=np.float32)
+        frames[:, 0] = noisy(class_id, n) + position
+        landmarks.append(frames.reshape(n, -1))
+        hands.append(np.ones(n, dtype=np.uint8))
+        labels.append(np.full(n, class_id, dtype=np.int16))
+        if gap_every and index % gap_every == gap_every - 1:
+            gap = fps // 2
+            landmarks.append(np.zeros((gap, landmarks[-1].shape[1]), np.float32))
+            hands.append(np.zeros(gap, dtype=np.uint8))
+            labels.append(np.full(gap, NO_LABEL, dtype=np.int16))
+    n_frames = sum(len(h) for h in hands)
+    recording = LandmarkRecording(
+        np.concatenate(landmarks),
+        np.concatenate(hands),
+        np.concatenate(labels),
+        np.arange(n_frames, dtype=np.float64) / fps,
+    )
+
+    samples = 100
+    train = np.zeros((n_classes * samples,) + FEATURE_SHAPE, dtype=np.float32)
+    for class_id in range(n_classes):
+        rows = slice(class_id * samples, (class_id + 1) * samples)
+        train[rows, 0] = noisy(class_id, samples)
+    train_landmarks = train.reshape(len(train), -1)
+    x_train = normalize_landmarks(
+        train_landmarks, np.ones(len(train_landmarks), dtype=np.uint8)
+    )
+    y_train = np.repeat(np.arange(n_classes), samples).astype(str)
+    model = RandomForestClassifier(n_estimators=100, random_state=seed)
+    return recording, model.fit(x_train, y_train)
+
+
+def concatenate(recordings):
+    """Join several recordings, keeping the timestamps increasing."""
+    parts = [list(recordings[0])]
+    for recording in recordings[1:]:
+        offset = parts[-1][3][-1] + 1.0 if len(parts[-1][3]) else 0.0
+        fields = list(recording)
+        fields[3] = fields[3] - (fields[3][0] if len(fields[3]) else 0.0) + offset
+        parts.append(fields)
+    return LandmarkRecording(*(np.concatenate(field) for field in zip(*parts)))
+
+
+def throughput(function, n_items, min_seconds=0.5):
+    """Items per second of function(), repeated for at least min_seconds."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        function()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return n_items * runs / elapsed
+
+
+def simulate(
+    predictions,
+    hands,
+    skip=1,
+    window=1,
+    scheduler=None,
+    features=None,
+    smoother=None,
+    probas=None,
+    class_ids=None,
+):
+    """
+    Class shown on every frame for one skip/smoothing setting.
+
+    Args:
+        predictions: Predicted class id of every frame (batched ahead)
+        hands: Number of hands per frame
+        skip: Run the classifier on every skip-th frame with a hand
+        window: Show the most common of the last window predictions
+        scheduler: AdaptiveScheduler deciding instead of skip
+        features: Normalized features, needed for the scheduler's motion
+        smoother: PredictionSmoother whose stable class is shown instead
+            of the majority, needs probas and class_ids
+        probas: Probability vector of every frame
+        class_ids: Class id of every probability column
+
+    Returns:
+        (shown class per frame or NO_LABEL, number of classifier runs)
+    """
+    shown = np.full(len(hands), NO_LABEL, dtype=np.int16)
+    history = deque(maxlen=window)
+    gate = MotionGate()
+    since = skip
+    inferences = 0
+    for i, n_hands in enumerate(hands):
+        if not n_hands:
+            history.clear()
+            since = skip
+            if smoother is not None:
+                smoother.reset()
+            if scheduler is not None:
+                scheduler.reset()
+                gate.reset()
+            continue
+        if scheduler is not None:
+            motion = gate.update(features[i])
+            run = scheduler.should_predict(motion) and scheduler.start_inference()
+        else:
+            run = since >= skip
+            since = 0 if run else since
+            since += 1
+        if run:
+            inferences += 1
+            history.append(predictions[i])
+            if scheduler is not None:
+                scheduler.record_prediction(Prediction(int(predictions[i]), 1.0, None))
+            if smoother is not None:
+                smoother.update(class_ids, probas[i])
+        if smoother is not None:
+            stable = smoother.stable()
+            if stable is not None:
+                shown[i] = stable.class_id
+        elif history:
+            shown[i] = Counter(history).most_common(1)[0][0]
+    return shown, inferences
+
+
+def evaluate(shown, labels, hands, timestamps):
+    """
+    Accuracy on labelled frames and reaction time after every sign change.
+
+    Returns:
+        (accuracy, mean reaction ms, p95 reaction ms, changes never shown)
+    """
+    labelled = (labels != NO_LABEL) & (hands > 0)
+    accuracy = float((shown[labelled] == labels[labelled]).mean())
+    starts = np.flatnonzero(labelled & (np.r_[NO_LABEL, labels[:-1]] != labels))
+    ends = np.r_[starts[1:], len(labels)]
+    reactions, missed = [], 0
+    for start, end in zip(starts, ends):
+        hits = np.flatnonzero(shown[start:end] == labels[start])
+        if len(hits):
+            reactions.append((timestamps[start + hits[0]] - timestamps[start]) * 1e3)
+        else:
+            missed += 1
+    if not reactions:
+        return accuracy, float("nan"), float("nan"), missed
+    return (
+        accuracy,
+        float(np.mean(reactions)),
+        float(np.percentile(reactions, 95)),
+        missed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("recordings", nargs="*", help=".npz landmark recordings")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--noise", type=float, default=0.12)
+    parser.add_argument("--signs", type=int, default=60)
+    args = parser.parse_args()
+
+    if args.recordings:
+        recording = concatenate([load_recording(path) for path in args.recordings])
+        model = load_model(args.model) if os.path.exists(args.model) else None
+        if model is None:
+            raise SystemExit(f"Recordings need the trained model: {args.model}")
+        print(f"Recordings: {len(args.recordings)}, model: {args.model}")
+    else:
+        recording, model = synthetic_session(n_signs=args.signs, noise=args.noise)
+        print("Synthetic session, RandomForestClassifier(n_estimators=100)")
+
+    classifier = Classifier(model)
+    landmarks, hands, labels, timestamps = recording
+    with_hand = np.flatnonzero(hands)
+    print(f"{len(hands)} frames, {len(with_hand)} with a hand")
+
+    features = normalize_landmarks(landmarks, hands)
+    hand_features = features[with_hand]
+    config = SimpleNamespace(labels_dict=labels_dict, classifier=classifier)
+    predictions = classifier.predict_batch(hand_features)
+    policies = {
+        "FreeRecognitionPolicy": (FreeRecognitionPolicy(), PredictionState()),
+        "ChallengePolicy": (ChallengePolicy("6"), PredictionStateQuiz()),
+    }
+
+    def run_policy(policy, state):
+        for prediction in predictions:
+            policy.on_prediction(config, state, prediction)
+
+    single = hand_features[: min(len(hand_features), 300)]
+    rates = {
+        "normalize_landmarks": throughput(
+            lambda: normalize_landmarks(landmarks, hands), len(hands)
+        ),
+        "predict_proba (batch)": throughput(
+            lambda: model.predict_proba(hand_features), len(hand_features)
+        ),
+        "Classifier.predict (row)": throughput(
+            lambda: [classifier.predict(row) for row in single], len(single)
+        ),
+    }
+    for name, (policy, state) in policies.items():
+        rates[f"{name}.on_prediction"] = throughput(
+            lambda policy=policy, state=state: run_policy(policy, state),
+            len(predictions),
+        )
+    print(f"\n{'stage':34s} {'frames/s':>12s}")
+    for name, rate in rates.items():
+        print(f"{name:34s} {rate:12,.0f}")
+
+    row_ms = 1e3 / rates["Classifier.predict (row)"]
+    predicted = np.full(len(hands), NO_LABEL, dtype=np.int16)
+    predicted[with_hand] = [p.class_id for p in predictions]
+    probas = np.zeros((len(hands), len(classifier.class_ids)), dtype=np.float32)
+    probas[with_hand] = [p.proba for p in predictions]
+    settings = [
+        (f"skip {skip:2d}, window {window:2d}", skip, window, None, None)
+        for skip in SKIP_INTERVALS
+        for window in SMOOTHING_WINDOWS
+    ]
+    settings += [
+        (f"skip {skip:2d}, EMA", skip, 1, None, PredictionSmoother())
+        for skip in SKIP_INTERVALS
+    ]
+    settings += [
+        (f"adaptive, window {window:2d}", 1, window, AdaptiveScheduler(), None)
+        for window in SMOOTHING_WINDOWS
+    ]
+    settings.append(("adaptive, EMA", 1, 1, AdaptiveScheduler(), PredictionSmoother()))
+
+    if not (labels != NO_LABEL).any():
+        print("\nRecordings have no labels, skipping the accuracy comparison")
+        return
+    print(
+        f"\n{'setting':20s} {'accuracy':>9s} {'react ms':>9s} {'p95 ms':>8s}"
+        f" {'missed':>7s} {'runs':>7s} {'model ms/frame':>15s}"
+    )
+    for name, skip, window, scheduler, smoother in settings:
+        shown, inferences = simulate(
+            predicted,
+            hands,
+            skip,
+            window,
+            scheduler,
+            features,
+            smoother,
+            probas,
+            classifier.class_ids,
+        )
+        accuracy, reaction, reaction_p95, missed = evaluate(
+            shown, labels, hands, timestamps
+        )
+        print(
+            f"{name:20s} {accuracy:9.1%} {reaction:9.0f} {reaction_p95:8.0f}"
+            f" {missed:7d} {inferences:7d} {inferences * row_ms / len(hands):15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark for drawing the hand skeleton overlay.
+
+Compares mp_drawing.draw_landmarks with the default hand styles (fetched
+for every hand, as the frame callbacks did) with the batched
+hand_signs_engine.renderer.LandmarkRenderer, for one and two hands on a
+640x480 frame. When mediapipe.solutions is not available, the mp_drawing
+loop is replaced by an equivalent one-call-per-line/circle reference.
+
+Usage:
+    python -m benchmarks.bench_renderer [--frames 2000]
+"""
+
+import argparse
+import math
+import random
+import timeit
+
+import cv2
+import numpy as np
+
+from hand_signs_engine.features import create_feature_buffer, extract_features
+from hand_signs_engine.renderer import (
+    CONNECTION_PATHS,
+    LANDMARK_GROUPS,
+    LandmarkRenderer,
+)
+
+
+def make_hands(n_hands, seed=0):
+    """Synthetic hands as mediapipe landmark protos (or plain objects)."""
+    rng = random.Random(seed)
+    points = [
+        [(0.2 + 0.5 * rng.random(), 0.2 + 0.5 * rng.random()) for _ in range(21)]
+        for _ in range(n_hands)
+    ]
+    try:
+        from mediapipe.framework.formats import landmark_pb2
+    except ImportError:
+        from types import SimpleNamespace
+
+        return [
+            SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y in hand])
+            for hand in points
+        ]
+    hands = []
+    for hand in points:
+        landmarks = landmark_pb2.NormalizedLandmarkList()
+        for x, y in hand:
+            landmarks.landmark.add(x=x, y=y)
+        hands.append(landmarks)
+    return hands
+
+
+def mp_drawing_draw():
+    """mp_drawing with default styles, or None if mediapipe lacks solutions."""
+    try:
+        import mediapipe as mp
+
+        drawing = mp.solutions.drawing_utils
+        styles = mp.solutions.drawing_styles
+        connections = mp.solutions.hands.HAND_CONNECTIONS
+    except (ImportError, AttributeError):
+        return None
+
+    def draw(image, hands):
+        for hand_landmarks in hands:
+            drawing.draw_landmarks(
+                image,
+                hand_landmarks,
+                connections,
+                landmark_drawing_spec=styles.get_default_hand_landmarks_style(),
+                connection_drawing_spec=styles.get_default_hand_connections_style(),
+            )
+
+    return draw
+
+
+def per_call_draw(image, hands):
+    """Same cv2 calls as mp_drawing: one per connection, two per landmark."""
+    h, w = image.shape[:2]
+    for hand in hands:
+        pixels = {
+            i: (min(math.floor(lm.x * w), w - 1), min(math.floor(lm.y * h), h - 1))
+            for i, lm in enumerate(hand.landmark)
+        }
+        for path, color, thickness in CONNECTION_PATHS:
+            for start, end in zip(path, path[1:]):
+                cv2.line(image, pixels[start], pixels[end], color, thickness)
+        for indices, color in LANDMARK_GROUPS:
+            for i in indices:
+                cv2.circle(image, pixels[i], 6, (224, 224, 224), -1)
+                cv2.circle(image, pixels[i], 5, color, -1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    renderer = LandmarkRenderer()
+    buffer = create_feature_buffer()
+    reference = mp_drawing_draw()
+    reference_name = "mp_drawing"
+    if reference is None:
+        reference, reference_name = per_call_draw, "per-call"
+
+    for n_hands in (1, 2):
+        hands = make_hands(n_hands)
+        features, origin = extract_features(hands, buffer)
+        legacy = timeit.timeit(lambda: reference(image, hands), number=args.frames)
+        batched = timeit.timeit(
+            lambda: renderer.draw(image, features, origin, n_hands),
+            number=args.frames,
+        )
+        legacy_us = legacy / args.frames * 1e6
+        batched_us = batched / args.frames * 1e6
+        print(
+            f"{n_hands} hand(s): {reference_name} {legacy_us:7.1f} us/frame, "
+            f"LandmarkRenderer {batched_us:7.1f} us/frame, "
+            f"speedup x{legacy_us / batched_us:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
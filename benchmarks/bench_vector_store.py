@@ -0,0 +1,187 @@
+"""
+Benchmark of the RAG index persistence: JSON stores against NumpyVectorStore.
+
+Persists the same synthetic nodes (random unit embeddings and text of
+about the chunk size) once with the default StorageContext, which writes
+the embeddings and the node texts as JSON, and once with
+NumpyVectorStore. Every load starts a fresh interpreter and measures the
+time to load the index, the first and the median retrieval of the top 5
+nodes, and the resident memory the index added together with how much of
+it is shared file pages.
+
+Usage:
+    python -m benchmarks.bench_vector_store [--nodes 20000] [--dim 384] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+VARIANTS = ("json", "numpy")
+TOP_K = 5
+QUERIES = 20
+
+
+def statm():
+    """(resident, shared) bytes of this process."""
+    with open("/proc/self/statm") as statm_file:
+        fields = statm_file.read().split()
+    page = os.sysconf("SC_PAGE_SIZE")
+    return int(fields[1]) * page, int(fields[2]) * page
+
+
+def synthetic_nodes(n_nodes, dim, nodes_per_document=50, seed=0):
+    """Nodes with random unit embeddings, grouped into source documents."""
+    from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n_nodes, dim)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    words = np.array(["Hammer", "Feile", "Zange", "Werkstück", "schleifen", "die"])
+    nodes = []
+    for i, embedding in enumerate(embeddings):
+        document = f"document-{i // nodes_per_document}.pdf"
+        node = TextNode(
+            text=" ".join(rng.choice(words, 120)),
+            embedding=embedding.tolist(),
+            metadata={"file_name": document, "page_label": str(i % 40)},
+        )
+        node.relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(node_id=document)
+        nodes.append(node)
+    return nodes
+
+
+def persist(variant, nodes, directory):
+    """Persist the nodes with one variant, return the seconds it took."""
+    from llama_index.core import StorageContext, VectorStoreIndex
+    from llama_index.core.embeddings import MockEmbedding
+
+    from rag.numpy_vector_store import NumpyVectorStore, store_directory
+
+    start = time.perf_counter()
+    if variant == "json":
+        VectorStoreIndex(
+            nodes,
+            storage_context=StorageContext.from_defaults(),
+            embed_model=MockEmbedding(embed_dim=len(nodes[0].embedding)),
+        ).storage_context.persist(persist_dir=str(directory))
+    else:
+        store = NumpyVectorStore()
+        store.add(nodes)
+        store.persist(str(store_directory(directory)))
+    return time.perf_counter() - start
+
+
+def child(variant, directory, dim):
+    """Load the index in this fresh process and print the measurements."""
+    from llama_index.core import (
+        StorageContext,
+        VectorStoreIndex,
+        load_index_from_storage,
+    )
+    from llama_index.core.embeddings import MockEmbedding
+    from llama_index.core.schema import QueryBundle
+
+    from rag.numpy_vector_store import NumpyVectorStore
+
+    embed_model = MockEmbedding(embed_dim=int(dim))
+    rng = np.random.default_rng(1)
+    queries = rng.standard_normal((QUERIES + 1, int(dim))).tolist()
+
+    rss_before, shared_before = statm()
+    start = time.perf_counter()
+    if variant == "json":
+        index = load_index_from_storage(
+            StorageContext.from_defaults(persist_dir=directory),
+            embed_model=embed_model,
+        )
+    else:
+        index = VectorStoreIndex.from_vector_store(
+            NumpyVectorStore.from_persist_dir(directory), embed_model=embed_model
+        )
+    loaded = time.perf_counter()
+    retriever = index.as_retriever(similarity_top_k=TOP_K)
+    retriever.retrieve(QueryBundle(query_str="", embedding=queries[0]))
+    first = time.perf_counter()
+    seconds = []
+    for query in queries[1:]:
+        query_start = time.perf_counter()
+        retriever.retrieve(QueryBundle(query_str="", embedding=query))
+        seconds.append(time.perf_counter() - query_start)
+    rss_after, shared_after = statm()
+    print(
+        json.dumps(
+            {
+                "load_ms": (loaded - start) * 1e3,
+                "first_query_ms": (first - loaded) * 1e3,
+                "query_ms": statistics.median(seconds) * 1e3,
+                "rss_mb": (rss_after - rss_before) / 2**20,
+                "shared_mb": (shared_after - shared_before) / 2**20,
+            }
+        )
+    )
+
+
+def directory_bytes(directory):
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    nodes = synthetic_nodes(args.nodes, args.dim)
+    print(f"{args.nodes} nodes, {args.dim} dimensions")
+    print(
+        f"\n{'variant':8s} {'persist s':>10s} {'disk MB':>8s} {'load ms':>9s}"
+        f" {'1st query ms':>13s} {'query ms':>9s} {'RSS MB':>8s} {'shared MB':>10s}"
+    )
+    with tempfile.TemporaryDirectory() as temporary:
+        for variant in VARIANTS:
+            directory = Path(temporary) / variant
+            persist_seconds = persist(variant, nodes, directory)
+            runs = []
+            for _ in range(args.runs):
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "benchmarks.bench_vector_store",
+                        "--child",
+                        variant,
+                        str(directory),
+                        str(args.dim),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+            median = {
+                key: statistics.median(run[key] for run in runs) for key in runs[0]
+            }
+            print(
+                f"{variant:8s} {persist_seconds:10.1f}"
+                f" {directory_bytes(directory) / 2**20:8.1f} {median['load_ms']:9.1f}"
+                f" {median['first_query_ms']:13.1f} {median['query_ms']:9.2f}"
+                f" {median['rss_mb']:8.1f} {median['shared_mb']:10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
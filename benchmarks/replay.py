@@ -0,0 +1,271 @@
+"""
+Replay recorded video through a frame callback without a browser.
+
+Feeds the frames of a video file, or the images of a directory, as
+av.VideoFrame objects through a frame callback variant and reports
+frames/sec, CPU time and the per-stage latency of the callback, so
+throughput can be measured and compared on a headless machine. The
+annotated frames can be written to a video file, and the landmarks of
+every frame to a recording for benchmarks.bench_recorded.
+
+Variants are the engine with the policy of a page ("free", "rag", "quiz",
+"challenge") or any factory given as "module:function" that takes
+(config, prediction_state) and returns a callback. Uses the trained model
+when it exists, otherwise a random forest on synthetic data.
+
+Usage:
+    python -m benchmarks.replay VIDEO_OR_DIR [--variant free]
+        [--target 6] [--max-frames N] [--output annotated.mp4] [--json]
+        [--record landmarks.npz --label 6]
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import time
+from fractions import Fraction
+
+import av
+import cv2
+
+from hand_signs_engine.backpressure import BackpressureController
+from hand_signs_engine.classifier import Classifier
+from hand_signs_engine.frame_engine import create_frame_callback
+from hand_signs_engine.inference_worker import get_inference_worker
+from hand_signs_engine.mediapipe_config import (
+    MODEL_PATH,
+    MediaPipeConfig,
+    create_hands,
+    load_classifier,
+)
+from hand_signs_engine.policies import (
+    ChallengePolicy,
+    FreeRecognitionPolicy,
+    TargetStrengthPolicy,
+)
+from hand_signs_engine.recording import NO_LABEL, LandmarkRecorder
+from hand_signs_engine.renderer import LandmarkRenderer
+from hand_signs_engine.resources import ResourceManager
+from hand_signs_engine.roi import RoiTracker
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def image_frames(directory, fps):
+    """Frames from the images of a directory, in file name order."""
+    time_base = Fraction(1, fps)
+    names = sorted(
+        name
+        for name in os.listdir(directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    for index, name in enumerate(names):
+        image = cv2.imread(os.path.join(directory, name))
+        if image is None:
+            continue
+        # Browsers send even sizes, and yuv420p needs them
+        h, w = image.shape[:2]
+        frame = av.VideoFrame.from_ndarray(
+            image[: h - h % 2, : w - w % 2], format="bgr24"
+        ).reformat(format="yuv420p")
+        frame.pts = index
+        frame.time_base = time_base
+        yield frame
+
+
+def video_frames(path):
+    """Decoded frames of a video file."""
+    with av.open(path) as container:
+        yield from container.decode(video=0)
+
+
+def load_frames(source, fps, max_frames):
+    frames = (
+        image_frames(source, fps) if os.path.isdir(source) else video_frames(source)
+    )
+    for index, frame in enumerate(frames):
+        if max_frames is not None and index >= max_frames:
+            return
+        yield frame
+
+
+def classifier_loader(model_path):
+    """Loader for the trained model, or a synthetic one if it is missing."""
+    if os.path.exists(model_path):
+        return lambda: load_classifier(model_path)
+
+    def synthetic():
+        from benchmarks.bench_classifier import synthetic_model
+
+        print("Model: synthetic RandomForestClassifier(n_estimators=100)")
+        return Classifier(synthetic_model())
+
+    return synthetic
+
+
+def build_callback(args, config, recorder=None):
+    """Create the callback and its prediction state for the chosen variant."""
+    if ":" in args.variant:
+        if recorder is not None:
+            raise SystemExit("--record needs one of the engine variants")
+        from hand_signs_recognition.prediction_state import PredictionState
+
+        module_name, function_name = args.variant.split(":", 1)
+        factory = getattr(importlib.import_module(module_name), function_name)
+        return factory(config, PredictionState())
+
+    if args.variant == "free":
+        from hand_signs_recognition.prediction_state import PredictionState
+
+        state, policy = PredictionState(), FreeRecognitionPolicy()
+    elif args.variant == "rag":
+        from hand_signs_recognition_for_rag.prediction_state import (
+            PredictionState,
+        )
+
+        state = PredictionState()
+        policy = FreeRecognitionPolicy(threshold=0.1, show_confidence=False)
+    elif args.variant == "quiz":
+        from hand_signs_recognition_for_quiz.prediction_state import (
+            PredictionState,
+        )
+
+        state, policy = PredictionState(), TargetStrengthPolicy(args.target)
+    else:
+        from hand_signs_recognition_for_quiz.prediction_state_quiz import (
+            PredictionStateQuiz,
+        )
+
+        state, policy = PredictionStateQuiz(), ChallengePolicy(args.target)
+
+    # Frames are fed as fast as possible, so the backpressure controller
+    # would degrade everything unless asked to simulate real time
+    backpressure = (
+        BackpressureController()
+        if args.backpressure
+        else BackpressureController(high_load=math.inf)
+    )
+    return create_frame_callback(
+        config,
+        state,
+        policy,
+        roi_tracker=RoiTracker(working_width=args.working_width),
+        renderer=LandmarkRenderer(enabled=not args.no_overlay),
+        backpressure=backpressure,
+        recorder=recorder,
+    )
+
+
+def open_output(path, frame, fps):
+    container = av.open(path, "w")
+    stream = container.add_stream("mpeg4", rate=fps)
+    stream.width = frame.width
+    stream.height = frame.height
+    stream.pix_fmt = "yuv420p"
+    return container, stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="Video file or directory of images")
+    parser.add_argument(
+        "--variant",
+        default="free",
+        help='"free", "rag", "quiz", "challenge" or "module:function"',
+    )
+    parser.add_argument("--target", default="6", help="Class of quiz/challenge")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--fps", type=int, default=30, help="Rate of image input")
+    parser.add_argument("--max-frames", type=int)
+    parser.add_argument("--working-width", type=int, default=640)
+    parser.add_argument("--no-overlay", action="store_true")
+    parser.add_argument(
+        "--backpressure",
+        action="store_true",
+        help="Let the backpressure controller degrade as in real time",
+    )
+    parser.add_argument("--output", help="Write the annotated frames here")
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    parser.add_argument("--record", help="Write the landmarks to this .npz file")
+    parser.add_argument(
+        "--label",
+        type=int,
+        default=NO_LABEL,
+        help="Class shown in the source, stored with the recorded frames",
+    )
+    args = parser.parse_args()
+
+    resources = ResourceManager(classifier_loader(args.model), create_hands, 1)
+    config = MediaPipeConfig(resources=resources)
+    recorder = LandmarkRecorder(label=args.label) if args.record else None
+    callback = build_callback(args, config, recorder)
+
+    output = stream = None
+    n_frames = 0
+    # Only the callback (and the inference worker) is measured, not reading
+    # the source or writing the output
+    busy = cpu = 0.0
+    wall_start = time.perf_counter()
+    for frame in load_frames(args.source, args.fps, args.max_frames):
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        out = callback(frame)
+        busy += time.perf_counter() - start
+        cpu += time.process_time() - cpu_start
+        n_frames += 1
+        if args.output:
+            if output is None:
+                output, stream = open_output(args.output, out, args.fps)
+            out = out.reformat(
+                width=stream.width, height=stream.height, format="yuv420p"
+            )
+            for packet in stream.encode(out):
+                output.mux(packet)
+    cpu_start = time.process_time()
+    get_inference_worker().wait_idle(timeout=10)
+    cpu += time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    if output is not None:
+        for packet in stream.encode():
+            output.mux(packet)
+        output.close()
+    if recorder is not None:
+        recorder.save(args.record)
+
+    metrics = getattr(callback, "metrics", None)
+    report = {
+        "source": args.source,
+        "variant": args.variant,
+        "frames": n_frames,
+        "wall_seconds": wall,
+        "callback_seconds": busy,
+        "fps": n_frames / busy if busy else 0.0,
+        "cpu_seconds": cpu,
+        "cpu_ms_per_frame": cpu / n_frames * 1e3 if n_frames else 0.0,
+        "frame_metrics": metrics.snapshot() if metrics is not None else None,
+        "inference_worker": get_inference_worker().stats(),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"{n_frames} frames, {busy:.2f} s in the callback: "
+        f"{report['fps']:.1f} frames/s, "
+        f"CPU {cpu:.2f} s ({report['cpu_ms_per_frame']:.1f} ms/frame)"
+    )
+    if metrics is not None:
+        snapshot = report["frame_metrics"]
+        print("  " + ", ".join(f"{k} {v}" for k, v in snapshot["counters"].items()))
+        print(f"  {'stage':10s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+        for stage, summary in snapshot["stages"].items():
+            print(
+                f"  {stage:10s} {summary['p50_ms']:8.2f} "
+                f"{summary['p95_ms']:8.2f} {summary['p99_ms']:8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
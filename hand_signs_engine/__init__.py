@@ -0,0 +1,116 @@
+"""
+Shared engine for all hand sign recognition packages.
+
+Contains:
+- features: Landmark feature extraction for the classifier
+- classifier: Single-pass adapter around the trained model
+- compiled_model: Pure-NumPy predictor exported from the tree ensemble
+- model_artifact: Memory-mapped, versioned on-disk model format
+- model_registry: Hot swap of validated new model versions
+- mediapipe_config: MediaPipe setup and the shared model
+- policies: What a prediction means for each page
+- notifier: Wakes the UI when a prediction state changed
+- smoothing: Moving average with hysteresis for a stable predicted class,
+  and the smoothing methods shared by the prediction states
+- resources: Process-wide classifier and pool of hand detectors
+- inference_worker: Background thread for classifier runs
+- metrics: Latency histograms and per-stream frame metrics
+- scheduler: Adaptive prediction cadence and process CPU budget
+- motion: Motion gate that reuses predictions for a still hand
+- frame_buffer: Per-stream image buffer reused between frames
+- renderer: Batched drawing of the hand skeleton overlay
+- roi: Downscaling and region-of-interest cropping before detection
+- backpressure: Degrades frame processing when it cannot keep up
+- recording: On-disk landmark recordings and the session recorder
+- frame_engine: Video frame processing callback
+"""
+
+from .backpressure import BackpressureController
+from .classifier import Classifier, Prediction
+from .compiled_model import CompiledForest, compile_model
+from .features import (
+    FEATURE_LENGTH,
+    FEATURE_SHAPE,
+    create_feature_buffer,
+    extract_features,
+)
+from .frame_buffer import FrameBuffer
+from .frame_engine import create_frame_callback
+from .inference_worker import InferenceWorker, get_inference_worker
+from .mediapipe_config import MediaPipeConfig
+from .metrics import (
+    FrameMetrics,
+    LatencyHistogram,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from .model_artifact import ModelArtifact, load_artifact, save_artifact
+from .model_registry import ModelRegistry
+from .motion import MotionGate
+from .notifier import ChangeNotifier
+from .policies import (
+    ChallengePolicy,
+    FreeRecognitionPolicy,
+    PredictionPolicy,
+    ScoreCadence,
+    TargetStrengthPolicy,
+)
+from .recording import (
+    LandmarkRecorder,
+    LandmarkRecording,
+    load_recording,
+    normalize_landmarks,
+    save_recording,
+)
+from .renderer import LandmarkRenderer
+from .resources import HandsPool, ResourceManager
+from .roi import RoiTracker
+from .scheduler import AdaptiveScheduler, InferenceBudget, get_inference_budget
+from .smoothing import PredictionSmoother, SmoothedPredictionMixin, StablePrediction
+
+__all__ = [
+    "AdaptiveScheduler",
+    "BackpressureController",
+    "FEATURE_LENGTH",
+    "FEATURE_SHAPE",
+    "ChallengePolicy",
+    "ChangeNotifier",
+    "Classifier",
+    "CompiledForest",
+    "FrameBuffer",
+    "FrameMetrics",
+    "FreeRecognitionPolicy",
+    "HandsPool",
+    "InferenceBudget",
+    "InferenceWorker",
+    "LandmarkRecorder",
+    "LandmarkRecording",
+    "LandmarkRenderer",
+    "LatencyHistogram",
+    "MediaPipeConfig",
+    "MetricsRegistry",
+    "ModelArtifact",
+    "ModelRegistry",
+    "MotionGate",
+    "Prediction",
+    "PredictionPolicy",
+    "PredictionSmoother",
+    "ResourceManager",
+    "RoiTracker",
+    "ScoreCadence",
+    "SmoothedPredictionMixin",
+    "StablePrediction",
+    "TargetStrengthPolicy",
+    "compile_model",
+    "create_feature_buffer",
+    "create_frame_callback",
+    "extract_features",
+    "get_inference_budget",
+    "get_inference_worker",
+    "get_metrics_registry",
+    "load_artifact",
+    "load_recording",
+    "normalize_landmarks",
+    "save_artifact",
+    "save_recording",
+]
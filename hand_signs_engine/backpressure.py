@@ -0,0 +1,159 @@
+import time
+from collections import deque
+
+# Degradation levels, each one also applies the ones before it
+FULL = 0
+NO_OVERLAY = 1
+PASS_THROUGH = 2
+LOW_RESOLUTION = 3
+LEVEL_NAMES = ("full", "no_overlay", "pass_through", "low_resolution")
+
+
+class BackpressureController:
+    """
+    Degrades the frame callback of one stream when it cannot keep up.
+
+    With async_processing=True streamlit-webrtc silently drops the frames
+    that arrive while the callback is still busy. The controller compares
+    the smoothed callback duration with the interval of the incoming frames
+    (from their timestamps) and, while the load stays above high_load,
+    steps through the levels:
+
+    1. no_overlay: skip drawing the landmarks and the label
+    2. pass_through: run detection only on every detect_every-th frame,
+       the others are mirrored and sent back right away
+    3. low_resolution: run detection at low_resolution_width
+
+    When the load stays below low_load it steps back one level at a time.
+    Every degradation is recorded with its start and duration, together
+    with the total time spent on every level.
+    """
+
+    def __init__(
+        self,
+        high_load=0.9,
+        low_load=0.6,
+        escalate_after=15,
+        recover_after=90,
+        smoothing=0.1,
+        window=30,
+        low_resolution_width=320,
+        max_events=100,
+        detect_every=2,
+    ):
+        """
+        Args:
+            high_load: Callback time / frame interval above which to degrade
+            low_load: Load below which to recover one level
+            escalate_after: Overloaded frames in a row before degrading
+            recover_after: Relaxed frames in a row before recovering
+            smoothing: Weight of the newest duration in the moving average
+            window: Number of frame intervals the frame rate is taken from
+            low_resolution_width: Detection width on the last level
+            max_events: Number of degradation events kept
+            detect_every: Frames per detected frame from pass_through on
+        """
+        self.high_load = high_load
+        self.low_load = low_load
+        self.escalate_after = escalate_after
+        self.recover_after = recover_after
+        self.smoothing = smoothing
+        self.low_resolution_width = low_resolution_width
+        self.detect_every = detect_every
+        self.level = FULL
+        self.load = 0.0
+        self.degradations = 0
+        self.events = deque(maxlen=max_events)
+        self.time_at_level = [0.0] * len(LEVEL_NAMES)
+        self._intervals = deque(maxlen=window)
+        self._last_frame_time = None
+        self._duration = None
+        self._over = 0
+        self._under = 0
+        self._passed = 0
+        self._level_since = time.monotonic()
+        self._level_started = time.time()
+
+    def observe(self, frame_time, duration_ns):
+        """
+        Record one processed frame and update the level.
+
+        Args:
+            frame_time: Presentation time of the frame in seconds, or None
+                to use the arrival time
+            duration_ns: Time the callback spent on the frame
+
+        Returns:
+            The level for the next frame
+        """
+        now = time.monotonic()
+        if frame_time is None:
+            frame_time = now
+        if self._last_frame_time is not None:
+            interval = frame_time - self._last_frame_time
+            if interval > 0:
+                self._intervals.append(interval)
+        self._last_frame_time = frame_time
+
+        duration = duration_ns / 1e9
+        if self._duration is None:
+            self._duration = duration
+        else:
+            self._duration += self.smoothing * (duration - self._duration)
+        if not self._intervals:
+            return self.level
+
+        # Frames upstream may already be dropped, so the shortest recent
+        # interval is the rate the camera actually sends
+        self.load = self._duration / min(self._intervals)
+        if self.load > self.high_load:
+            self._over += 1
+            self._under = 0
+        elif self.load < self.low_load:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.escalate_after and self.level < LOW_RESOLUTION:
+            self._set_level(self.level + 1, now)
+        elif self._under >= self.recover_after and self.level > FULL:
+            self._set_level(self.level - 1, now)
+        return self.level
+
+    def skip_detection(self):
+        """True for a frame that is only mirrored and sent back (pass_through)."""
+        if self.level < PASS_THROUGH:
+            return False
+        self._passed += 1
+        return self._passed % self.detect_every != 0
+
+    def stats(self):
+        """Return the level, load, degradation events and time per level."""
+        time_at_level = list(self.time_at_level)
+        time_at_level[self.level] += time.monotonic() - self._level_since
+        return {
+            "level": LEVEL_NAMES[self.level],
+            "load": self.load,
+            "degradations": self.degradations,
+            "seconds_at_level": dict(zip(LEVEL_NAMES, time_at_level)),
+            "events": list(self.events),
+        }
+
+    def _set_level(self, level, now):
+        elapsed = now - self._level_since
+        self.time_at_level[self.level] += elapsed
+        if self.level != FULL:
+            self.events.append(
+                {
+                    "level": LEVEL_NAMES[self.level],
+                    "started": self._level_started,
+                    "duration_s": elapsed,
+                }
+            )
+        if level > self.level:
+            self.degradations += 1
+        self.level = level
+        self._level_since = now
+        self._level_started = time.time()
+        self._over = self._under = 0
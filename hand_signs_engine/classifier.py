@@ -0,0 +1,84 @@
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .features import FEATURE_LENGTH
+
+
+class Prediction(NamedTuple):
+    """Result of one classifier pass."""
+
+    class_id: int
+    confidence: float
+    proba: np.ndarray
+    # Classifier that made the prediction, the model may be swapped since
+    classifier: Any = None
+
+    @property
+    def model_version(self):
+        """Version of the model that made the prediction, if known."""
+        return self.classifier.version if self.classifier is not None else None
+
+
+class Classifier:
+    """
+    Adapter around the trained model that needs a single predict_proba pass.
+
+    predict() and predict_proba() of an ensemble both evaluate every
+    estimator, so calling both runs the model twice. The predicted class is
+    the argmax of the probabilities, exactly like model.predict does.
+    """
+
+    def __init__(self, model, labels=None, version=None):
+        """
+        Args:
+            model: Fitted model with classes_ and predict_proba()
+            labels: Mapping of class id to display name shipped with the
+                model, or None
+            version: Model version from the artifact metadata, or None
+        """
+        self.model = model
+        self.labels = labels
+        self.version = version
+        self.feature_length = getattr(model, "n_features_in_", FEATURE_LENGTH)
+        # model.classes_ holds the ids as strings ("0".."28")
+        self.class_ids = np.array([int(c) for c in model.classes_])
+        self._index = {class_id: i for i, class_id in enumerate(self.class_ids)}
+
+    def predict(self, features):
+        """
+        Classify one feature vector.
+
+        Args:
+            features: Feature vector of length feature_length
+
+        Returns:
+            Prediction with class id, confidence and probability vector
+        """
+        proba = self.model.predict_proba(features.reshape(1, -1))[0]
+        best = int(proba.argmax())
+        return Prediction(int(self.class_ids[best]), float(proba[best]), proba, self)
+
+    def predict_batch(self, features_batch):
+        """
+        Classify a stacked (n, feature_length) matrix with one model pass.
+
+        Returns:
+            List of Prediction, one per row
+        """
+        proba = self.model.predict_proba(features_batch)
+        best = proba.argmax(axis=1)
+        return [
+            Prediction(int(self.class_ids[b]), float(row[b]), row, self)
+            for b, row in zip(best, proba)
+        ]
+
+    def index_of(self, class_id):
+        """Column of a class id (int or "6" style string) in the proba vector."""
+        return self._index[int(class_id)]
+
+    def probability_of(self, prediction, class_id):
+        """Probability the prediction assigns to class_id."""
+        # Columns of the model that made the prediction, not of this one
+        classifier = prediction.classifier or self
+        return float(prediction.proba[classifier.index_of(class_id)])
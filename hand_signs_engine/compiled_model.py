@@ -0,0 +1,215 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rows evaluated together, bounds the (rows, trees, classes) gather
+_CHUNK_ROWS = 256
+
+
+def _float32_thresholds(thresholds):
+    """
+    Round split thresholds down to float32.
+
+    scikit-learn casts the input to float32 and compares it with float64
+    thresholds. For a float32 x, x <= t holds exactly when x is <= the
+    largest float32 not above t, so the comparison can stay in float32.
+    """
+    rounded = thresholds.astype(np.float32)
+    above = rounded > thresholds
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+class CompiledForest:
+    """
+    Pure-NumPy predictor for a fitted decision tree or forest classifier.
+
+    predict_proba() of scikit-learn validates its input and dispatches
+    every tree through joblib, which costs milliseconds for a single
+    84-feature row. The compiled forest keeps the nodes of all trees in
+    flat arrays and walks every tree at once, one vectorized step per tree
+    level. Leaves point to themselves, so the walk needs no masking.
+
+    It has classes_, predict_proba() and predict() like the original
+    model, so the Classifier adapter uses it unchanged.
+    """
+
+    # Array attributes, stored as one .npy file each in a model artifact
+    ARRAYS = ("feature", "threshold", "left", "right", "leaf", "values", "roots")
+
+    def __init__(
+        self,
+        feature,
+        threshold,
+        left,
+        right,
+        leaf,
+        values,
+        roots,
+        classes,
+        depth,
+        n_features,
+    ):
+        """
+        Args:
+            feature: Feature index compared at every node (0 for leaves)
+            threshold: float32 split threshold (inf for leaves)
+            left: Left child of every node, the node itself for leaves
+            right: Right child of every node, the node itself for leaves
+            leaf: Row of values for leaves, -1 for split nodes
+            values: (leaves, classes) class probabilities of every leaf
+            roots: Root node of every tree
+            classes: Class labels in probability column order
+            depth: Number of levels of the deepest tree
+            n_features: Length of the feature vectors
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf = leaf
+        self.values = values
+        self.roots = roots
+        self.classes_ = np.asarray(classes)
+        self.depth = int(depth)
+        self.n_features_in_ = int(n_features)
+
+    @classmethod
+    def from_estimator(cls, model):
+        """
+        Compile a fitted scikit-learn tree classifier.
+
+        Supports DecisionTreeClassifier and forests of them
+        (RandomForestClassifier, ExtraTreesClassifier) with one output.
+
+        Raises:
+            TypeError: If the model is not a supported tree classifier
+        """
+        from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+        from sklearn.tree import DecisionTreeClassifier
+
+        if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+            trees = model.estimators_
+        elif isinstance(model, DecisionTreeClassifier):
+            trees = [model]
+        else:
+            raise TypeError(f"Unsupported model: {type(model).__name__}")
+        if model.n_outputs_ != 1:
+            raise TypeError("Only models with one output are supported")
+        nodes = [tree.tree_ for tree in trees]
+
+        offsets = np.cumsum([0] + [t.node_count for t in nodes])
+        feature, threshold, left, right, leaf, values = [], [], [], [], [], []
+        n_leaves = 0
+        for tree_, offset in zip(nodes, offsets):
+            ids = np.arange(tree_.node_count)
+            is_leaf = tree_.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree_.feature))
+            threshold.append(
+                np.where(is_leaf, np.inf, _float32_thresholds(tree_.threshold))
+            )
+            left.append(np.where(is_leaf, ids, tree_.children_left) + offset)
+            right.append(np.where(is_leaf, ids, tree_.children_right) + offset)
+            leaf_rows = np.full(tree_.node_count, -1)
+            leaf_rows[is_leaf] = np.arange(n_leaves, n_leaves + is_leaf.sum())
+            n_leaves += int(is_leaf.sum())
+            leaf.append(leaf_rows)
+            # The trees of a forest predict normalized leaf counts
+            counts = tree_.value[is_leaf, 0, :]
+            totals = counts.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            values.append(counts / totals)
+
+        return cls(
+            np.concatenate(feature).astype(np.int32),
+            np.concatenate(threshold).astype(np.float32),
+            np.concatenate(left).astype(np.int32),
+            np.concatenate(right).astype(np.int32),
+            np.concatenate(leaf).astype(np.int32),
+            np.concatenate(values).astype(np.float32),
+            offsets[:-1].astype(np.int32),
+            model.classes_,
+            max(t.max_depth for t in nodes),
+            model.n_features_in_,
+        )
+
+    def predict_proba(self, features):
+        """
+        Class probabilities, averaged over the trees.
+
+        Args:
+            features: One feature vector or an (n, features) matrix
+
+        Returns:
+            (n, classes) float64 probabilities, also for a single vector
+        """
+        x = np.asarray(features, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        if len(x) <= _CHUNK_ROWS:
+            return self._proba(x)
+        return np.concatenate(
+            [
+                self._proba(x[start : start + _CHUNK_ROWS])
+                for start in range(0, len(x), _CHUNK_ROWS)
+            ]
+        )
+
+    def predict(self, features):
+        """Class label with the highest probability for every row."""
+        return self.classes_[self.predict_proba(features).argmax(axis=1)]
+
+    def _proba(self, x):
+        n_trees = len(self.roots)
+        node = np.tile(self.roots, len(x))
+        # Offset of the row of every (row, tree) pair in the flat input
+        base = np.repeat(np.arange(len(x)) * x.shape[1], n_trees)
+        flat = x.ravel()
+        active = np.arange(len(node))
+        for _ in range(self.depth):
+            current = node[active]
+            go_left = (
+                flat[base[active] + self.feature[current]] <= self.threshold[current]
+            )
+            current = np.where(go_left, self.left[current], self.right[current])
+            node[active] = current
+            # Trees that reached a leaf drop out of the walk
+            active = active[self.leaf[current] < 0]
+            if not len(active):
+                break
+        leaves = self.leaf[node].reshape(len(x), n_trees)
+        proba = self.values[leaves].sum(axis=1, dtype=np.float64)
+        proba /= n_trees
+        return proba
+
+
+def compile_model(model):
+    """
+    Return the CompiledForest of model, or model itself if it is no
+    supported tree classifier.
+    """
+    try:
+        return CompiledForest.from_estimator(model)
+    except TypeError as e:
+        logger.info("Using the model without compiling: %s", e)
+        return model
+
+
+def check_compiled(model, compiled, n_samples=1000, atol=1e-6, seed=0):
+    """
+    Compare the probabilities of both models on random feature vectors.
+
+    Returns:
+        Largest absolute difference
+
+    Raises:
+        ValueError: If a probability differs by more than atol
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.random((n_samples, compiled.n_features_in_), dtype=np.float32)
+    difference = float(np.abs(model.predict_proba(x) - compiled.predict_proba(x)).max())
+    if difference > atol:
+        raise ValueError(f"Compiled probabilities differ by {difference:.3g}")
+    return difference
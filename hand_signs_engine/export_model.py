@@ -0,0 +1,57 @@
+"""
+Export the trained model as a memory-mapped model artifact.
+
+Writes metadata.json (version, labels, feature length) and the arrays of
+the CompiledForest as .npy files to a directory next to the pickle
+(hand_signs_model/), where load_classifier picks them up instead of
+unpickling scikit-learn, after checking that the probabilities match the
+original model. The labels default to labels_dict; --labels reads them
+from a JSON object of class id to display name, e.g. {"29": "Zirkel"},
+which is merged over labels_dict.
+
+Usage:
+    python -m hand_signs_engine.export_model [MODEL.p] [--output DIR]
+        [--version V] [--labels LABELS.json]
+"""
+
+import argparse
+import json
+import pickle
+
+from .compiled_model import CompiledForest, check_compiled
+from .mediapipe_config import MODEL_PATH, labels_dict, model_artifact_path
+from .model_artifact import save_artifact
+
+
+def load_labels(path):
+    """Read a JSON object of class id to display name, merged over labels_dict."""
+    with open(path, encoding="utf-8") as labels_file:
+        labels = json.load(labels_file)
+    return {**labels_dict, **{int(k): name for k, name in labels.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("model", nargs="?", default=MODEL_PATH)
+    parser.add_argument("--output", help="Defaults to MODEL without .p")
+    parser.add_argument("--version", help="Defaults to the current UTC time")
+    parser.add_argument("--labels", help="JSON file of class id to display name")
+    args = parser.parse_args()
+    labels = load_labels(args.labels) if args.labels else labels_dict
+
+    with open(args.model, "rb") as model_file:
+        model = pickle.load(model_file)["model"]
+    compiled = CompiledForest.from_estimator(model)
+    difference = check_compiled(model, compiled)
+    output = args.output or model_artifact_path(args.model)
+    metadata = save_artifact(
+        output, compiled, labels, version=args.version, source=args.model
+    )
+    print(
+        f"{output}: version {metadata['version']}, {metadata['trees']} trees, "
+        f"{metadata['nodes']} nodes, max difference {difference:.2g}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import numpy as np
+
+MAX_HANDS = 2
+LANDMARKS_PER_HAND = 21
+FEATURE_SHAPE = (MAX_HANDS, LANDMARKS_PER_HAND, 2)
+FEATURE_LENGTH = MAX_HANDS * LANDMARKS_PER_HAND * 2
+
+
+def create_feature_buffer():
+    """Allocate a zeroed (hands, landmarks, xy) buffer for extract_features."""
+    return np.zeros(FEATURE_SHAPE, dtype=np.float32)
+
+
+def extract_features(multi_hand_landmarks, buffer=None, roi=None):
+    """
+    Build the classifier feature vector from MediaPipe hand landmarks.
+
+    All x/y coordinates are copied into the (2, 21, 2) buffer in a single
+    pass and normalized by subtracting the minimum x and y over all detected
+    hands. Slots of a missing second hand stay zero, which matches the zero
+    padding the model was trained with.
+
+    Args:
+        multi_hand_landmarks: results.multi_hand_landmarks from hands.process
+        buffer: Optional preallocated float32 array of FEATURE_SHAPE, reused
+            between frames to avoid allocations
+        roi: Optional normalized (x0, y0, x1, y1) region the landmarks are
+            relative to; they are mapped back to full-frame coordinates
+
+    Returns:
+        Tuple (features, origin): features is a flat view of length 84 on the
+        buffer, origin is the (x_min, y_min) used for normalization
+    """
+    if buffer is None:
+        buffer = create_feature_buffer()
+
+    n_hands = min(len(multi_hand_landmarks), MAX_HANDS)
+    for h in range(n_hands):
+        coords = buffer[h]
+        landmarks = multi_hand_landmarks[h].landmark
+        for i in range(min(len(landmarks), LANDMARKS_PER_HAND)):
+            landmark = landmarks[i]
+            coords[i, 0] = landmark.x
+            coords[i, 1] = landmark.y
+    buffer[n_hands:] = 0.0
+
+    detected = buffer[:n_hands]
+    if roi is not None:
+        x0, y0, x1, y1 = roi
+        detected *= (x1 - x0, y1 - y0)
+        detected += (x0, y0)
+    origin = detected.reshape(-1, 2).min(axis=0)
+    detected -= origin
+
+    return buffer.reshape(-1), (float(origin[0]), float(origin[1]))
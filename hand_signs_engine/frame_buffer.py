@@ -0,0 +1,40 @@
+import cv2
+import numpy as np
+
+
+def reuse_buffer(buffer, shape, dtype=np.uint8):
+    """Return buffer if it has the given shape and dtype, else a new one."""
+    if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+        return np.empty(shape, dtype=dtype)
+    return buffer
+
+
+class FrameBuffer:
+    """
+    Image buffer of one stream, reused by every frame.
+
+    The decoded frame is mirrored straight into the buffer (cv2.flip with
+    dst=), MediaPipe reads it, the overlay is drawn onto it and it is
+    encoded into the outgoing frame. It is only reallocated when the
+    browser changes the resolution.
+    """
+
+    def __init__(self):
+        self.image = None
+        self.allocations = 0
+
+    def mirror(self, image):
+        """
+        Flip image horizontally into the buffer.
+
+        Args:
+            image: Decoded RGB frame, left untouched
+
+        Returns:
+            The buffer holding the mirrored frame
+        """
+        buffer = reuse_buffer(self.image, image.shape, image.dtype)
+        if buffer is not self.image:
+            self.image = buffer
+            self.allocations += 1
+        return cv2.flip(image, 1, dst=buffer)
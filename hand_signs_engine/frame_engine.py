@@ -0,0 +1,262 @@
+import logging
+import time
+import weakref
+
+import av
+import cv2
+
+from .backpressure import (
+    LOW_RESOLUTION,
+    NO_OVERLAY,
+    BackpressureController,
+)
+from .features import create_feature_buffer, extract_features
+from .frame_buffer import FrameBuffer
+from .inference_worker import get_inference_worker
+from .metrics import FrameMetrics, get_metrics_registry
+from .motion import MotionGate
+from .renderer import LandmarkRenderer
+from .roi import RoiTracker
+from .scheduler import AdaptiveScheduler, get_inference_budget
+
+logger = logging.getLogger(__name__)
+
+# Longest a frame waits for a detector while every one is pinned to another
+# stream; the frame is then sent back without detection
+DETECTOR_TIMEOUT = 0.05
+
+
+def draw_label(image, text, origin):
+    """Draw the prediction text just above the top-left corner of the hands."""
+    h, w, _ = image.shape
+    xmin = int(max(0, origin[0] * w))
+    ymin = int(max(0, origin[1] * h))
+
+    cv2.putText(
+        image,
+        text,
+        (xmin, max(10, ymin - 10)),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.8,
+        (0, 255, 0),
+        2,
+        cv2.LINE_AA,
+    )
+
+
+def create_frame_callback(
+    config,
+    prediction_state,
+    policy,
+    worker=None,
+    scheduler=None,
+    motion_gate=None,
+    roi_tracker=None,
+    renderer=None,
+    metrics=None,
+    backpressure=None,
+    recorder=None,
+):
+    """
+    Factory function that creates a video frame callback.
+
+    The callback is the same for every page; what a prediction means is
+    decided by the policy (see hand_signs_engine.policies). The classifier
+    runs on the inference worker, batched with the other sessions, so the
+    frame path only pays for MediaPipe and drawing and shows the latest
+    finished prediction.
+
+    Args:
+        config: MediaPipeConfig instance with the classifier and the
+            HandsPool of detectors
+        prediction_state: Prediction state the policy writes results to
+        policy: PredictionPolicy instance
+        worker: InferenceWorker to run predictions on, defaults to the
+            worker shared by the whole process
+        scheduler: AdaptiveScheduler deciding when to predict, defaults to
+            one limited by the process-wide inference budget
+        motion_gate: MotionGate that reuses the last prediction while the
+            hand is still, defaults to MotionGate()
+        roi_tracker: RoiTracker that downscales and crops frames before
+            detection, defaults to RoiTracker() (640 px working width)
+        renderer: LandmarkRenderer drawing the hand skeleton, defaults to
+            LandmarkRenderer(); pass LandmarkRenderer(enabled=False) to
+            skip the overlay
+        metrics: FrameMetrics timing every stage of the callback, defaults
+            to new metrics registered with the process-wide registry
+        backpressure: BackpressureController that skips the overlay, passes
+            frames through and lowers the detection resolution while the
+            callback is slower than the camera, defaults to
+            BackpressureController()
+        recorder: Optional LandmarkRecorder that captures the landmarks of
+            every frame for offline benchmarks
+
+    Returns:
+        Callback function for processing video frames; its scheduler,
+        motion_gate, roi_tracker, frame_buffer, renderer, metrics and
+        backpressure attributes expose their state and stats
+    """
+    if worker is None:
+        worker = get_inference_worker()
+    if scheduler is None:
+        scheduler = AdaptiveScheduler(budget=get_inference_budget())
+    if motion_gate is None:
+        motion_gate = MotionGate()
+    if roi_tracker is None:
+        roi_tracker = RoiTracker()
+    if renderer is None:
+        renderer = LandmarkRenderer()
+    if metrics is None:
+        metrics = get_metrics_registry().register(FrameMetrics())
+    if backpressure is None:
+        backpressure = BackpressureController()
+    metrics.backpressure = backpressure
+    working_width = roi_tracker.working_width
+
+    # Reused for every frame of this stream to avoid per-frame allocations
+    feature_buffer = create_feature_buffer()
+    frame_buffer = FrameBuffer()
+    # Identifies this stream's "latest wins" slot on the worker and the
+    # detector pinned to it in the hands pool
+    session_key = object()
+
+    def send(frame, start, t_last):
+        """Encode the mirrored buffer and record the frame's total time."""
+        # Encoding copies the buffer into the outgoing frame
+        out = av.VideoFrame.from_ndarray(frame_buffer.image, format="rgb24")
+        end = time.monotonic_ns()
+        metrics.record("encode", end - t_last)
+        metrics.record("total", end - start)
+        metrics.frames_out += 1
+        backpressure.observe(frame.time, end - start)
+        return out
+
+    def callback(frame: av.VideoFrame) -> av.VideoFrame:
+        """
+        Video frame callback runs in the webrtc thread/process.
+        Processes each frame to detect hands and make predictions.
+        """
+        clock = time.monotonic_ns
+        start = clock()
+        metrics.frames_in += 1
+        level = backpressure.level
+        if level >= LOW_RESOLUTION:
+            roi_tracker.working_width = backpressure.low_resolution_width
+        else:
+            roi_tracker.working_width = working_width
+        try:
+            # Decode straight to RGB (MediaPipe expects RGB), no BGR round trip
+            decoded = frame.to_ndarray(format="rgb24")
+            t_decoded = clock()
+            metrics.record("decode", t_decoded - start)
+
+            # Mirror into the stream's buffer; MediaPipe reads it and the
+            # overlay is drawn onto it, so no further copies are made
+            img_rgb = frame_buffer.mirror(decoded)
+            t_mirrored = clock()
+            metrics.record("mirror", t_mirrored - t_decoded)
+
+            if backpressure.skip_detection():
+                # Overloaded: send the frame back without detection, the
+                # last prediction stands until the next detected frame
+                metrics.passed_through += 1
+                return send(frame, start, t_mirrored)
+
+            # Find hands on the downscaled frame, cropped around the hands
+            # of the previous frame, with the stream's detector from the pool
+            try:
+                hands = config.hands.pin(session_key, DETECTOR_TIMEOUT)
+            except TimeoutError:
+                metrics.no_detector += 1
+                return send(frame, start, t_mirrored)
+            detect_image, roi = roi_tracker.prepare(img_rgb)
+            results = hands.process(detect_image)
+            if not results.multi_hand_landmarks and roi is not None:
+                # Lost the hand outside the region, search the whole frame
+                roi_tracker.reset()
+                detect_image, roi = roi_tracker.prepare(img_rgb)
+                results = hands.process(detect_image)
+            t_detected = clock()
+            metrics.record("detect", t_detected - t_mirrored)
+
+            if results.multi_hand_landmarks:
+                # Normalized feature vector from ALL hands (padded to 84 values)
+                # (mapped back from the region to full-frame coordinates)
+                features, origin = extract_features(
+                    results.multi_hand_landmarks, feature_buffer, roi
+                )
+                roi_tracker.update(features, origin)
+                if recorder is not None:
+                    recorder.record(
+                        features,
+                        origin,
+                        len(results.multi_hand_landmarks),
+                        frame.time,
+                    )
+
+                # How far the landmarks moved since the last frame
+                motion = motion_gate.update(features)
+
+                if scheduler.should_predict(motion):
+                    last_prediction = scheduler.last_prediction
+                    if last_prediction is not None and motion_gate.is_still(features):
+                        # Same hand pose as the last prediction, reuse it
+                        scheduler.record_reuse()
+                        metrics.reused += 1
+                        policy.on_prediction(config, prediction_state, last_prediction)
+                    elif scheduler.start_inference():
+                        motion_gate.mark_predicted(features)
+                        # The feature buffer is reused by the next frame, so
+                        # the worker gets a copy
+                        worker.submit(
+                            session_key,
+                            features.copy(),
+                            config,
+                            prediction_state,
+                            policy,
+                            scheduler,
+                            metrics,
+                        )
+                t_features = clock()
+                metrics.record("features", t_features - t_detected)
+
+                if level < NO_OVERLAY:
+                    renderer.draw(
+                        img_rgb, features, origin, len(results.multi_hand_landmarks)
+                    )
+                    draw_label(img_rgb, prediction_state.get_prediction(), origin)
+                t_drawn = clock()
+                metrics.record("draw", t_drawn - t_features)
+            else:
+                # A result for a hand that already left would be stale
+                worker.discard(session_key)
+                scheduler.reset()
+                motion_gate.reset()
+                roi_tracker.reset()
+                metrics.no_hand += 1
+                if recorder is not None:
+                    recorder.record_no_hand(frame.time)
+                policy.on_no_hand(prediction_state)
+                t_drawn = clock()
+
+            return send(frame, start, t_drawn)
+
+        except Exception:
+            # Keep the stream alive and return the frame unchanged, the
+            # next frame searches the whole frame again
+            metrics.errors += 1
+            roi_tracker.reset()
+            logger.exception("Error in frame callback")
+            return frame
+
+    callback.scheduler = scheduler
+    callback.motion_gate = motion_gate
+    callback.roi_tracker = roi_tracker
+    callback.frame_buffer = frame_buffer
+    callback.renderer = renderer
+    callback.metrics = metrics
+    callback.backpressure = backpressure
+    callback.recorder = recorder
+    # The detector tracks this stream's hand until the stream is closed
+    weakref.finalize(callback, config.hands.release, session_key)
+    return callback
@@ -0,0 +1,233 @@
+import logging
+import threading
+import time
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceRequest(NamedTuple):
+    """Feature vector of one session waiting for the classifier."""
+
+    features: np.ndarray
+    config: Any
+    prediction_state: Any
+    policy: Any
+    scheduler: Any
+    metrics: Any
+    submitted_ns: int
+
+
+class InferenceWorker:
+    """
+    Background thread that batches classifier runs of all sessions.
+
+    Every session has a single "latest wins" slot: submitting a new request
+    for a session replaces its request that has not started yet, so stale
+    frames are dropped instead of queued behind a slow prediction.
+
+    The worker waits up to max_wait_ms (or until max_batch sessions are
+    pending), stacks the feature vectors and runs one predict_proba on the
+    whole matrix, so many concurrent camera streams share the vectorized
+    inner loops of the ensemble. Results go back to each session's policy
+    and prediction state.
+    """
+
+    def __init__(self, max_batch=32, max_wait_ms=2.0, name="inference-worker"):
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000
+        self.name = name
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._busy = False
+        self._thread = None
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.latency = LatencyHistogram()
+        self.inference_time = LatencyHistogram()
+
+    def submit(
+        self,
+        key,
+        features,
+        config,
+        prediction_state,
+        policy,
+        scheduler=None,
+        metrics=None,
+    ):
+        """
+        Schedule a prediction for the session key, replacing its pending one.
+
+        Args:
+            key: Hashable session identifier
+            features: Feature vector, must not be modified afterwards
+            config: MediaPipeConfig whose classifier should run
+            prediction_state: Prediction state of the session
+            policy: PredictionPolicy that applies the result
+            scheduler: Optional AdaptiveScheduler that is told the
+                prediction and the inference time
+            metrics: Optional FrameMetrics of the session that records the
+                model time of the prediction
+        """
+        request = InferenceRequest(
+            features,
+            config,
+            prediction_state,
+            policy,
+            scheduler,
+            metrics,
+            time.monotonic_ns(),
+        )
+        with self._condition:
+            if key in self._pending:
+                self.dropped += 1
+            self._pending[key] = request
+            self.submitted += 1
+            self._ensure_started()
+            self._condition.notify()
+
+    def discard(self, key):
+        """Drop the pending request of a session, e.g. when the hand left."""
+        with self._condition:
+            if self._pending.pop(key, None) is not None:
+                self.dropped += 1
+
+    def wait_idle(self, timeout=None):
+        """
+        Block until no request is pending or running.
+
+        Returns:
+            True if the worker became idle before the timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def stats(self):
+        """Return queue depth, batch sizes and latency percentiles."""
+        with self._condition:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "dropped": self.dropped,
+                "queue_depth": len(self._pending),
+                "batches": self.batches,
+                "mean_batch_size": self.completed / self.batches
+                if self.batches
+                else 0.0,
+                "max_batch_size": self.max_batch_seen,
+                "latency": self.latency.summary(),
+                "inference_time": self.inference_time.summary(),
+            }
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+
+    def _next_batch(self):
+        """Wait for requests and take up to max_batch of them (oldest first)."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending)
+            deadline = time.monotonic() + self.max_wait_s
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            keys = list(self._pending)[: self.max_batch]
+            self._busy = True
+            return [self._pending.pop(key) for key in keys]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._process(batch)
+            except Exception:
+                logger.exception("Inference batch failed")
+            finally:
+                done_ns = time.monotonic_ns()
+                with self._condition:
+                    for request in batch:
+                        self.latency.record(done_ns - request.submitted_ns)
+                    self._busy = False
+                    self.completed += len(batch)
+                    self.batches += 1
+                    self.max_batch_seen = max(self.max_batch_seen, len(batch))
+                    self._condition.notify_all()
+
+    def _process(self, batch):
+        # Sessions may use different classifiers, each gets its own pass. The
+        # classifier is read once, so a model swapped in meanwhile only
+        # serves the next batch.
+        groups = {}
+        for request in batch:
+            if self._accepts(request):
+                classifier = request.config.classifier
+                groups.setdefault(id(classifier), (classifier, []))[1].append(request)
+
+        for classifier, requests in groups.values():
+            start_ns = time.monotonic_ns()
+            try:
+                predictions = classifier.predict_batch(
+                    np.stack([request.features for request in requests])
+                )
+            except Exception:
+                logger.exception("Prediction failed")
+                for request in requests:
+                    request.policy.on_error(request.prediction_state)
+                continue
+            finally:
+                elapsed_ns = time.monotonic_ns() - start_ns
+                self.inference_time.record(elapsed_ns)
+
+            # Every session of the batch pays its share of the model pass
+            cost_seconds = elapsed_ns / 1e9 / len(requests)
+            for request, prediction in zip(requests, predictions):
+                if request.scheduler is not None:
+                    request.scheduler.record_prediction(prediction, cost_seconds)
+                if request.metrics is not None:
+                    request.metrics.record_inference(
+                        elapsed_ns, prediction.model_version
+                    )
+                try:
+                    request.policy.on_prediction(
+                        request.config, request.prediction_state, prediction
+                    )
+                except Exception:
+                    logger.exception("Applying the prediction failed")
+                    request.policy.on_error(request.prediction_state)
+
+    @staticmethod
+    def _accepts(request):
+        try:
+            return request.policy.accepts(request.prediction_state, request.features)
+        except Exception:
+            logger.exception("Prediction failed")
+            request.policy.on_error(request.prediction_state)
+            return False
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_inference_worker():
+    """Return the inference worker shared by all sessions of this process."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = InferenceWorker()
+        return _worker
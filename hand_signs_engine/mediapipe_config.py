@@ -0,0 +1,199 @@
+import os
+import pickle
+import threading
+from functools import lru_cache
+
+from .classifier import Classifier
+from .compiled_model import compile_model
+from .model_artifact import METADATA_FILE, is_artifact, load_artifact
+from .model_registry import ModelRegistry
+from .resources import ResourceManager
+
+# Relative to the repository, not to the working directory of the app
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(_ROOT, "hand_signs_recognition", "hand_signs_model.p")
+
+labels_dict = {
+    0: "Zange",
+    1: "Lehrer",
+    2: "Lehrnen",
+    3: "Schule",
+    4: "Anschmieren",
+    5: "Blech",
+    6: "Hammer",
+    7: "Hebelblechschere",
+    8: "Meißel",
+    9: "Metall",
+    10: "Montieren",
+    11: "Schrauben",
+    12: "Schweissautomat",
+    13: "Sicherheit",
+    14: "Schraubenschlüssel",
+    15: "Körner",
+    16: "Maschinenschraubstock",
+    17: "Drehmaschine",
+    18: "Gewindemeissel",
+    19: "Anreissplatte",
+    20: "Anreissnadel",
+    21: "Bandsaege",
+    22: "Bohrmaschine",
+    23: "Drehmomentschlüssel",
+    24: "Feile",
+    25: "Maulschlüssel",
+    26: "Messschieber",
+    27: "Saege",
+    28: "Spiralbohrer",
+}
+
+
+def display_labels(classifier, labels=None):
+    """
+    Class id to display name for a classifier.
+
+    Starts from the labels shipped with the model (labels_dict when it has
+    none) and updates them with the explicit labels, so classes of a newer
+    model that the explicit labels do not know keep their names.
+    """
+    model_labels = classifier.labels or labels_dict
+    if labels is None:
+        return model_labels
+    return {**model_labels, **labels}
+
+
+@lru_cache(maxsize=None)
+def load_model(path=MODEL_PATH):
+    """Load the trained model once per process so all configs share it."""
+    with open(path, "rb") as model_file:
+        model_dict = pickle.load(model_file)
+    return model_dict["model"]
+
+
+def model_artifact_path(path=MODEL_PATH):
+    """Directory of the exported model artifact next to the pickled model."""
+    return os.path.splitext(path)[0]
+
+
+@lru_cache(maxsize=None)
+def load_classifier(path=MODEL_PATH):
+    """
+    Return the Classifier adapter around the shared model.
+
+    Uses the memory-mapped model artifact (see export_model) when it is at
+    least as new as the pickle, which skips unpickling scikit-learn
+    altogether. Otherwise the pickled model is compiled in memory.
+    """
+    artifact_path = model_artifact_path(path)
+    if is_artifact(artifact_path) and (
+        not os.path.exists(path)
+        or os.path.getmtime(os.path.join(artifact_path, METADATA_FILE))
+        >= os.path.getmtime(path)
+    ):
+        artifact = load_artifact(artifact_path)
+        return Classifier(artifact.model, artifact.labels, artifact.version)
+    return Classifier(compile_model(load_model(path)))
+
+
+def create_hands():
+    """Create a MediaPipe Hands detector for video streams."""
+    # Imported on use, the rest of the engine runs without MediaPipe
+    import mediapipe as mp
+
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,  # False for video streaming
+        max_num_hands=2,  # Limit to 2 hands
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+    )
+
+
+_manager = None
+_registry = None
+_manager_lock = threading.Lock()
+
+
+def get_resource_manager():
+    """Return the model and detector pool shared by all pages and sessions."""
+    global _manager, _registry
+    with _manager_lock:
+        if _manager is None:
+            _manager = ResourceManager(load_classifier, create_hands)
+            # Artifacts exported while the app runs go live without a restart
+            _registry = ModelRegistry(_manager, model_artifact_path())
+            _registry.start()
+        return _manager
+
+
+def get_model_registry():
+    """Return the registry that swaps new versions into the shared model."""
+    get_resource_manager()
+    return _registry
+
+
+class MediaPipeConfig:
+    """Configuration and initialization for MediaPipe hands detection."""
+
+    def __init__(self, labels=None, resources=None):
+        """
+        Initialize MediaPipe components and configuration.
+
+        Creating a config is cheap: the model and the Hands detectors
+        belong to the process-wide ResourceManager.
+
+        Args:
+            labels: Optional mapping of class id to display name that
+                overrides the labels of the model artifact or labels_dict
+            resources: ResourceManager to use, defaults to the one shared
+                by the process
+        """
+        if resources is None:
+            resources = get_resource_manager()
+        self.resources = resources
+
+        # MediaPipe setup
+        import mediapipe as mp
+
+        self.mp_hands = mp.solutions.hands
+        self.mp_drawing = mp.solutions.drawing_utils
+
+        # Drawing styles (optional, available in newer mediapipe versions)
+        try:
+            self.mp_styles = mp.solutions.drawing_styles
+        except Exception:
+            self.mp_styles = None
+
+        # Pool of hands detectors, a stream checks one out per frame
+        self.hands = resources.hands
+
+        # Explicit labels are merged over the ones shipped with the model,
+        # once per model version (classifier, merged labels)
+        self._labels = labels
+        self._merged_labels = (None, None)
+
+        # Load the shared ML model now rather than on the first frame
+        resources.classifier
+
+    # The model can be swapped at runtime (see ModelRegistry), so the model
+    # and its configuration are read from the resources on every access
+
+    @property
+    def classifier(self):
+        """Classifier currently serving predictions."""
+        return self.resources.classifier
+
+    @property
+    def model(self):
+        return self.classifier.model
+
+    @property
+    def EXPECTED_LENGTH(self):
+        return self.classifier.feature_length
+
+    @property
+    def labels_dict(self):
+        """Class id to display name, see display_labels()."""
+        classifier = self.classifier
+        cached, merged = self._merged_labels
+        if cached is not classifier:
+            merged = display_labels(classifier, self._labels)
+            self._merged_labels = (classifier, merged)
+        return merged
@@ -0,0 +1,305 @@
+import itertools
+import json
+import math
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import deque
+
+
+class LatencyHistogram:
+    """
+    Log-scale histogram of durations in nanoseconds.
+
+    Recording is a bisect and a list increment, so it is cheap enough for
+    the frame path. Each histogram is meant to have a single writer thread;
+    readers only take a snapshot of the counts.
+    """
+
+    BUCKETS_PER_OCTAVE = 4
+
+    def __init__(self, min_ns=1_000, max_ns=10_000_000_000):
+        n_buckets = math.ceil(math.log2(max_ns / min_ns) * self.BUCKETS_PER_OCTAVE)
+        # Upper bound of every bucket, the last bucket catches everything above
+        self.bounds = [
+            min_ns * 2 ** (i / self.BUCKETS_PER_OCTAVE) for i in range(n_buckets + 1)
+        ]
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns):
+        """Add one duration in nanoseconds."""
+        self.counts[bisect_left(self.bounds, duration_ns)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, q):
+        """
+        Approximate q-th percentile (0-100) in nanoseconds.
+
+        Returns the upper bound of the bucket holding the percentile, capped
+        at the largest recorded value; 0 when nothing was recorded.
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for i, bucket_count in enumerate(list(self.counts)):
+            seen += bucket_count
+            if seen >= rank:
+                if i < len(self.bounds):
+                    return min(self.bounds[i], self.max_ns)
+                return self.max_ns
+        return self.max_ns
+
+    def merge(self, other):
+        """Add the counts of another histogram with the same bounds."""
+        for i, bucket_count in enumerate(list(other.counts)):
+            self.counts[i] += bucket_count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def summary(self):
+        """Return count, mean, p50/p95/p99 and max in milliseconds."""
+        mean_ns = self.total_ns / self.count if self.count else 0
+        return {
+            "count": self.count,
+            "mean_ms": mean_ns / 1e6,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p95_ms": self.percentile(95) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+# Stages of the frame callback, in order
+FRAME_STAGES = ("decode", "mirror", "detect", "features", "draw", "encode", "total")
+# Counters of FrameMetrics
+FRAME_COUNTERS = (
+    "frames_in",
+    "frames_out",
+    "no_hand",
+    "reused",
+    "passed_through",
+    "no_detector",
+    "inferences",
+    "errors",
+)
+
+
+class FrameMetrics:
+    """
+    Stage timings and counters of one video stream.
+
+    The frame thread writes the stage histograms and frame counters, the
+    inference worker writes the inference histogram and counter. Every
+    value has a single writer, so recording needs no lock.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name=None):
+        self.name = name or f"session-{next(self._ids)}"
+        self.started = time.time()
+        self.stages = {stage: LatencyHistogram() for stage in FRAME_STAGES}
+        self.inference = LatencyHistogram()
+        self.frames_in = 0
+        self.frames_out = 0
+        self.no_hand = 0
+        self.reused = 0
+        self.passed_through = 0
+        self.no_detector = 0
+        self.inferences = 0
+        self.errors = 0
+        # Predictions per model version, the model can be swapped at runtime
+        self.models = {}
+        # Optional BackpressureController of the stream, reported with it
+        self.backpressure = None
+
+    def record(self, stage, duration_ns):
+        """Add the duration of one frame stage in nanoseconds."""
+        self.stages[stage].record(duration_ns)
+
+    def record_inference(self, duration_ns, model_version=None):
+        """
+        Add the model time of one finished prediction in nanoseconds.
+
+        Args:
+            duration_ns: Model time of the prediction
+            model_version: Version of the model that made it, if known
+        """
+        self.inference.record(duration_ns)
+        self.inferences += 1
+        version = model_version or "unversioned"
+        self.models[version] = self.models.get(version, 0) + 1
+
+    def counters(self):
+        """Return the frame and inference counters."""
+        return {name: getattr(self, name) for name in FRAME_COUNTERS}
+
+    def snapshot(self):
+        """Return counters and the latency summary of every stage."""
+        stages = {stage: h.summary() for stage, h in self.stages.items()}
+        stages["inference"] = self.inference.summary()
+        snapshot = {
+            "started": self.started,
+            "counters": self.counters(),
+            "stages": stages,
+            "models": dict(self.models),
+        }
+        if self.backpressure is not None:
+            snapshot["backpressure"] = self.backpressure.stats()
+        return snapshot
+
+
+class MetricsRegistry:
+    """
+    Keeps the FrameMetrics of all live streams of the process.
+
+    Streams are held weakly, so a closed stream disappears together with
+    its frame callback. Its counters, histograms and backpressure times
+    are then folded into the totals of closed streams, so the registry
+    totals cover the whole lifetime of the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = weakref.WeakSet()
+        self._closed = FrameMetrics(name="closed")
+        self._closed_seconds_at_level: dict = {}
+        self.closed_sessions = 0
+        # Finalizers may run in any thread, even one holding the lock, so
+        # they only queue the attributes of the stream for _fold_closed().
+        # register() and snapshot() drain the queue, so it holds at most the
+        # streams closed since the last new stream
+        self._closing: deque = deque()
+
+    def register(self, metrics):
+        """Track metrics and return them."""
+        with self._lock:
+            self._fold_closed()
+            if metrics in self._sessions:
+                return metrics
+            self._sessions.add(metrics)
+        # The finalizer must not reference metrics, it keeps its attributes
+        weakref.finalize(metrics, _close_stream, self._closing, vars(metrics))
+        return metrics
+
+    def sessions(self):
+        """Return the metrics of all live streams, oldest first."""
+        with self._lock:
+            sessions = list(self._sessions)
+        return sorted(sessions, key=lambda metrics: metrics.started)
+
+    def snapshot(self):
+        """
+        Return per-stream snapshots and the totals over all streams.
+
+        Returns:
+            Dict with "sessions" (name -> FrameMetrics.snapshot()) and
+            "total" (summed counters, merged stage histograms, predictions
+            per model version and the time spent on every backpressure
+            level, closed streams included, and the number of closed
+            streams)
+        """
+        sessions = self.sessions()
+        merged = {stage: LatencyHistogram() for stage in FRAME_STAGES}
+        inference = LatencyHistogram()
+        with self._lock:
+            self._fold_closed()
+            closed = self._closed
+            counters = closed.counters()
+            for stage, histogram in closed.stages.items():
+                merged[stage].merge(histogram)
+            inference.merge(closed.inference)
+            models = dict(closed.models)
+            seconds_at_level = dict(self._closed_seconds_at_level)
+            closed_sessions = self.closed_sessions
+        for metrics in sessions:
+            for name, value in metrics.counters().items():
+                counters[name] += value
+            for stage, histogram in metrics.stages.items():
+                merged[stage].merge(histogram)
+            inference.merge(metrics.inference)
+            for version, count in list(metrics.models.items()):
+                models[version] = models.get(version, 0) + count
+        stages = {stage: h.summary() for stage, h in merged.items()}
+        stages["inference"] = inference.summary()
+        snapshots = {metrics.name: metrics.snapshot() for metrics in sessions}
+        # Time all streams spent on every degradation level
+        for snapshot in snapshots.values():
+            levels = snapshot.get("backpressure", {}).get("seconds_at_level", {})
+            _add_seconds(seconds_at_level, levels)
+        return {
+            "sessions": snapshots,
+            "total": {
+                "counters": counters,
+                "stages": stages,
+                "models": models,
+                "seconds_at_level": seconds_at_level,
+                "closed_sessions": closed_sessions,
+            },
+        }
+
+    def _fold_closed(self):
+        # Called with the lock held
+        closed = self._closed
+        while self._closing:
+            state, levels = self._closing.popleft()
+            for name in FRAME_COUNTERS:
+                setattr(closed, name, getattr(closed, name) + state[name])
+            for stage, histogram in state["stages"].items():
+                closed.stages[stage].merge(histogram)
+            closed.inference.merge(state["inference"])
+            for version, count in state["models"].items():
+                closed.models[version] = closed.models.get(version, 0) + count
+            _add_seconds(self._closed_seconds_at_level, levels)
+            self.closed_sessions += 1
+
+    def to_json(self, path=None, indent=2):
+        """
+        Serialize snapshot() as JSON.
+
+        Args:
+            path: Optional file to write the JSON to
+
+        Returns:
+            The JSON string
+        """
+        text = json.dumps(self.snapshot(), indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+
+def _close_stream(closing, state):
+    """Finalizer of a registered FrameMetrics, state holds its attributes."""
+    backpressure = state["backpressure"]
+    # Taken now, the time on the current level would keep growing
+    levels = {} if backpressure is None else backpressure.stats()["seconds_at_level"]
+    closing.append((state, levels))
+
+
+def _add_seconds(total, seconds_at_level):
+    for level, seconds in seconds_at_level.items():
+        total[level] = total.get(level, 0.0) + seconds
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry():
+    """Return the metrics registry shared by all sessions of this process."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from .compiled_model import CompiledForest
+
+FORMAT_VERSION = 1
+METADATA_FILE = "metadata.json"
+
+
+class ModelArtifact(NamedTuple):
+    """A loaded model artifact."""
+
+    model: CompiledForest
+    labels: dict
+    feature_length: int
+    version: str
+    metadata: dict
+
+
+def is_artifact(directory):
+    """True if directory holds a model artifact."""
+    return os.path.isfile(os.path.join(directory, METADATA_FILE))
+
+
+def save_artifact(directory, model, labels, version=None, source=None):
+    """
+    Write a model artifact: metadata.json plus one .npy file per array.
+
+    The files are written to a temporary directory that then replaces
+    directory, so readers never see a half-written artifact.
+
+    Args:
+        directory: Artifact directory to create or replace
+        model: CompiledForest or a fitted scikit-learn tree classifier
+        labels: Mapping of class id to display name
+        version: Model version, defaults to the current UTC time
+        source: Optional description of the source, e.g. the pickle path
+
+    Returns:
+        The metadata that was written
+    """
+    if not isinstance(model, CompiledForest):
+        model = CompiledForest.from_estimator(model)
+    if version is None:
+        version = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+
+    directory = os.path.abspath(directory)
+    temporary = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(temporary, ignore_errors=True)
+    os.makedirs(temporary)
+    for name in CompiledForest.ARRAYS:
+        np.save(os.path.join(temporary, f"{name}.npy"), getattr(model, name))
+    metadata = {
+        "format_version": FORMAT_VERSION,
+        "version": str(version),
+        "model_type": "CompiledForest",
+        "feature_length": model.n_features_in_,
+        "classes": model.classes_.tolist(),
+        "labels": {str(class_id): name for class_id, name in labels.items()},
+        "depth": model.depth,
+        "trees": len(model.roots),
+        "nodes": len(model.feature),
+        "created": time.time(),
+        "source": source,
+    }
+    with open(os.path.join(temporary, METADATA_FILE), "w") as metadata_file:
+        json.dump(metadata, metadata_file, indent=2, ensure_ascii=False)
+
+    # Processes that mapped the old files keep reading them until they reload
+    previous = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.rename(directory, previous)
+    os.rename(temporary, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return metadata
+
+
+def load_artifact(directory, mmap=True):
+    """
+    Load a model artifact written by save_artifact.
+
+    With mmap=True the arrays are memory-mapped read-only, so nothing is
+    deserialized and all processes that load the same artifact share its
+    pages in the page cache.
+
+    Raises:
+        ValueError: If the format version or the arrays do not match the
+            metadata
+    """
+    with open(os.path.join(directory, METADATA_FILE)) as metadata_file:
+        metadata = json.load(metadata_file)
+    if metadata.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format: {metadata.get('format_version')}")
+
+    mmap_mode = "r" if mmap else None
+    # np.asarray drops the np.memmap subclass, whose ufunc wrapping costs
+    # time on every operation, but keeps the mapped buffer
+    arrays = {
+        name: np.asarray(
+            np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+        )
+        for name in CompiledForest.ARRAYS
+    }
+    model = CompiledForest(
+        classes=np.array(metadata["classes"]),
+        depth=metadata["depth"],
+        n_features=metadata["feature_length"],
+        **arrays,
+    )
+    shape = (len(model.roots), len(model.feature), model.values.shape[1])
+    if shape != (metadata["trees"], metadata["nodes"], len(model.classes_)):
+        raise ValueError(f"Model arrays do not match {METADATA_FILE}")
+
+    labels = {int(class_id): name for class_id, name in metadata["labels"].items()}
+    return ModelArtifact(
+        model, labels, metadata["feature_length"], metadata["version"], metadata
+    )
@@ -0,0 +1,231 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from .classifier import Classifier
+from .features import FEATURE_LENGTH
+from .model_artifact import METADATA_FILE, is_artifact, load_artifact
+from .recording import NO_LABEL, load_recording, normalize_landmarks
+
+logger = logging.getLogger(__name__)
+
+# Held-out recording checked before a model version goes live
+FIXTURES_FILE = "fixtures.npz"
+
+
+class ModelRegistry:
+    """
+    Swaps new model versions into the running app without a restart.
+
+    Watches a directory that is a model artifact itself (re-exported in
+    place by export_model) or that holds one artifact per version in
+    subdirectories. When a newer artifact appears it is loaded and
+    validated on the registry thread, then swapped into the
+    ResourceManager. Frames already handed to the classifier finish on the
+    old model, the next batch uses the new one. Versions that fail
+    validation are logged and skipped, the current model stays active.
+    """
+
+    def __init__(
+        self,
+        resources,
+        directory,
+        fixtures=None,
+        min_accuracy=0.8,
+        poll_seconds=5.0,
+        max_events=50,
+    ):
+        """
+        Args:
+            resources: ResourceManager whose classifier is replaced
+            directory: Model artifact or directory of artifacts to watch
+            fixtures: LandmarkRecording or path of a labelled recording
+                (see hand_signs_engine.recording) to validate new versions
+                on, defaults to fixtures.npz in directory. Without fixtures
+                only the feature length and labels are checked.
+            min_accuracy: Accuracy on the fixtures a version needs
+            poll_seconds: Interval between directory scans
+            max_events: Number of load and swap events kept
+        """
+        self.resources = resources
+        self.directory = directory
+        self.fixtures = fixtures
+        self.min_accuracy = min_accuracy
+        self.poll_seconds = poll_seconds
+        self.events = deque(maxlen=max_events)
+        self.swaps = 0
+        self.rejected = 0
+        self._current = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def scan(self):
+        """
+        Find the newest artifact in the watched directory.
+
+        Returns:
+            (path, mtime_ns of its metadata) or None
+        """
+        candidates = []
+        if is_artifact(self.directory):
+            candidates.append(self.directory)
+        elif os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                # save_artifact writes to *.tmp-* and moves away *.old-*
+                if ".tmp-" in entry.name or ".old-" in entry.name:
+                    continue
+                if entry.is_dir() and is_artifact(entry.path):
+                    candidates.append(entry.path)
+        newest = None
+        for path in candidates:
+            try:
+                mtime_ns = os.stat(os.path.join(path, METADATA_FILE)).st_mtime_ns
+            except OSError:
+                continue
+            if newest is None or mtime_ns > newest[1]:
+                newest = (path, mtime_ns)
+        return newest
+
+    def check(self):
+        """
+        Load, validate and swap in the newest artifact if it changed.
+
+        Returns:
+            True if a new model version was swapped in
+        """
+        found = self.scan()
+        if found is None or found == self._current:
+            return False
+        # A rejected version is not retried until its files change
+        self._current = found
+        path = found[0]
+
+        start = time.perf_counter()
+        try:
+            artifact = load_artifact(path)
+            classifier = Classifier(artifact.model, artifact.labels, artifact.version)
+            loaded = time.perf_counter()
+            accuracy = self.validate(classifier)
+        except Exception as e:
+            self.rejected += 1
+            logger.error("Model %s rejected: %s", path, e)
+            self._record("rejected", path, None, error=str(e))
+            return False
+        validated = time.perf_counter()
+
+        previous = self.resources.swap_classifier(classifier)
+        swapped = time.perf_counter()
+        self.swaps += 1
+        logger.info(
+            "Model %s swapped in (was %s)",
+            artifact.version,
+            getattr(previous, "version", None),
+        )
+        self._record(
+            "swapped",
+            path,
+            artifact.version,
+            previous_version=getattr(previous, "version", None),
+            load_seconds=loaded - start,
+            validation_seconds=validated - loaded,
+            swap_seconds=swapped - validated,
+            accuracy=accuracy,
+        )
+        return True
+
+    def validate(self, classifier):
+        """
+        Check a classifier before it goes live.
+
+        Returns:
+            Accuracy on the fixtures, or None without fixtures
+
+        Raises:
+            ValueError: If the feature length or labels do not fit the app
+                or the accuracy is below min_accuracy
+        """
+        if classifier.feature_length != FEATURE_LENGTH:
+            raise ValueError(
+                f"Model expects {classifier.feature_length} features, "
+                f"the app sends {FEATURE_LENGTH}"
+            )
+        if classifier.labels is not None:
+            missing = set(classifier.class_ids.tolist()) - set(classifier.labels)
+            if missing:
+                raise ValueError(f"No labels for classes {sorted(missing)}")
+        classifier.predict(np.zeros(FEATURE_LENGTH, dtype=np.float32))
+
+        fixtures = self._load_fixtures()
+        if fixtures is None:
+            return None
+        landmarks, hands, labels, _ = fixtures
+        rows = np.flatnonzero((hands > 0) & (labels != NO_LABEL))
+        if not len(rows):
+            return None
+        features = normalize_landmarks(landmarks[rows], hands[rows])
+        predicted = [p.class_id for p in classifier.predict_batch(features)]
+        accuracy = float(np.mean(np.asarray(predicted) == labels[rows]))
+        if accuracy < self.min_accuracy:
+            raise ValueError(
+                f"Accuracy {accuracy:.1%} on the fixtures is below "
+                f"{self.min_accuracy:.1%}"
+            )
+        return accuracy
+
+    def start(self):
+        """Watch the directory on a daemon thread, from the current files."""
+        if self._thread is not None:
+            return
+        # The ResourceManager loads the current files itself
+        self._current = self.scan()
+        self._thread = threading.Thread(
+            target=self._run, name="model-registry", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """Return the active version, swap counters and recent events."""
+        return {
+            "directory": self.directory,
+            "version": self.resources.model_version,
+            "swaps": self.swaps,
+            "rejected": self.rejected,
+            "events": list(self.events),
+        }
+
+    def _load_fixtures(self):
+        fixtures = self.fixtures
+        if fixtures is None:
+            fixtures = os.path.join(self.directory, FIXTURES_FILE)
+        if isinstance(fixtures, (str, os.PathLike)):
+            return load_recording(fixtures) if os.path.exists(fixtures) else None
+        return fixtures
+
+    def _record(self, event, path, version, **details):
+        self.events.append(
+            {
+                "event": event,
+                "time": time.time(),
+                "path": path,
+                "version": version,
+                **details,
+            }
+        )
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Model registry check failed")
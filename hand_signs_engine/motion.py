@@ -0,0 +1,86 @@
+import threading
+
+import numpy as np
+
+from .features import FEATURE_LENGTH
+
+
+class MotionGate:
+    """
+    Skips the classifier while the hand has not meaningfully moved.
+
+    The current feature vector is compared with the one the last prediction
+    was made on, using the max-abs ("max") or euclidean ("l2") distance.
+    Below epsilon the cached prediction is reused. Comparing exact floats,
+    as the quiz did, practically never matched with real camera noise.
+    """
+
+    def __init__(self, epsilon=0.01, norm="max"):
+        """
+        Args:
+            epsilon: Distance of normalized features below which the hand
+                counts as still
+            norm: "max" for the largest coordinate change, "l2" for the
+                euclidean distance of the whole vector
+        """
+        if norm not in ("max", "l2"):
+            raise ValueError(f"Unknown norm: {norm}")
+        self.epsilon = epsilon
+        self.norm = norm
+        self._lock = threading.Lock()
+        self._previous = np.zeros(FEATURE_LENGTH, dtype=np.float32)
+        self._reference = np.zeros(FEATURE_LENGTH, dtype=np.float32)
+        self._has_reference = False
+        self.checked = 0
+        self.skipped = 0
+
+    def distance(self, a, b):
+        """Distance between two feature vectors in the configured norm."""
+        delta = a - b
+        if self.norm == "max":
+            return float(np.abs(delta).max())
+        return float(np.sqrt(np.dot(delta, delta)))
+
+    def update(self, features):
+        """
+        Record the features of a new frame.
+
+        Returns:
+            Max-abs change since the previous frame (used by the scheduler)
+        """
+        motion = float(np.abs(features - self._previous).max())
+        self._previous[:] = features
+        return motion
+
+    def is_still(self, features):
+        """True if features are within epsilon of the last predicted ones."""
+        with self._lock:
+            self.checked += 1
+            if (
+                self._has_reference
+                and self.distance(features, self._reference) < self.epsilon
+            ):
+                self.skipped += 1
+                return True
+            return False
+
+    def mark_predicted(self, features):
+        """Remember the features a prediction is being made on."""
+        self._reference[:] = features
+        self._has_reference = True
+
+    def reset(self):
+        """Forget the hand, e.g. when it left the frame."""
+        self._previous[:] = 0.0
+        self._has_reference = False
+
+    def stats(self):
+        """Return how many predictions the gate checked and skipped."""
+        with self._lock:
+            return {
+                "epsilon": self.epsilon,
+                "norm": self.norm,
+                "checked": self.checked,
+                "skipped": self.skipped,
+                "skip_ratio": self.skipped / self.checked if self.checked else 0.0,
+            }
@@ -0,0 +1,49 @@
+import threading
+
+# Longest a UI thread waits without a change. Streamlit handles clicks and
+# the stop of the stream only when the script calls st again.
+UI_REFRESH_SECONDS = 1.0
+
+
+class ChangeNotifier:
+    """
+    Wakes up UI threads when a prediction state changed.
+
+    The Streamlit pages used to poll the prediction state with
+    time.sleep(), which delays every update by up to the sleep interval and
+    re-renders the page even when nothing changed. The state now counts
+    its changes in a version number and the UI thread blocks on a
+    condition variable until the version differs from the one it rendered
+    or the timeout passes.
+
+    Shares the lock of the prediction state, whose methods call notify()
+    while they hold it.
+    """
+
+    def __init__(self, lock):
+        """
+        Args:
+            lock: Lock of the prediction state
+        """
+        self.condition = threading.Condition(lock)
+        self.version = 0
+
+    def notify(self):
+        """Count a change and wake all waiting threads, needs the lock held."""
+        self.version += 1
+        self.condition.notify_all()
+
+    def wait(self, version=None, timeout=None):
+        """
+        Block until the version differs from version, needs the lock free.
+
+        Args:
+            version: Version the caller has seen, None returns at once
+            timeout: Seconds to wait at most, None waits forever
+
+        Returns:
+            The current version, still equal to version after a timeout
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
@@ -0,0 +1,215 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreCadence:
+    """
+    Turns elapsed time into strength updates at a fixed rate.
+
+    The scheduler runs the classifier between 1 and 15 times per second,
+    so changing the quiz strength once per prediction would make the quiz
+    fill faster for a moving hand. steps() returns how many updates of
+    rate per second are due since the last one: the first call and then
+    0 for predictions in between, or several after a slow prediction.
+    Only prediction-driven updates use it, frames without a hand decay
+    the strength on every frame.
+    """
+
+    def __init__(self, rate=3.0, max_steps=3, clock=time.monotonic):
+        """
+        Args:
+            rate: Strength updates per second, 3 is the former prediction
+                cadence of every 10th frame at 30 fps
+            max_steps: Most updates applied at once, e.g. after a pause
+            clock: Time source in seconds
+        """
+        self.rate = rate
+        self.max_steps = max_steps
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._last = None
+
+    def steps(self):
+        """Number of strength updates due now."""
+        with self._lock:
+            now = self.clock()
+            if self._last is None:
+                self._last = now
+                return 1
+            steps = int((now - self._last) * self.rate)
+            if steps > self.max_steps:
+                self._last = now
+                return self.max_steps
+            self._last += steps / self.rate
+            return steps
+
+
+class PredictionPolicy:
+    """
+    Decides what a classifier run means for a prediction state.
+
+    The inference worker calls accepts() and on_prediction() for frames the
+    scheduler picked, the frame engine calls on_no_hand() when the frame
+    has no hand, and on_error() is used when the model raised. Subclasses
+    implement the behaviour of one page (free recognition, quiz scoring,
+    DGS challenge) in on_prediction().
+    """
+
+    no_hand_message = "No hand detected"
+    error_message = "Error"
+
+    def predict(self, config, prediction_state, features):
+        """Run the classifier on a feature vector and apply the result."""
+        if self.accepts(prediction_state, features):
+            prediction = config.classifier.predict(features)
+            self.on_prediction(config, prediction_state, prediction)
+
+    def accepts(self, prediction_state, features):
+        """Return False to skip the classifier for this feature vector."""
+        return True
+
+    def on_prediction(self, config, prediction_state, prediction):
+        """Update the prediction state from a classifier Prediction."""
+        raise NotImplementedError
+
+    def on_no_hand(self, prediction_state):
+        """Update the prediction state when no hand is in the frame."""
+        prediction_state.set_prediction(self.no_hand_message)
+
+    def on_error(self, prediction_state):
+        """Update the prediction state when the model raised an exception."""
+        prediction_state.set_prediction(self.error_message)
+
+
+class FreeRecognitionPolicy(PredictionPolicy):
+    """Shows the recognized sign name, used by the recognition and RAG pages."""
+
+    def __init__(self, threshold=0.3, show_confidence=True):
+        """
+        Args:
+            threshold: Minimum confidence to accept a prediction
+            show_confidence: Append the confidence to the label, e.g.
+                "Hammer (0.81)"
+        """
+        self.threshold = threshold
+        self.show_confidence = show_confidence
+
+    def on_prediction(self, config, prediction_state, prediction):
+        predicted_class = prediction.class_id
+        confidence = prediction.confidence  # Highest probability
+
+        # Only accept if confidence is high enough
+        if confidence < self.threshold:
+            predicted_character = "Unknown gesture"
+        elif predicted_class in config.labels_dict:
+            predicted_character = config.labels_dict[predicted_class]
+            if self.show_confidence:
+                predicted_character += f" ({confidence:.2f})"
+        else:
+            predicted_character = f"Unknown class: {predicted_class}"
+
+        prediction_state.set_prediction(predicted_character)
+
+        # States with temporal smoothing (see hand_signs_engine.smoothing)
+        # also get the probabilities, low-confidence ones included
+        if hasattr(prediction_state, "add_prediction"):
+            classifier = prediction.classifier or config.classifier
+            prediction_state.add_prediction(classifier.class_ids, prediction.proba)
+
+    def on_no_hand(self, prediction_state):
+        super().on_no_hand(prediction_state)
+        if hasattr(prediction_state, "reset_smoothing"):
+            prediction_state.reset_smoothing()
+
+
+class TargetStrengthPolicy(PredictionPolicy):
+    """Scores how strongly the hand shows one target class (Hand Signs Quiz)."""
+
+    no_hand_message = ""
+
+    def __init__(self, correct_class, threshold=0.1, cadence=None):
+        """
+        Args:
+            correct_class: Target class id, e.g. "6" for Hammer
+            threshold: Minimum target probability that counts as progress
+            cadence: ScoreCadence of the strength updates, defaults to 3/s
+        """
+        self.correct_class = correct_class
+        self.threshold = threshold
+        self.cadence = cadence or ScoreCadence()
+
+    def on_prediction(self, config, prediction_state, prediction):
+        correct_class_prob = config.classifier.probability_of(
+            prediction, self.correct_class
+        )
+
+        if correct_class_prob > self.threshold:
+            predicted_word = "Good.."
+            for _ in range(self.cadence.steps()):
+                prediction_state.set_prediction_strength(correct_class_prob)
+        else:
+            predicted_word = "Adjust your hands"
+
+        prediction_state.set_prediction(predicted_word)
+
+
+class ChallengePolicy(PredictionPolicy):
+    """Raises the strength only for the expected sign (Workshop DGS challenge)."""
+
+    no_hand_message = "Keine Hand erkannt"
+    error_message = "ML Error"
+
+    def __init__(self, correct_class, threshold=0.3, cadence=None):
+        """
+        Args:
+            correct_class: Expected class id, e.g. "6" for Hammer
+            threshold: Minimum confidence for a recognized sign
+            cadence: ScoreCadence of the strength updates, defaults to 3/s
+        """
+        try:
+            self.expected_class_id = int(correct_class)
+        except ValueError:
+            logger.error("Invalid correct_class ID: %s", correct_class)
+            self.expected_class_id = -1  # nie erfüllt, aber Callback läuft weiter
+        self.threshold = threshold
+        self.cadence = cadence or ScoreCadence()
+
+    def on_prediction(self, config, prediction_state, prediction):
+        predicted_class = prediction.class_id
+        confidence = prediction.confidence
+
+        if confidence >= self.threshold and predicted_class == self.expected_class_id:
+            # Richtige Gebärde
+            prediction_state.set_prediction(
+                f"{config.labels_dict[predicted_class]} ✅ ({confidence:.2f})"
+            )
+            for _ in range(self.cadence.steps()):
+                prediction_state.increase_prediction_strength(confidence)
+        elif confidence >= self.threshold:
+            # Falsche, aber relativ sichere Gebärde
+            prediction_state.set_prediction(
+                f"{config.labels_dict[predicted_class]} ❌ ({confidence:.2f})"
+            )
+            self._decrease(prediction_state)
+        else:
+            # Unsichere oder unbekannte Gebärde
+            prediction_state.set_prediction("Unbekannte Geste")
+            self._decrease(prediction_state)
+
+    # Ohne Hand und bei Fehlern sinkt die Stärke wie bisher bei jedem Frame,
+    # unabhängig davon, wie oft der Klassifikator läuft
+
+    def on_no_hand(self, prediction_state):
+        super().on_no_hand(prediction_state)
+        prediction_state.decrease_prediction_strength()
+
+    def on_error(self, prediction_state):
+        super().on_error(prediction_state)
+        prediction_state.decrease_prediction_strength()
+
+    def _decrease(self, prediction_state):
+        for _ in range(self.cadence.steps()):
+            prediction_state.decrease_prediction_strength()
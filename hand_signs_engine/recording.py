@@ -0,0 +1,157 @@
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from .features import FEATURE_LENGTH, FEATURE_SHAPE, MAX_HANDS
+
+FORMAT_VERSION = 1
+# Label of frames whose expected sign is unknown
+NO_LABEL = -1
+
+
+class LandmarkRecording(NamedTuple):
+    """
+    Landmarks of consecutive frames of one session.
+
+    Stored as .npz with one array per field (see save_recording):
+    landmarks (frames, 84) float32 full-frame x/y of up to two hands, zero
+    for missing hands; hands (frames,) uint8 number of detected hands;
+    labels (frames,) int16 expected class id or NO_LABEL; timestamps
+    (frames,) float64 seconds.
+    """
+
+    landmarks: np.ndarray
+    hands: np.ndarray
+    labels: np.ndarray
+    timestamps: np.ndarray
+
+
+def save_recording(path, recording):
+    """Write a LandmarkRecording as compressed .npz."""
+    np.savez_compressed(path, version=FORMAT_VERSION, **recording._asdict())
+
+
+def load_recording(path):
+    """
+    Read a recording written by save_recording.
+
+    Raises:
+        ValueError: If the file has another format version or feature length
+    """
+    with np.load(path) as data:
+        version = int(data["version"])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version: {version}")
+        landmarks = data["landmarks"].astype(np.float32, copy=False)
+        if landmarks.ndim != 2 or landmarks.shape[1] != FEATURE_LENGTH:
+            raise ValueError(f"Expected (frames, 84) landmarks: {landmarks.shape}")
+        return LandmarkRecording(
+            landmarks,
+            data["hands"].astype(np.uint8, copy=False),
+            data["labels"].astype(np.int16, copy=False),
+            data["timestamps"].astype(np.float64, copy=False),
+        )
+
+
+def normalize_landmarks(landmarks, hands):
+    """
+    Feature vectors of many frames at once, as extract_features builds them.
+
+    Args:
+        landmarks: (frames, 84) full-frame coordinates of a recording
+        hands: (frames,) number of detected hands
+
+    Returns:
+        (frames, 84) float32 features; frames without a hand are all zero
+    """
+    coords = landmarks.reshape(-1, *FEATURE_SHAPE).astype(np.float32)
+    detected = np.arange(MAX_HANDS) < np.asarray(hands)[:, None]
+    masked = np.where(detected[:, :, None, None], coords, np.inf)
+    origin = masked.min(axis=(1, 2))
+    origin[~detected.any(axis=1)] = 0.0
+    coords -= origin[:, None, None, :]
+    coords[~detected] = 0.0
+    return coords.reshape(-1, FEATURE_LENGTH)
+
+
+class LandmarkRecorder:
+    """
+    Captures the landmarks of a live session for offline benchmarks.
+
+    Passed to create_frame_callback(recorder=...), it stores the full-frame
+    coordinates of every frame (features + origin) and the current label,
+    which the page may change while recording, e.g. to the sign the quiz
+    asks for.
+    """
+
+    def __init__(self, label=NO_LABEL, capacity=1024):
+        """
+        Args:
+            label: Expected class id of the recorded frames, or NO_LABEL
+            capacity: Initial number of frames, the buffers grow as needed
+        """
+        self.label = label
+        self.frames = 0
+        self._landmarks = np.zeros((capacity, FEATURE_LENGTH), dtype=np.float32)
+        self._hands = np.zeros(capacity, dtype=np.uint8)
+        self._labels = np.zeros(capacity, dtype=np.int16)
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+
+    def record(self, features, origin, n_hands, timestamp=None):
+        """
+        Add a frame with hands.
+
+        Args:
+            features: Normalized feature vector from extract_features
+            origin: (x_min, y_min) returned with the features
+            n_hands: Number of detected hands
+            timestamp: Frame time in seconds, defaults to the current time
+        """
+        row = self._next_row(timestamp)
+        n_hands = min(n_hands, MAX_HANDS)
+        coords = self._landmarks[row].reshape(FEATURE_SHAPE)
+        coords[:n_hands] = features.reshape(FEATURE_SHAPE)[:n_hands] + origin
+        coords[n_hands:] = 0.0
+        self._hands[row] = n_hands
+
+    def record_no_hand(self, timestamp=None):
+        """Add a frame without hands."""
+        row = self._next_row(timestamp)
+        self._landmarks[row] = 0.0
+        self._hands[row] = 0
+
+    def recording(self):
+        """Return a LandmarkRecording with a copy of the frames so far."""
+        n = self.frames
+        return LandmarkRecording(
+            self._landmarks[:n].copy(),
+            self._hands[:n].copy(),
+            self._labels[:n].copy(),
+            self._timestamps[:n].copy(),
+        )
+
+    def save(self, path):
+        """Write the frames so far to an .npz file."""
+        save_recording(path, self.recording())
+
+    def reset(self):
+        """Drop all recorded frames."""
+        self.frames = 0
+
+    def _next_row(self, timestamp):
+        if self.frames == len(self._hands):
+            self._grow()
+        row = self.frames
+        self._labels[row] = self.label
+        self._timestamps[row] = time.time() if timestamp is None else timestamp
+        self.frames += 1
+        return row
+
+    def _grow(self):
+        capacity = 2 * len(self._hands)
+        for name in ("_landmarks", "_hands", "_labels", "_timestamps"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
@@ -0,0 +1,113 @@
+import cv2
+import numpy as np
+
+from .features import FEATURE_SHAPE
+
+# Colors and sizes of mediapipe's default hand style (drawing_styles), as
+# tuples in the channel order mp_drawing received, so the overlay looks
+# the same as before
+_RED = (48, 48, 255)
+_GREEN = (48, 255, 48)
+_BLUE = (192, 101, 21)
+_YELLOW = (0, 204, 255)
+_GRAY = (128, 128, 128)
+_PURPLE = (128, 64, 128)
+_PEACH = (180, 229, 255)
+_WHITE = (224, 224, 224)
+
+_RADIUS = 5
+_BORDER_RADIUS = 6
+
+# (path, color, thickness) per part of the hand. Consecutive landmarks of a
+# path are the mediapipe.solutions.hands_connections of that part, so one
+# polyline draws all of its connections.
+CONNECTION_PATHS = (
+    ((1, 0, 5, 9, 13, 17, 0), _GRAY, 3),
+    ((1, 2, 3, 4), _PEACH, 2),
+    ((5, 6, 7, 8), _PURPLE, 2),
+    ((9, 10, 11, 12), _YELLOW, 2),
+    ((13, 14, 15, 16), _GREEN, 2),
+    ((17, 18, 19, 20), _BLUE, 2),
+)
+
+# (landmarks, color) per part of the hand
+LANDMARK_GROUPS = (
+    ((0, 1, 5, 9, 13, 17), _RED),
+    ((2, 3, 4), _PEACH),
+    ((6, 7, 8), _PURPLE),
+    ((10, 11, 12), _YELLOW),
+    ((14, 15, 16), _GREEN),
+    ((18, 19, 20), _BLUE),
+)
+
+
+class LandmarkRenderer:
+    """
+    Draws the hand skeleton with a few batched calls.
+
+    mp_drawing.draw_landmarks rebuilds its style dicts, reads every
+    landmark from the protobuf and issues one cv2.line per connection for
+    every hand. The renderer precomputes the connection paths and colors
+    once and draws straight from the feature vector: one cv2.polylines per
+    part of the hand for all hands, then the landmark dots from a single
+    pixel array. Dots stay cv2.circle calls, which measured faster than
+    batching them as zero-length polylines or fancy-indexed stamps.
+
+    With enabled=False nothing is drawn, for clients that cannot afford
+    the overlay.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._paths = [
+            (np.array(path, dtype=np.intp), color, thickness)
+            for path, color, thickness in CONNECTION_PATHS
+        ]
+        self._pairs = [
+            (np.array(list(zip(path, path[1:])), dtype=np.intp), color, thickness)
+            for path, color, thickness in CONNECTION_PATHS
+        ]
+        self._colors = [None] * FEATURE_SHAPE[1]
+        for indices, color in LANDMARK_GROUPS:
+            for i in indices:
+                self._colors[i] = color
+
+    def draw(self, image, features, origin, n_hands):
+        """
+        Draw the landmarks of the detected hands onto image in place.
+
+        Args:
+            image: Full frame to draw on
+            features: Normalized feature vector from extract_features
+            origin: (x_min, y_min) returned with the features
+            n_hands: Number of detected hands in the feature vector
+        """
+        n_hands = min(n_hands, FEATURE_SHAPE[0])
+        if not self.enabled or n_hands == 0:
+            return
+        h, w = image.shape[:2]
+        points = features.reshape(FEATURE_SHAPE)[:n_hands] + origin
+        # mp_drawing skips landmarks outside the frame
+        visible = ((points >= 0) & (points <= 1)).all(axis=2)
+        pixels = np.minimum(
+            np.floor(points * (w, h)), (w - 1, h - 1), dtype=np.float32
+        ).astype(np.int32)
+
+        if visible.all():
+            for path, color, thickness in self._paths:
+                # Fancy indexing returns a non-contiguous array, which
+                # polylines rejects
+                paths = np.ascontiguousarray(pixels[:, path])
+                cv2.polylines(image, list(paths), False, color, thickness)
+        else:
+            for pairs, color, thickness in self._pairs:
+                segments = pixels[:, pairs][visible[:, pairs].all(axis=2)]
+                if len(segments):
+                    cv2.polylines(image, segments, False, color, thickness)
+
+        colors = self._colors
+        for hand_pixels, hand_visible in zip(pixels.tolist(), visible.tolist()):
+            for i, (center, shown) in enumerate(zip(hand_pixels, hand_visible)):
+                if shown:
+                    cv2.circle(image, center, _BORDER_RADIUS, _WHITE, -1)
+                    cv2.circle(image, center, _RADIUS, colors[i], -1)
@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .metrics import LatencyHistogram
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def rss_bytes():
+    """Current resident memory of the process, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def max_rss_bytes():
+    """Peak resident memory of the process (Linux reports KiB), or None."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class HandsPool:
+    """
+    Bounded pool of MediaPipe Hands detectors shared by all streams.
+
+    A Hands graph must not process frames of two streams at the same time.
+    In video mode it also tracks the hand from one frame to the next, so
+    the frames of another stream in between would make it track the wrong
+    hand. A stream therefore keeps the detector of its first checkout
+    (pinned to its owner key) until release(owner), e.g. when the stream
+    closes. Checkouts without an owner return the detector afterwards. At
+    most size detectors are created; when all are busy or pinned, checkout
+    waits.
+    """
+
+    def __init__(self, factory, size):
+        """
+        Args:
+            factory: Callable creating a new Hands detector
+            size: Maximum number of detectors
+        """
+        self.factory = factory
+        self.size = size
+        self._condition = threading.Condition()
+        self._free = []
+        self._pinned = {}
+        self._created = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_time = LatencyHistogram()
+        self.detector_bytes = None
+
+    @contextmanager
+    def checkout(self, owner=None, timeout=None):
+        """
+        Borrow a detector for the duration of the with block.
+
+        Args:
+            owner: Hashable stream identifier, the stream keeps its detector
+                until release(owner); None returns it after the block
+            timeout: Seconds to wait for a free detector, None waits forever
+
+        Raises:
+            TimeoutError: If no detector became free within timeout
+        """
+        if owner is not None:
+            yield self.pin(owner, timeout)
+            return
+        detector = self._acquire(timeout)
+        try:
+            yield detector
+        finally:
+            self._put_back(detector)
+
+    def pin(self, owner, timeout=None):
+        """
+        Return the detector pinned to owner, taking one from the pool first.
+
+        Args:
+            owner: Hashable stream identifier
+            timeout: Seconds to wait for a free detector, None waits forever
+
+        Raises:
+            TimeoutError: If no detector became free within timeout
+        """
+        with self._condition:
+            detector = self._pinned.get(owner)
+            if detector is not None:
+                self.checkouts += 1
+                return detector
+        detector = self._acquire(timeout)
+        with self._condition:
+            self._pinned[owner] = detector
+        return detector
+
+    def release(self, owner):
+        """Return the detector pinned to owner to the pool, if it has one."""
+        with self._condition:
+            detector = self._pinned.pop(owner, None)
+        if detector is not None:
+            self._put_back(detector)
+
+    def stats(self):
+        """Return pool size, usage and checkout wait times."""
+        with self._condition:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._created - len(self._free),
+                "pinned": len(self._pinned),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_time": self.wait_time.summary(),
+                "detector_mb": self.detector_bytes / 2**20
+                if self.detector_bytes is not None
+                else None,
+            }
+
+    def _put_back(self, detector):
+        with self._condition:
+            self._free.append(detector)
+            self._condition.notify()
+
+    def _acquire(self, timeout):
+        start_ns = time.monotonic_ns()
+        with self._condition:
+            if not self._free and self._created >= self.size:
+                self.waits += 1
+                if not self._condition.wait_for(lambda: self._free, timeout):
+                    self.timeouts += 1
+                    raise TimeoutError("No free hand detector")
+            if self._free:
+                detector = self._free.pop()
+            else:
+                self._created += 1
+                detector = None
+            self.checkouts += 1
+            self.wait_time.record(time.monotonic_ns() - start_ns)
+
+        if detector is None:
+            try:
+                detector = self._create()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._condition.notify()
+                raise
+        return detector
+
+    def _create(self):
+        before = rss_bytes()
+        detector = self.factory()
+        after = rss_bytes()
+        if before is not None and after is not None and self.detector_bytes is None:
+            self.detector_bytes = max(0, after - before)
+        return detector
+
+
+class ResourceManager:
+    """
+    Heavy resources shared by every page and session of the process.
+
+    The classifier is loaded once and only read (predict_proba does not
+    modify the model), the Hands detectors come from a bounded HandsPool.
+    A ModelRegistry may replace the classifier with swap_classifier();
+    readers that already hold the old one finish with it.
+    """
+
+    def __init__(self, classifier_loader, hands_factory, pool_size=None):
+        """
+        Args:
+            classifier_loader: Callable returning the Classifier, called once
+            hands_factory: Callable creating a new Hands detector
+            pool_size: Maximum number of detectors, defaults to the number
+                of CPUs
+        """
+        self._classifier_loader = classifier_loader
+        self._classifier = None
+        self._lock = threading.Lock()
+        self.model_load_seconds = None
+        self.model_swaps = 0
+        self.hands = HandsPool(hands_factory, pool_size or os.cpu_count() or 1)
+
+    @property
+    def classifier(self):
+        """The shared Classifier, loaded on first use."""
+        # Read on every prediction, the lock is only needed to load
+        classifier = self._classifier
+        if classifier is not None:
+            return classifier
+        with self._lock:
+            if self._classifier is None:
+                start = time.perf_counter()
+                self._classifier = self._classifier_loader()
+                self.model_load_seconds = time.perf_counter() - start
+            return self._classifier
+
+    @property
+    def model_version(self):
+        """Version of the loaded classifier, without loading it."""
+        return getattr(self._classifier, "version", None)
+
+    def swap_classifier(self, classifier):
+        """
+        Replace the shared Classifier, e.g. with a new model version.
+
+        Returns:
+            The previous Classifier, or None if none was loaded
+        """
+        with self._lock:
+            previous, self._classifier = self._classifier, classifier
+            self.model_swaps += 1
+        return previous
+
+    def stats(self):
+        """Return pool stats, model load time and process memory."""
+        rss = rss_bytes()
+        max_rss = max_rss_bytes()
+        return {
+            "hands_pool": self.hands.stats(),
+            "model_loaded": self._classifier is not None,
+            "model_load_seconds": self.model_load_seconds,
+            "model_version": self.model_version,
+            "model_swaps": self.model_swaps,
+            "rss_mb": rss / 2**20 if rss is not None else None,
+            "max_rss_mb": max_rss / 2**20 if max_rss is not None else None,
+        }
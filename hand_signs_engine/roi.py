@@ -0,0 +1,129 @@
+import cv2
+import numpy as np
+
+from .frame_buffer import reuse_buffer
+
+# Smaller regions (in working pixels) are not worth a detection, the whole
+# frame is searched instead
+MIN_ROI_PIXELS = 32
+
+
+def pixel_bounds(roi, width, height):
+    """Integer pixel bounds (x0, y0, x1, y1) of a normalized region."""
+    x0, y0, x1, y1 = roi
+    return (
+        int(round(x0 * width)),
+        int(round(y0 * height)),
+        int(round(x1 * width)),
+        int(round(y1 * height)),
+    )
+
+
+class RoiTracker:
+    """
+    Prepares the image MediaPipe runs on.
+
+    Frames are downscaled to working_width, so the detection cost does not
+    depend on the resolution the browser sends. Once a hand was found, only
+    a padded bounding box around the previous landmarks is passed on. The
+    landmarks MediaPipe returns are then relative to that region and are
+    mapped back to full-frame coordinates by extract_features(roi=...).
+    """
+
+    def __init__(self, working_width=640, padding=0.5, min_size=0.25):
+        """
+        Args:
+            working_width: Width frames are downscaled to before detection
+            padding: Margin around the hands' bounding box, as a fraction
+                of the box size on every side
+            min_size: Minimum width/height of the region (fraction of the
+                frame) so a small hand still has context
+        """
+        self.working_width = working_width
+        self.padding = padding
+        self.min_size = min_size
+        self.roi = None
+        self._working = None
+
+    def downscale(self, image):
+        """
+        Resize the image to working_width, keeping the aspect ratio.
+
+        The result is written to a buffer reused by the next frame.
+        """
+        h, w = image.shape[:2]
+        if w <= self.working_width:
+            return image
+        height = max(1, round(h * self.working_width / w))
+        self._working = reuse_buffer(
+            self._working, (height, self.working_width) + image.shape[2:], image.dtype
+        )
+        return cv2.resize(
+            image,
+            (self.working_width, height),
+            dst=self._working,
+            interpolation=cv2.INTER_AREA,
+        )
+
+    def prepare(self, image, full_frame=False):
+        """
+        Downscale the frame and crop it to the tracked region.
+
+        Args:
+            image: Full-resolution RGB frame
+            full_frame: Ignore the tracked region, e.g. after a miss
+
+        Returns:
+            Tuple (detect_image, roi): the contiguous image for MediaPipe and
+            the normalized (x0, y0, x1, y1) region it covers, or None when it
+            is the whole frame, also when the region is empty or smaller
+            than MIN_ROI_PIXELS
+        """
+        working = self.downscale(image)
+        if self.roi is None or full_frame:
+            return working, None
+
+        h, w = working.shape[:2]
+        x0, y0, x1, y1 = pixel_bounds(self.roi, w, h)
+        if x1 - x0 < MIN_ROI_PIXELS or y1 - y0 < MIN_ROI_PIXELS:
+            return working, None
+        # The exact region after snapping to working pixels
+        roi = (x0 / w, y0 / h, x1 / w, y1 / h)
+        return np.ascontiguousarray(working[y0:y1, x0:x1]), roi
+
+    def update(self, features, origin):
+        """
+        Track the hands found in this frame.
+
+        Args:
+            features: Normalized feature vector from extract_features
+            origin: (x_min, y_min) full-frame origin from extract_features
+        """
+        coords = features.reshape(-1, 2)
+        x_min, y_min = origin
+        # Normalized features are >= 0, so zero padding never raises the max
+        x_max = x_min + float(coords[:, 0].max())
+        y_max = y_min + float(coords[:, 1].max())
+
+        x0, x1 = self._padded(x_min, x_max)
+        y0, y1 = self._padded(y_min, y_max)
+        self.roi = (x0, y0, x1, y1)
+
+    def reset(self):
+        """Forget the region, the next frame is searched completely."""
+        self.roi = None
+
+    def _padded(self, low, high):
+        # Landmarks can lie outside the frame, clamping only after padding
+        # could leave low > high
+        low, high = _clamp(low), _clamp(high)
+        margin = (high - low) * self.padding
+        low, high = low - margin, high + margin
+        if high - low < self.min_size:
+            center = (low + high) / 2
+            low, high = center - self.min_size / 2, center + self.min_size / 2
+        return _clamp(low), _clamp(high)
+
+
+def _clamp(value):
+    return min(max(value, 0.0), 1.0)
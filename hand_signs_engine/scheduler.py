@@ -0,0 +1,241 @@
+import threading
+import time
+from collections import deque
+
+
+class InferenceBudget:
+    """
+    Process-wide CPU budget for the classifier, shared by all sessions.
+
+    A token bucket in CPU seconds: it refills at cpu_fraction seconds per
+    wall-clock second (0.5 = half a core) and the inference worker charges
+    the measured inference time. Schedulers only start a prediction while
+    the bucket is not empty.
+    """
+
+    def __init__(self, cpu_fraction=0.5, burst_seconds=1.0):
+        self.cpu_fraction = cpu_fraction
+        self.capacity = cpu_fraction * burst_seconds
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self.granted = 0
+        self.denied = 0
+        self.charged_seconds = 0.0
+
+    def try_acquire(self):
+        """Return True if there is budget left for one more prediction."""
+        with self._lock:
+            self._refill()
+            if self._tokens > 0:
+                self.granted += 1
+                return True
+            self.denied += 1
+            return False
+
+    def charge(self, seconds):
+        """Subtract the CPU time a prediction actually used."""
+        with self._lock:
+            self._refill()
+            self._tokens -= seconds
+            self.charged_seconds += seconds
+
+    def stats(self):
+        """Return granted/denied predictions and the CPU time used."""
+        with self._lock:
+            return {
+                "cpu_fraction": self.cpu_fraction,
+                "granted": self.granted,
+                "denied": self.denied,
+                "charged_seconds": self.charged_seconds,
+            }
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.cpu_fraction
+        )
+        self._updated = now
+
+
+class AdaptiveScheduler:
+    """
+    Decides per session on which frames the classifier runs.
+
+    Replaces the fixed should_predict(skip_frames=10) counter: the interval
+    drops to min_interval frames when the predicted class changes, when
+    the landmarks jump like on a change of sign, or when they move more
+    than motion_threshold before the predictions settled. It doubles while
+    the hand is still or the last stable_predictions predictions agreed,
+    up to max_interval for a still hand and moving_max_interval for a
+    moving one.
+    """
+
+    def __init__(
+        self,
+        budget=None,
+        min_interval=2,
+        max_interval=30,
+        motion_threshold=0.02,
+        stable_predictions=3,
+        rate_window=30,
+        moving_max_interval=10,
+        change_threshold=0.2,
+    ):
+        """
+        Args:
+            budget: InferenceBudget shared with other sessions, or None
+            min_interval: Frames between predictions while the hand moves
+            max_interval: Frames between predictions for a still hand
+            motion_threshold: Max-abs change of a normalized landmark
+                coordinate between frames that counts as movement
+            stable_predictions: Agreeing predictions before backing off
+            rate_window: Number of inferences the effective rate uses
+            moving_max_interval: Frames between agreeing predictions while
+                the hand moves, bounds the delay until a new sign is seen
+            change_threshold: Max-abs change between frames that resets the
+                interval even while the predictions agree, like a change of
+                sign; it rises to twice the hand's average motion, so camera
+                jitter does not count as a change
+        """
+        self.budget = budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.motion_threshold = motion_threshold
+        self.stable_predictions = stable_predictions
+        self.moving_max_interval = moving_max_interval
+        self.change_threshold = change_threshold
+        self._lock = threading.Lock()
+        self.interval = min_interval
+        self.frames_since_prediction = 0
+        self.frames = 0
+        self.inferences = 0
+        self.reuses = 0
+        self.last_class_id = None
+        self.last_prediction = None
+        self.agreeing = 0
+        self.jitter = 0.0
+        self._moving = False
+        self._inference_times = deque(maxlen=rate_window)
+
+    def should_predict(self, motion):
+        """
+        Called for every frame with a hand.
+
+        A due frame is handled with record_reuse() if the last prediction
+        still applies, or with start_inference() to run the classifier.
+
+        Args:
+            motion: Max-abs change of the feature vector since the last frame
+
+        Returns:
+            True if a prediction is due on this frame
+        """
+        with self._lock:
+            self.frames += 1
+            self.frames_since_prediction += 1
+            moving = motion > self.motion_threshold
+            changed = motion > max(self.change_threshold, 2 * self.jitter)
+            self.jitter += 0.1 * (motion - self.jitter)
+            if changed:
+                # Looks like another sign, the agreeing predictions are stale
+                self.agreeing = 0
+            stable = self.agreeing >= self.stable_predictions
+            if changed or (moving and not stable):
+                self.interval = self.min_interval
+            elif moving:
+                self.interval = min(self.interval, self.moving_max_interval)
+            self._moving = moving
+            return self.frames_since_prediction >= self.interval
+
+    def record_reuse(self):
+        """Handle a due frame with last_prediction, uses no budget."""
+        with self._lock:
+            self.reuses += 1
+            self._back_off()
+
+    def start_inference(self):
+        """
+        Handle a due frame with a classifier run.
+
+        Returns:
+            False if the process is over its budget, the next frame is
+            due again
+        """
+        with self._lock:
+            if self.budget is not None and not self.budget.try_acquire():
+                return False
+            self.inferences += 1
+            self._inference_times.append(time.monotonic())
+            self._back_off()
+            return True
+
+    def _back_off(self):
+        # Called with the lock held when a due frame was handled
+        self.frames_since_prediction = 0
+        if self.agreeing >= self.stable_predictions or not self._moving:
+            limit = self.moving_max_interval if self._moving else self.max_interval
+            self.interval = min(self.interval * 2, limit)
+
+    def record_prediction(self, prediction, cost_seconds=0.0):
+        """
+        Called by the inference worker with the result of a prediction.
+
+        Args:
+            prediction: Classifier Prediction, kept as last_prediction
+            cost_seconds: Inference time to charge to the budget
+        """
+        class_id = prediction.class_id
+        with self._lock:
+            self.last_prediction = prediction
+            if class_id == self.last_class_id:
+                self.agreeing += 1
+            else:
+                self.last_class_id = class_id
+                self.agreeing = 1
+                # The sign changed, react quickly
+                self.interval = self.min_interval
+        if self.budget is not None and cost_seconds:
+            self.budget.charge(cost_seconds)
+
+    def reset(self):
+        """Forget the hand, e.g. when it left the frame."""
+        with self._lock:
+            self.interval = self.min_interval
+            self.last_class_id = None
+            self.last_prediction = None
+            self.agreeing = 0
+            self.jitter = 0.0
+
+    def effective_rate(self):
+        """Inferences per second over the last rate_window inferences."""
+        with self._lock:
+            times = list(self._inference_times)
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def stats(self):
+        """Return frame, inference and reuse counters and the effective rate."""
+        with self._lock:
+            stats = {
+                "frames": self.frames,
+                "inferences": self.inferences,
+                "reuses": self.reuses,
+                "interval": self.interval,
+            }
+        stats["effective_rate"] = self.effective_rate()
+        return stats
+
+
+_budget = None
+_budget_lock = threading.Lock()
+
+
+def get_inference_budget():
+    """Return the inference budget shared by all sessions of this process."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = InferenceBudget()
+        return _budget
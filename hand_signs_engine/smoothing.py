@@ -0,0 +1,218 @@
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from .notifier import ChangeNotifier
+
+
+class StablePrediction(NamedTuple):
+    """Class the smoother settled on."""
+
+    class_id: int
+    # Smoothed probability of the class
+    confidence: float
+    # Share of the recent predictions that voted for the class
+    support: float
+
+
+class PredictionSmoother:
+    """
+    Turns noisy per-frame predictions into a stable class.
+
+    Keeps the last window predictions (class id and probability vector) in
+    a ring buffer and an exponential moving average of the probabilities.
+    A class becomes stable once it has been predicted min_predictions
+    times and its average leads the runner-up by enter_margin. It stays
+    stable until another class leads it by more than exit_margin. The gap
+    between the two margins (hysteresis) keeps the result from flickering
+    between two similar signs. Margins instead of absolute thresholds work
+    for a forest over many classes, whose best probability is often below
+    0.3. Voting on the probabilities instead of display strings also means
+    "Hammer (0.81)" and "Hammer (0.79)" are the same vote.
+
+    Not thread-safe, the prediction state holds it under its lock.
+    """
+
+    def __init__(
+        self,
+        window=10,
+        alpha=0.3,
+        enter_margin=0.05,
+        exit_margin=0.02,
+        min_predictions=3,
+    ):
+        """
+        Args:
+            window: Number of recent predictions kept
+            alpha: Weight of the newest probabilities in the average
+            enter_margin: Lead in average probability over the runner-up
+                to become the stable class
+            exit_margin: Lead of another class at which the stable class
+                is dropped
+            min_predictions: Predictions of the class needed in the window
+        """
+        if exit_margin > enter_margin:
+            raise ValueError("exit_margin must not exceed enter_margin")
+        self.window = window
+        self.alpha = alpha
+        self.enter_margin = enter_margin
+        self.exit_margin = exit_margin
+        self.min_predictions = min_predictions
+        self.class_ids = np.zeros(window, dtype=np.int32)
+        self.probas = None
+        self.count = 0
+        self._next = 0
+        self._columns = None
+        self._average = None
+        self._stable = None
+
+    def update(self, class_ids, proba):
+        """
+        Add one prediction.
+
+        Args:
+            class_ids: Class id of every column of proba (Classifier.class_ids)
+            proba: Probability vector of the prediction
+
+        Returns:
+            True if the stable prediction changed
+        """
+        # A new model may have other columns, start over with it
+        if self._columns is not class_ids:
+            if self._columns is None or not np.array_equal(self._columns, class_ids):
+                self._start(class_ids, len(proba))
+            self._columns = class_ids
+        best = int(np.argmax(proba))
+        self.class_ids[self._next] = class_ids[best]
+        self.probas[self._next] = proba
+        self._next = (self._next + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+
+        self._average += self.alpha * (proba - self._average)
+        return self._update_stable()
+
+    def stable(self):
+        """Return the StablePrediction, or None while no class is stable."""
+        if self._stable is None:
+            return None
+        class_id = int(self._columns[self._stable])
+        votes = self.class_ids[: self.count] == class_id
+        return StablePrediction(
+            class_id, float(self._average[self._stable]), float(votes.mean())
+        )
+
+    def reset(self):
+        """
+        Forget all predictions, e.g. when the hand left the frame.
+
+        Returns:
+            True if there was a stable prediction
+        """
+        changed = self._stable is not None
+        self.count = 0
+        self._next = 0
+        if self._average is not None:
+            self._average[:] = 0.0
+        self._stable = None
+        return changed
+
+    def _start(self, class_ids, n_classes):
+        self.reset()
+        self._columns = class_ids
+        self.probas = np.zeros((self.window, n_classes), dtype=np.float32)
+        self._average = np.zeros(n_classes, dtype=np.float64)
+
+    def _update_stable(self):
+        average = self._average
+        best = int(np.argmax(average))
+        runner_up = np.max(np.delete(average, best), initial=0.0)
+        stable = self._stable
+        if stable is not None and average[best] - average[stable] <= self.exit_margin:
+            # Only a clearly stronger class replaces the current one
+            pass
+        elif (
+            average[best] - runner_up >= self.enter_margin
+            and self._votes(best) >= self.min_predictions
+        ):
+            stable = best
+        else:
+            stable = None
+        changed = stable != self._stable
+        self._stable = stable
+        return changed
+
+    def _votes(self, column):
+        return int(
+            np.count_nonzero(self.class_ids[: self.count] == self._columns[column])
+        )
+
+
+class SmoothedPredictionMixin:
+    """
+    Temporal smoothing and change notification for a prediction state.
+
+    The prediction states of the recognition pages share these methods.
+    The class calls init_smoothing() in its __init__ after creating
+    self.lock, which the smoother and the notifier are guarded by.
+    """
+
+    lock: threading.Lock
+
+    def init_smoothing(self):
+        """Create the smoother and the change notifier of the state."""
+        self.smoother = PredictionSmoother()
+        self.changes = ChangeNotifier(self.lock)
+
+    def add_prediction(self, class_ids, proba):
+        """
+        Feed one classifier result to the temporal smoothing (thread-safe).
+
+        Args:
+            class_ids: Class id of every probability column
+            proba: Probability vector of the prediction
+
+        Returns:
+            True if the stable prediction changed
+        """
+        with self.lock:
+            changed = self.smoother.update(class_ids, proba)
+            if changed:
+                self.changes.notify()
+            return changed
+
+    def reset_smoothing(self):
+        """Forget the smoothed predictions, e.g. without a hand (thread-safe)."""
+        with self.lock:
+            # Also wakes the UI when a hand left before a class was stable
+            had_predictions = self.smoother.count > 0
+            changed = self.smoother.reset()
+            if had_predictions:
+                self.changes.notify()
+            return changed
+
+    def get_stable_prediction(self):
+        """
+        Get the smoothed prediction (thread-safe).
+
+        Returns:
+            StablePrediction with class id, confidence and support, or None
+            while no class is stable
+        """
+        with self.lock:
+            return self.smoother.stable()
+
+    def wait_for_change(self, version=None, timeout=None):
+        """
+        Block until the stable prediction changed or the smoothing was
+        reset (thread-safe).
+
+        Args:
+            version: Version returned by the previous call, None returns
+                the current version at once
+            timeout: Seconds to wait at most, None waits forever
+
+        Returns:
+            The current version, equal to version if nothing changed
+        """
+        return self.changes.wait(version, timeout)
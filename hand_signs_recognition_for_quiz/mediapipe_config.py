@@ -1,73 +1,3 @@
-import pickle
+from hand_signs_engine.mediapipe_config import MediaPipeConfig, labels_dict
 
-import mediapipe as mp
-
-labels_dict = {
-    0: "Zange",
-    1: "Lehrer",
-    2: "Lehrnen",
-    3: "Schule",
-    4: "Anschmieren",
-    5: "Blech",
-    6: "Hammer",
-    7: "Hebelblechschere",
-    8: "Meißel",
-    9: "Metall",
-    10: "Montieren",
-    11: "Schrauben",
-    12: "Schweissautomat",
-    13: "Sicherheit",
-    14: "Schraubenschlüssel",
-    15: "Körner",
-    16: "Maschinenschraubstock",
-    17: "Drehmaschine",
-    18: "Gewindemeissel",
-    19: "Anreissplatte",
-    20: "Anreissnadel",
-    21: "Bandsaege",
-    22: "Bohrmaschine",
-    23: "Drehmomentschlüssel",
-    24: "Feile",
-    25: "Maulschlüssel",
-    26: "Messschieber",
-    27: "Saege",
-    28: "Spiralbohrer",
-}
-
-
-class MediaPipeConfig:
-    """Configuration and initialization for MediaPipe hands detection."""
-
-    def __init__(self):
-        """Initialize MediaPipe components and configuration."""
-        # MediaPipe setup
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-
-        # Drawing styles (optional, available in newer mediapipe versions)
-        try:
-            self.mp_styles = mp.solutions.drawing_styles
-        except Exception:
-            self.mp_styles = None
-
-        # Initialize hands detector
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,  # False for video streaming
-            max_num_hands=2,  # Limit to 2 hands
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-
-        # Model configuration
-        self.EXPECTED_LENGTH = 84
-        self.labels_dict = labels_dict
-
-        # Load ML model
-        self.model = self._load_model()
-
-    def _load_model(self):
-        """Load the trained model from pickle file."""
-        model_dict = pickle.load(
-            open("hand_signs_recognition/hand_signs_model.p", "rb")
-        )
-        return model_dict["model"]
+__all__ = ["MediaPipeConfig", "labels_dict"]
@@ -1,5 +1,7 @@
 import threading
 
+from hand_signs_engine.notifier import ChangeNotifier
+
 
 class PredictionState:
     """Thread-safe storage for prediction results."""
@@ -12,6 +14,7 @@ class PredictionState:
         self.previous_landmarks = 84 * [0.0]  # hardcoded config.EXPECTED_LENGTH
         self.last_prediction_time = 0
         self.frame_count = 0
+        self.changes = ChangeNotifier(self.lock)
 
     def set_prediction(self, value):
         """Set the current prediction value (thread-safe)."""
@@ -26,6 +29,7 @@ class PredictionState:
     def set_prediction_strength(self, value):
         """Set the current prediction strength (thread-safe)."""
         with self.lock:
+            previous_strength = self.prediction_strength
             if value < 0:
                 self.prediction_strength = 0
                 self.predictions_weights = []
@@ -47,6 +51,8 @@ class PredictionState:
                 else:
                     self.prediction_strength = new_strength
             "skip" if value < 0 else self.predictions_weights.append(value)
+            if self.prediction_strength != previous_strength:
+                self.changes.notify()
 
     def get_prediction_strength(self):
         """Get the current prediction strength (thread-safe)."""
@@ -76,6 +82,19 @@ class PredictionState:
         with self.lock:
             self.frame_count += 1
             if self.frame_count % skip_frames == 0:
-                print("Predicting on this frame.", self.frame_count)
                 return True
             return False
+
+    def wait_for_change(self, version=None, timeout=None):
+        """
+        Block until the prediction strength changed (thread-safe).
+
+        Args:
+            version: Version returned by the previous call, None returns
+                the current version at once
+            timeout: Seconds to wait at most, None waits forever
+
+        Returns:
+            The current version, equal to version if nothing changed
+        """
+        return self.changes.wait(version, timeout)
@@ -1,6 +1,8 @@
 import threading
 import time
 
+from hand_signs_engine.notifier import ChangeNotifier
+
 class PredictionStateQuiz:
     """
     Spezifische Thread-safe Klasse für die DGS-Quiz-Challenge.
@@ -16,6 +18,7 @@ class PredictionStateQuiz:
         self.previous_landmarks = 84 * [0.0]
         self.last_prediction_time = 0
         self.frame_count = 0
+        self.changes = ChangeNotifier(self.lock)
         
         # NEUE ATTRIBUTE für kontrollierteren Decay/Increase
         self.required_strength = 1.0 
@@ -37,6 +40,7 @@ class PredictionStateQuiz:
     # die Logik zum Setzen des Werts/Resets.
     def set_prediction_strength(self, value):
         with self.lock:
+            previous_strength = self.prediction_strength
             # Wenn value < 0: Reset-Logik (wird in render_dgs_challenge_ui verwendet)
             if value < 0:
                 self.prediction_strength = 0
@@ -67,6 +71,7 @@ class PredictionStateQuiz:
                 else:
                     self.prediction_strength = new_strength
             "skip" if value < 0 else self.predictions_weights.append(value)
+            self._notify_if_changed(previous_strength)
             # -------------------------------------------------------------------
 
     def get_prediction_strength(self):
@@ -86,7 +91,6 @@ class PredictionStateQuiz:
         with self.lock:
             self.frame_count += 1
             if self.frame_count % skip_frames == 0:
-                # print("Predicting on this frame.", self.frame_count) # Logging entfernen
                 return True
             return False
 
@@ -95,6 +99,7 @@ class PredictionStateQuiz:
     def increase_prediction_strength(self, confidence: float):
         """Erhöht die Stärke bei korrekter Vorhersage."""
         with self.lock:
+            previous_strength = self.prediction_strength
             # Hier nutzen wir unsere einfache Logik: Erhöhen basierend auf Konfidenz
             # und dem definierten Faktor.
             new_strength = self.prediction_strength + (confidence * self.increase_factor)
@@ -105,11 +110,34 @@ class PredictionStateQuiz:
                 self.prediction_strength = new_strength
             
             self.frame_count = 0 # Schnelle Reaktion
+            self._notify_if_changed(previous_strength)
 
     def decrease_prediction_strength(self):
         """Senkt die Stärke (Decay), wenn die Geste unbekannt oder falsch ist."""
         with self.lock:
+            previous_strength = self.prediction_strength
             # Hier nutzen wir unsere einfache Logik: Senken um die Decay Rate
             new_strength = self.prediction_strength - self.decay_rate
             self.prediction_strength = max(0.0, new_strength)
             self.frame_count = 0 # Schnelle Reaktion
+            self._notify_if_changed(previous_strength)
+
+    # --- Benachrichtigung der UI statt time.sleep()-Polling ---
+
+    def wait_for_change(self, version=None, timeout=None):
+        """
+        Blockiert, bis sich die Stärke geändert hat (thread-safe).
+
+        Args:
+            version: Version aus dem letzten Aufruf, None kehrt sofort zurück
+            timeout: Maximale Wartezeit in Sekunden, None wartet unbegrenzt
+
+        Returns:
+            Die aktuelle Version, gleich version wenn sich nichts geändert hat
+        """
+        return self.changes.wait(version, timeout)
+
+    def _notify_if_changed(self, previous_strength):
+        # Wird mit gehaltenem Lock aufgerufen
+        if self.prediction_strength != previous_strength:
+            self.changes.notify()
@@ -1,7 +1,9 @@
 import threading
 
+from hand_signs_engine.smoothing import SmoothedPredictionMixin
 
-class PredictionState:
+
+class PredictionState(SmoothedPredictionMixin):
     """Thread-safe storage for prediction results."""
 
     def __init__(self):
@@ -9,6 +11,7 @@ class PredictionState:
         self.prediction = "No hand detected"
         self.last_prediction_time = 0
         self.frame_count = 0
+        self.init_smoothing()
 
     def set_prediction(self, value):
         """Set the current prediction value (thread-safe)."""
@@ -33,6 +36,5 @@ class PredictionState:
         with self.lock:
             self.frame_count += 1
             if self.frame_count % skip_frames == 0:
-                print("Predicting on this frame.", self.frame_count)
                 return True
             return False
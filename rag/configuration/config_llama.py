@@ -1,12 +1,27 @@
+import os
+
 from llama_index.core import Settings
 from llama_index.core.node_parser import SentenceSplitter
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 
 from rag.configuration.config_llm import get_llm
+from rag.embedding_cache import CachedEmbedding
 
 EMBED_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
 CHUNK_SIZE: int = 1024
 CHUNK_OVERLAP: int = 200
+# Processes parsing documents for the index, 0 for one per core but at
+# most MAX_INGESTION_WORKERS, every worker imports llama_index and the parsers
+INGESTION_WORKERS: int = int(os.getenv("INGESTION_WORKERS", "0"))
+MAX_INGESTION_WORKERS: int = 4
+# Embeddings of chunks and queries are kept on disk, misses are embedded
+# in batches of EMBED_BATCH_SIZE
+EMBED_CACHE_FOLDER: str = "rag/configuration/embedding_cache"
+EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "128"))
+# Retrieval uses an IVF index instead of exact search from ANN_MIN_NODES
+# chunks on, searching ANN_N_PROBE lists per query (0: about 6% of them)
+ANN_MIN_NODES: int = int(os.getenv("ANN_MIN_NODES", "50000"))
+ANN_N_PROBE: int = int(os.getenv("ANN_N_PROBE", "0"))
 
 
 def configure_llamaindex():
@@ -15,10 +30,14 @@ def configure_llamaindex():
     # LLM Configuration
     Settings.llm = get_llm()
 
-    # Embedding Model
-    Settings.embed_model = HuggingFaceEmbedding(
-        model_name=EMBED_MODEL_NAME,
-        cache_folder="rag/configuration/embedding_model_cache",
+    # Embedding Model, answering repeated texts from the embedding cache
+    Settings.embed_model = CachedEmbedding(
+        HuggingFaceEmbedding(
+            model_name=EMBED_MODEL_NAME,
+            cache_folder="rag/configuration/embedding_model_cache",
+            embed_batch_size=EMBED_BATCH_SIZE,
+        ),
+        cache_folder=EMBED_CACHE_FOLDER,
     )
 
     # Text Splitting
@@ -0,0 +1,266 @@
+"""
+Persistent embedding cache for document chunks and queries.
+
+Every index rebuild used to embed every chunk again, and every question
+was embedded again even when it came from the same QUESTIONS_DB button.
+EmbeddingStore keeps the vectors of one model in an append-only float32
+matrix on disk that is memory-mapped for reading, plus a file of 16-byte
+text hashes whose position is the row of the vector. CachedEmbedding
+wraps the real embedding model and only passes cache misses to it, in
+large batches.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from llama_index.core import Settings
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from pydantic import PrivateAttr
+
+try:
+    import fcntl
+except ImportError:  # Windows, appends are then only safe within one process
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+KEY_BYTES: int = 16
+VECTORS_FILE: str = "vectors.f32"
+KEYS_FILE: str = "keys.bin"
+META_FILE: str = "meta.json"
+
+
+def text_key(kind: str, text: str) -> bytes:
+    """Hash of a text, kind ("text" or "query") keeps instructions apart."""
+    return hashlib.blake2b(f"{kind}\0{text}".encode(), digest_size=KEY_BYTES).digest()
+
+
+def model_directory(cache_folder: str | Path, model_name: str) -> Path:
+    """Cache directory of one embedding model."""
+    return Path(cache_folder) / re.sub(r"[^A-Za-z0-9._-]+", "--", model_name)
+
+
+class EmbeddingStore:
+    """
+    Append-only on-disk embedding matrix of one model.
+
+    Row i of vectors.f32 is the vector of key i in keys.bin. Appends take
+    an exclusive file lock and first cut both files to the rows they have
+    in common, so a crash between the two writes cannot shift keys
+    against vectors. Rows appended by other processes are picked up
+    before every miss.
+    """
+
+    def __init__(self, directory: str | Path, model_name: str = ""):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.dim: int | None = None
+        self._rows: dict[bytes, int] = {}
+        self._vectors: np.ndarray | None = None
+        self._lock = threading.Lock()
+        meta_path = self.directory / META_FILE
+        if meta_path.exists():
+            with open(meta_path, encoding="utf-8") as meta_file:
+                self.dim = json.load(meta_file)["dim"]
+        with self._lock:
+            self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def lookup(self, keys: list[bytes]) -> list[np.ndarray | None]:
+        """Cached vector of every key, None for misses."""
+        with self._lock:
+            rows = [self._rows.get(key) for key in keys]
+            if None in rows:
+                self._refresh()
+                rows = [self._rows.get(key) for key in keys]
+            if self._vectors is None:
+                return [None] * len(keys)
+            return [None if row is None else self._vectors[row] for row in rows]
+
+    def add(self, keys: list[bytes], vectors: np.ndarray) -> None:
+        """Append vectors of new keys, keys already stored are skipped."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock, open(self.directory / KEYS_FILE, "ab") as keys_file:
+            if fcntl is not None:
+                fcntl.flock(keys_file, fcntl.LOCK_EX)
+            if self.dim is None:
+                self._write_meta(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Cache of {self.model_name} holds {self.dim}-dimensional "
+                    f"vectors, got {vectors.shape[1]}"
+                )
+            (self.directory / VECTORS_FILE).touch()
+            n_rows = self._refresh()
+            new = {}
+            for key, vector in zip(keys, vectors):
+                if key not in self._rows:
+                    new[key] = vector
+            if not new:
+                return
+            os.truncate(self.directory / VECTORS_FILE, n_rows * vectors.shape[1] * 4)
+            os.truncate(self.directory / KEYS_FILE, n_rows * KEY_BYTES)
+            with open(self.directory / VECTORS_FILE, "ab") as vectors_file:
+                vectors_file.write(np.stack(list(new.values())).tobytes())
+            keys_file.write(b"".join(new))
+            keys_file.flush()
+            self._refresh()
+
+    def _write_meta(self, dim: int) -> None:
+        self.dim = dim
+        with open(self.directory / META_FILE, "w", encoding="utf-8") as meta_file:
+            json.dump({"model_name": self.model_name, "dim": dim}, meta_file)
+
+    def _refresh(self) -> int:
+        """Map rows appended since the last call, needs self._lock held."""
+        if self.dim is None:
+            return 0
+        keys_path = self.directory / KEYS_FILE
+        vectors_path = self.directory / VECTORS_FILE
+        if not keys_path.exists() or not vectors_path.exists():
+            return 0
+        n_rows = min(
+            keys_path.stat().st_size // KEY_BYTES,
+            vectors_path.stat().st_size // (self.dim * 4),
+        )
+        if n_rows > len(self._rows):
+            with open(keys_path, "rb") as keys_file:
+                keys_file.seek(len(self._rows) * KEY_BYTES)
+                data = keys_file.read((n_rows - len(self._rows)) * KEY_BYTES)
+            start = len(self._rows)
+            for offset in range(0, len(data), KEY_BYTES):
+                self._rows.setdefault(
+                    data[offset : offset + KEY_BYTES], start + offset // KEY_BYTES
+                )
+            self._vectors = np.memmap(
+                vectors_path, dtype=np.float32, mode="r", shape=(n_rows, self.dim)
+            )
+        return n_rows
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Embedding model that answers repeated texts and queries from disk.
+
+    Cache misses of a batch are embedded together by the wrapped model, so
+    its embed_batch_size should be as large as this one's. stats()
+    reports the hit rate and the embedding time the hits saved.
+    """
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _store: EmbeddingStore = PrivateAttr()
+    _stats_lock: threading.Lock = PrivateAttr()
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+    _embed_seconds: float = PrivateAttr(default=0.0)
+
+    def __init__(
+        self,
+        embed_model: BaseEmbedding,
+        cache_folder: str | Path,
+        embed_batch_size: int | None = None,
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            embed_model: Model that embeds the cache misses
+            cache_folder: Directory with one cache directory per model
+            embed_batch_size: Texts looked up per batch, defaults to the
+                batch size of embed_model
+        """
+        super().__init__(
+            model_name=embed_model.model_name,
+            embed_batch_size=embed_batch_size or embed_model.embed_batch_size,
+            **kwargs,
+        )
+        self._embed_model = embed_model
+        self._store = EmbeddingStore(
+            model_directory(cache_folder, embed_model.model_name),
+            embed_model.model_name,
+        )
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._embed([query], "query")[0]
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._embed([text], "text")[0]
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return self._embed(texts, "text")
+
+    def stats(self) -> dict[str, Any]:
+        """Hits, misses, hit rate and the seconds the hits saved."""
+        with self._stats_lock:
+            lookups = self._hits + self._misses
+            seconds_per_miss = (
+                self._embed_seconds / self._misses if self._misses else 0.0
+            )
+            return {
+                "model": self.model_name,
+                "cached": len(self._store),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "embed_seconds": self._embed_seconds,
+                "saved_seconds": self._hits * seconds_per_miss,
+            }
+
+    def _embed(self, texts: list[str], kind: str) -> list[Embedding]:
+        keys = [text_key(kind, text) for text in texts]
+        found = self._store.lookup(keys)
+        missing = [i for i, vector in enumerate(found) if vector is None]
+        seconds = 0.0
+        if missing:
+            start = time.perf_counter()
+            missing_texts = [texts[i] for i in missing]
+            if kind == "query":
+                vectors = [
+                    self._embed_model.get_query_embedding(text)
+                    for text in missing_texts
+                ]
+            else:
+                vectors = self._embed_model.get_text_embedding_batch(missing_texts)
+            seconds = time.perf_counter() - start
+            computed = np.asarray(vectors, dtype=np.float32)
+            self._store.add([keys[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                found[i] = vector
+        with self._stats_lock:
+            self._hits += len(texts) - len(missing)
+            self._misses += len(missing)
+            self._embed_seconds += seconds
+        return [vector.tolist() for vector in found]  # type: ignore[union-attr]
+
+
+def embedding_cache_stats() -> dict[str, Any] | None:
+    """
+    Return stats() of the configured embedding model.
+
+    Returns:
+        CachedEmbedding.stats(), or None while Settings has no cached
+        embedding model
+    """
+    # Settings.embed_model would load a default model when none is set
+    embed_model = Settings._embed_model
+    if isinstance(embed_model, CachedEmbedding):
+        return embed_model.stats()
+    return None
@@ -0,0 +1,482 @@
+"""
+Incremental index builds for rag/documents.
+
+Keeps a manifest of the content hash of every document next to the
+persisted index. On every start only added or changed files are parsed,
+chunked and embedded, and the nodes of changed or removed files are
+deleted, so the index never silently goes stale. A different embedding
+model or chunking, or an index without a manifest, rebuilds everything.
+Files are parsed and split in a process pool, the parse time of every
+file is kept in the manifest. Embeddings and node texts are kept in a
+memory-mapped NumpyVectorStore instead of the JSON stores. From
+ANN_MIN_NODES chunks on, an IVF index is built for retrieval and rebuilt
+when the corpus outgrew its lists.
+
+Usage:
+    python -m rag.ingestion [--rebuild] [--workers N] [--ann-min-nodes N]
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from llama_index.core import (
+    Document,
+    Settings,
+    SimpleDirectoryReader,
+    VectorStoreIndex,
+)
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import BaseNode, MetadataMode
+
+from rag.configuration.config_llama import (
+    ANN_MIN_NODES,
+    ANN_N_PROBE,
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    EMBED_MODEL_NAME,
+    INGESTION_WORKERS,
+    MAX_INGESTION_WORKERS,
+    configure_llamaindex,
+)
+from rag.embedding_cache import embedding_cache_stats
+from rag.ivf_index import default_n_lists
+from rag.numpy_vector_store import FORMAT_VERSION, NumpyVectorStore, store_directory
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS_PATH: Path = Path(__file__).parent / "documents"
+VECTOR_STORE_PATH: Path = Path(__file__).parent / "vector_store"
+MANIFEST_FILE: str = "manifest.json"
+MANIFEST_VERSION: int = 1
+
+# The IVF index is rebuilt when sqrt(nodes) outgrew its number of lists
+# by this factor, so the lists stay small enough to scan
+ANN_REBUILD_GROWTH: float = 2.0
+
+_HASH_BLOCK_SIZE: int = 1 << 20
+# StorageContext files of indexes built before NumpyVectorStore
+_JSON_STORE_FILES: tuple[str, ...] = (
+    "default__vector_store.json",
+    "image__vector_store.json",
+    "docstore.json",
+    "index_store.json",
+    "graph_store.json",
+)
+
+
+class IndexChanges(NamedTuple):
+    """Relative paths of the documents that differ from the manifest."""
+
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class ParsedFile(NamedTuple):
+    """Nodes of one parsed and split document file."""
+
+    path: str
+    doc_ids: list[str]
+    nodes: list[BaseNode]
+    seconds: float
+
+
+def index_settings() -> dict[str, Any]:
+    """Settings that make a persisted index unusable when they change."""
+    return {
+        "embed_model": EMBED_MODEL_NAME,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "vector_store": f"{NumpyVectorStore.class_name()}/{FORMAT_VERSION}",
+    }
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of the file content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as document_file:
+        while block := document_file.read(_HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_documents(
+    documents_dir: Path, previous: dict[str, dict] | None = None
+) -> dict[str, dict]:
+    """
+    Hash every document below documents_dir.
+
+    Files whose size and modification time match their previous entry keep
+    its hash without being read again.
+
+    Args:
+        documents_dir: Directory of the source documents
+        previous: Files of the last manifest, keyed by relative path
+
+    Returns:
+        {relative path: {"sha256", "size", "mtime_ns"}}
+    """
+    previous = previous or {}
+    files: dict[str, dict] = {}
+    for path in sorted(documents_dir.rglob("*")):
+        relative = path.relative_to(documents_dir).as_posix()
+        # Same filter as SimpleDirectoryReader(exclude_hidden=True)
+        if not path.is_file() or any(
+            part.startswith(".") for part in Path(relative).parts
+        ):
+            continue
+        stat = path.stat()
+        entry = previous.get(relative)
+        if entry and (entry["size"], entry["mtime_ns"]) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            sha256 = entry["sha256"]
+        else:
+            sha256 = file_hash(path)
+        files[relative] = {
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+    return files
+
+
+def diff_documents(previous: dict[str, dict], current: dict[str, dict]) -> IndexChanges:
+    """Compare two scans of the documents by content hash."""
+    return IndexChanges(
+        added=sorted(current.keys() - previous.keys()),
+        changed=sorted(
+            path
+            for path in current.keys() & previous.keys()
+            if current[path]["sha256"] != previous[path]["sha256"]
+        ),
+        removed=sorted(previous.keys() - current.keys()),
+    )
+
+
+def load_manifest(persist_dir: Path) -> dict[str, Any] | None:
+    """Return the manifest of the persisted index, or None without one."""
+    try:
+        with open(persist_dir / MANIFEST_FILE, encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(persist_dir: Path, manifest: dict[str, Any]) -> None:
+    """Write the manifest atomically, after the index was persisted."""
+    temporary = persist_dir / f"{MANIFEST_FILE}.tmp"
+    with open(temporary, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, ensure_ascii=False)
+    os.replace(temporary, persist_dir / MANIFEST_FILE)
+
+
+def load_vector_store(
+    persist_dir: Path, manifest: dict[str, Any]
+) -> NumpyVectorStore | None:
+    """
+    Map the persisted store, or None if it does not match the manifest.
+
+    A store that is missing, only partly written or corrupt, or that holds
+    other documents or another number of nodes than the manifest lists,
+    cannot be updated incrementally.
+    """
+    try:
+        vector_store = NumpyVectorStore.from_persist_dir(
+            persist_dir, n_probe=ANN_N_PROBE or None
+        )
+    except (OSError, ValueError, KeyError) as error:
+        logger.warning("Cannot load the vector store in %s: %s", persist_dir, error)
+        return None
+    doc_ids = {
+        doc_id
+        for entry in manifest["files"].values()
+        for doc_id in entry.get("doc_ids", [])
+    }
+    nodes = manifest.get("nodes")
+    if not vector_store.ref_doc_ids() <= doc_ids or (
+        nodes is not None and nodes != vector_store.num_nodes
+    ):
+        logger.warning("Vector store in %s does not match its manifest", persist_dir)
+        return None
+    return vector_store
+
+
+def load_document(documents_dir: Path, relative_path: str) -> list[Document]:
+    """Parse one file, with document ids derived from its file name."""
+    return SimpleDirectoryReader(
+        input_files=[str(documents_dir / relative_path)], filename_as_id=True
+    ).load_data()
+
+
+@functools.cache
+def _splitter() -> SentenceSplitter:
+    # Built in every worker, the split functions of a splitter do not pickle
+    return SentenceSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
+
+def parse_file(documents_dir: Path, relative_path: str) -> ParsedFile:
+    """Parse one file and split it into nodes, runs in a pool worker."""
+    start = time.perf_counter()
+    documents = load_document(documents_dir, relative_path)
+    nodes = _splitter()(documents)
+    return ParsedFile(
+        relative_path,
+        [document.doc_id for document in documents],
+        nodes,
+        time.perf_counter() - start,
+    )
+
+
+def parse_files(
+    documents_dir: Path, relative_paths: list[str], workers: int = INGESTION_WORKERS
+) -> Iterator[ParsedFile]:
+    """
+    Parse and split files in a process pool.
+
+    PDF parsing is pure Python and holds the GIL, so only processes use
+    more than one core. Results are yielded in the order of
+    relative_paths as soon as they are ready, so the caller embeds the
+    first files while the pool still parses the rest. Workers are
+    spawned, not forked: the app runs threads, and a forked child can
+    inherit a lock another thread held.
+
+    Args:
+        documents_dir: Directory of the source documents
+        relative_paths: Files to parse
+        workers: Number of worker processes, 0 for one per core up to
+            MAX_INGESTION_WORKERS, 1 parses in this process
+    """
+    if not workers:
+        workers = min(os.cpu_count() or 1, MAX_INGESTION_WORKERS)
+    workers = min(workers, len(relative_paths))
+    if workers <= 1:
+        for path in relative_paths:
+            yield parse_file(documents_dir, path)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        yield from pool.map(parse_file, repeat(documents_dir), relative_paths)
+
+
+def slowest_files(files: dict[str, dict], count: int = 5) -> list[tuple[str, float]]:
+    """(path, parse seconds) of the files that took longest to parse."""
+    timed = [
+        (path, entry["parse_seconds"])
+        for path, entry in files.items()
+        if "parse_seconds" in entry
+    ]
+    return sorted(timed, key=lambda item: item[1], reverse=True)[:count]
+
+
+def embed_nodes(nodes: list[BaseNode]) -> list[BaseNode]:
+    """Set the embedding of every node in one batch call of the embed model."""
+    embeddings = Settings.embed_model.get_text_embedding_batch(
+        [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+    )
+    for node, embedding in zip(nodes, embeddings):
+        node.embedding = embedding
+    return nodes
+
+
+def ann_index_outdated(vector_store: NumpyVectorStore, min_nodes: int) -> bool:
+    """Whether the IVF index of the store has to be built, rebuilt or dropped."""
+    ann_index = vector_store.ann_index
+    if vector_store.num_nodes < max(min_nodes, 1):
+        return ann_index is not None
+    return (
+        ann_index is None
+        or default_n_lists(vector_store.num_nodes)
+        > ANN_REBUILD_GROWTH * ann_index.n_lists
+    )
+
+
+def update_ann_index(vector_store: NumpyVectorStore, min_nodes: int) -> None:
+    """Build the IVF index of a large store, exact search for a small one."""
+    if not ann_index_outdated(vector_store, min_nodes):
+        return
+    if vector_store.num_nodes < max(min_nodes, 1):
+        logger.info("Dropping the ANN index, %d nodes", vector_store.num_nodes)
+        vector_store.drop_ann_index()
+        return
+    start = time.perf_counter()
+    ann_index = vector_store.build_ann_index(n_probe=ANN_N_PROBE or None)
+    logger.info(
+        "Built ANN index of %d nodes in %.1f s: %d lists, %d probed",
+        ann_index.n_rows,
+        time.perf_counter() - start,
+        ann_index.n_lists,
+        ann_index.n_probe,
+    )
+
+
+def log_embedding_stats() -> None:
+    """Log the hit rate of the embedding cache, if the model has one."""
+    stats = embedding_cache_stats()
+    if stats is not None:
+        logger.info(
+            "Embedding cache: %d hits, %d misses (%.0f%%), %.1f s saved",
+            stats["hits"],
+            stats["misses"],
+            100 * stats["hit_rate"],
+            stats["saved_seconds"],
+        )
+
+
+def update_index(
+    documents_dir: Path = DOCUMENTS_PATH,
+    persist_dir: Path = VECTOR_STORE_PATH,
+    rebuild: bool = False,
+    workers: int = INGESTION_WORKERS,
+    ann_min_nodes: int = ANN_MIN_NODES,
+) -> tuple[VectorStoreIndex, IndexChanges]:
+    """
+    Load the persisted index and bring it in line with the documents.
+
+    Args:
+        documents_dir: Directory of the source documents
+        persist_dir: Directory of the persisted index and its manifest
+        rebuild: Build the index from scratch
+        workers: Number of parsing processes, 0 for one per core up to
+            MAX_INGESTION_WORKERS
+        ann_min_nodes: Nodes from which on an IVF index is used
+
+    Returns:
+        (index, changes that were applied)
+    """
+    manifest = None if rebuild else load_manifest(persist_dir)
+    if manifest is not None and manifest.get("settings") != index_settings():
+        logger.info("Index settings changed, rebuilding %s", persist_dir)
+        manifest = None
+
+    vector_store = (
+        None if manifest is None else load_vector_store(persist_dir, manifest)
+    )
+    if manifest is None or vector_store is None:
+        # Without a usable store everything is parsed again
+        manifest = None
+        for name in _JSON_STORE_FILES:
+            (persist_dir / name).unlink(missing_ok=True)
+        vector_store = NumpyVectorStore()
+        previous: dict[str, dict] = {}
+    else:
+        previous = manifest["files"]
+    index = VectorStoreIndex.from_vector_store(vector_store)
+
+    current = scan_documents(documents_dir, previous)
+    changes = diff_documents(previous, current)
+    if (
+        not changes
+        and manifest is not None
+        and not ann_index_outdated(vector_store, ann_min_nodes)
+    ):
+        return index, changes
+
+    start = time.perf_counter()
+    for path in changes.changed + changes.removed:
+        for doc_id in previous[path].get("doc_ids", []):
+            vector_store.delete(doc_id)
+
+    # Unchanged files keep their document ids and parse time
+    for path in current.keys() & previous.keys():
+        current[path] = {**previous[path], **current[path]}
+    n_nodes = 0
+    for parsed in parse_files(documents_dir, changes.added + changes.changed, workers):
+        current[parsed.path]["doc_ids"] = parsed.doc_ids
+        current[parsed.path]["parse_seconds"] = round(parsed.seconds, 3)
+        logger.info(
+            "Parsed %s in %.2f s, %d nodes",
+            parsed.path,
+            parsed.seconds,
+            len(parsed.nodes),
+        )
+        # Straight into the store, index.insert_nodes() would also keep
+        # every node in the in-memory docstore
+        vector_store.add(embed_nodes(parsed.nodes))
+        n_nodes += len(parsed.nodes)
+
+    update_ann_index(vector_store, ann_min_nodes)
+    persist_dir.mkdir(parents=True, exist_ok=True)
+    vector_store.persist(str(store_directory(persist_dir)))
+    save_manifest(
+        persist_dir,
+        {
+            "version": MANIFEST_VERSION,
+            "settings": index_settings(),
+            "updated": time.time(),
+            "nodes": vector_store.num_nodes,
+            "files": current,
+        },
+    )
+    # Map the persisted rows, which are in the list order of the IVF index
+    vector_store = NumpyVectorStore.from_persist_dir(
+        persist_dir, n_probe=ANN_N_PROBE or None
+    )
+    index = VectorStoreIndex.from_vector_store(vector_store)
+    log_embedding_stats()
+    logger.info(
+        "Index updated in %.1f s: %d added, %d changed, %d removed, %d nodes",
+        time.perf_counter() - start,
+        len(changes.added),
+        len(changes.changed),
+        len(changes.removed),
+        n_nodes,
+    )
+    return index, changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=INGESTION_WORKERS,
+        help=f"0: one per core, at most {MAX_INGESTION_WORKERS}",
+    )
+    parser.add_argument(
+        "--ann-min-nodes",
+        type=int,
+        default=ANN_MIN_NODES,
+        help="Build an IVF index from this many nodes on, 0 to build it now",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    configure_llamaindex()
+    start = time.perf_counter()
+    _, changes = update_index(
+        rebuild=args.rebuild, workers=args.workers, ann_min_nodes=args.ann_min_nodes
+    )
+    print(
+        f"{len(changes.added)} added, {len(changes.changed)} changed, "
+        f"{len(changes.removed)} removed in {time.perf_counter() - start:.1f} s"
+    )
+    manifest = load_manifest(VECTOR_STORE_PATH)
+    if manifest is not None:
+        print("Slowest files to parse:")
+        for path, seconds in slowest_files(manifest["files"]):
+            print(f"{seconds:8.2f} s  {path}")
+
+
+if __name__ == "__main__":
+    main()
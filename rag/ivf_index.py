@@ -0,0 +1,234 @@
+"""
+Inverted-file (IVF) index for approximate nearest-neighbour retrieval.
+
+Exact search scores the query against every chunk, which grows linearly
+with the corpus. IVFIndex clusters the unit-normalized embeddings with
+spherical k-means into about sqrt(n) lists. A query is scored against
+the centroids first and only against the chunks of the n_probe closest
+lists. The index stores row numbers into the embedding matrix of
+NumpyVectorStore, not a second copy of the vectors, and is persisted in
+the same directory. The store writes its rows in list order, so a list
+is a contiguous block of the matrix and scoring it needs no gather.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+CENTROIDS_FILE: str = "ivf_centroids.npy"
+OFFSETS_FILE: str = "ivf_offsets.npy"
+ROWS_FILE: str = "ivf_rows.npy"
+# Training points per list, k-means on a sample of this size is close
+# enough to k-means on all rows
+TRAIN_POINTS_PER_LIST: int = 64
+# Rows scored against the centroids at once when assigning
+_ASSIGN_BLOCK_ROWS: int = 32768
+
+
+def default_n_lists(n_rows: int) -> int:
+    """About sqrt(n_rows) lists, so centroids and probed lists cost the same."""
+    return max(1, int(round(np.sqrt(n_rows))))
+
+
+def default_n_probe(n_lists: int) -> int:
+    """Probe about 6% of the lists, recall@4 stays above 0.9 in bench_ann."""
+    return min(n_lists, max(8, int(round(n_lists / 16))))
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """List of every vector, the centroid with the largest inner product."""
+    lists: np.ndarray = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _ASSIGN_BLOCK_ROWS):
+        block = vectors[start : start + _ASSIGN_BLOCK_ROWS]
+        lists[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return lists
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, n_lists: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """
+    Unit-length centroids of vectors, maximizing the inner product.
+
+    Empty lists are reseeded with random vectors.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        lists = assign(vectors, centroids)
+        counts = np.bincount(lists, minlength=n_lists)
+        filled = counts > 0
+        starts = np.cumsum(counts) - counts
+        sums = np.empty_like(centroids)
+        sums[filled] = np.add.reduceat(
+            vectors[np.argsort(lists, kind="stable")], starts[filled]
+        )
+        sums[~filled] = vectors[rng.choice(len(vectors), int((~filled).sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Lists of embedding rows grouped by their closest centroid.
+
+    rows[offsets[i]:offsets[i + 1]] are the rows of list i. Rows added to
+    the matrix after the build (n_rows and above) are not in any list and
+    are always scored.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        offsets: np.ndarray,
+        rows: np.ndarray,
+        n_probe: int | None = None,
+    ):
+        """
+        Args:
+            centroids: (n_lists, dim) unit-length centroids
+            offsets: (n_lists + 1,) start of every list in rows
+            rows: Matrix rows, grouped by list
+            n_probe: Lists scored per query, defaults to default_n_probe()
+        """
+        self.centroids = centroids
+        self.offsets = offsets
+        self.rows = rows
+        self.n_probe = n_probe or default_n_probe(len(centroids))
+        self.contiguous = bool(np.array_equal(rows, np.arange(len(rows))))
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def n_rows(self) -> int:
+        """Rows of the matrix the index was built or last compacted for."""
+        return len(self.rows)
+
+    @classmethod
+    def build(
+        cls,
+        matrix: np.ndarray,
+        n_lists: int | None = None,
+        iterations: int = 10,
+        n_probe: int | None = None,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Cluster the rows of a unit-normalized (rows, dim) matrix.
+
+        Args:
+            matrix: Embeddings, row i is the node of row i in the store
+            n_lists: Number of lists, defaults to default_n_lists()
+            iterations: k-means iterations on the training sample
+            n_probe: Lists scored per query, defaults to default_n_probe()
+            seed: Seed of the training sample and initial centroids
+        """
+        n_lists = min(n_lists or default_n_lists(len(matrix)), len(matrix))
+        rng = np.random.default_rng(seed)
+        n_train = min(len(matrix), TRAIN_POINTS_PER_LIST * n_lists)
+        sample = np.sort(rng.choice(len(matrix), n_train, replace=False))
+        centroids = spherical_kmeans(
+            np.asarray(matrix[sample], dtype=np.float32), n_lists, iterations, seed
+        )
+        lists = assign(matrix, centroids)
+        return cls._from_lists(centroids, lists, np.arange(len(matrix)), n_probe)
+
+    @classmethod
+    def _from_lists(
+        cls,
+        centroids: np.ndarray,
+        lists: np.ndarray,
+        rows: np.ndarray,
+        n_probe: int | None,
+    ) -> "IVFIndex":
+        order = np.argsort(lists, kind="stable")
+        offsets: np.ndarray = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(lists, minlength=len(centroids)), out=offsets[1:])
+        return cls(centroids, offsets, rows[order].astype(np.int64), n_probe)
+
+    def probe(self, query_vector: np.ndarray) -> np.ndarray:
+        """The n_probe lists whose centroids are closest to the query."""
+        n_probe = min(self.n_probe, self.n_lists)
+        scores = self.centroids @ query_vector
+        return np.argpartition(-scores, n_probe - 1)[:n_probe]
+
+    def score(
+        self, matrix: np.ndarray, query_vector: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Inner products of the query with the rows of the probed lists.
+
+        Rows added to matrix after the build are scored too.
+
+        Returns:
+            (rows, scores)
+        """
+        probed = self.probe(query_vector)
+        spans = list(zip(self.offsets[probed], self.offsets[probed + 1]))
+        rows = [self.rows[start:end] for start, end in spans]
+        if self.contiguous:
+            # Lists are blocks of the matrix, slicing avoids copying rows
+            scores = [matrix[start:end] @ query_vector for start, end in spans]
+        else:
+            scores = [matrix[block] @ query_vector for block in rows]
+        rows.append(np.arange(self.n_rows, len(matrix)))
+        scores.append(matrix[self.n_rows :] @ query_vector)
+        return np.concatenate(rows), np.concatenate(scores)
+
+    def compact(
+        self, keep: np.ndarray, matrix: np.ndarray
+    ) -> tuple["IVFIndex", np.ndarray]:
+        """
+        Index for a matrix of only the rows in keep, written in list order.
+
+        Rows of keep the index does not know yet (added after the build)
+        are assigned to their closest centroid, the centroids stay.
+
+        Args:
+            keep: Rows of matrix that are kept
+            matrix: Embeddings before compaction
+
+        Returns:
+            (index of the new matrix, rows of matrix in the order to write)
+        """
+        position: np.ndarray = np.full(len(matrix), -1, dtype=np.int64)
+        position[keep] = np.arange(len(keep))
+        list_of_entry: np.ndarray = np.repeat(
+            np.arange(self.n_lists), np.diff(self.offsets)
+        )
+        kept = position[self.rows] >= 0
+        appended = keep[keep >= self.n_rows]
+        lists = np.concatenate(
+            [list_of_entry[kept], assign(matrix[appended], self.centroids)]
+        )
+        rows = np.concatenate([self.rows[kept], appended])
+        compacted = self._from_lists(self.centroids, lists, rows, self.n_probe)
+        order = compacted.rows
+        compacted.rows = np.arange(len(order))
+        compacted.contiguous = True
+        return compacted, order
+
+    def save(self, directory: str | Path) -> None:
+        directory = Path(directory)
+        np.save(directory / CENTROIDS_FILE, self.centroids)
+        np.save(directory / OFFSETS_FILE, self.offsets)
+        np.save(directory / ROWS_FILE, self.rows)
+
+    @classmethod
+    def load(
+        cls, directory: str | Path, n_probe: int | None = None
+    ) -> "IVFIndex | None":
+        """Map the index saved in directory, None if there is none."""
+        directory = Path(directory)
+        if not (directory / CENTROIDS_FILE).exists():
+            return None
+        return cls(
+            np.load(directory / CENTROIDS_FILE),
+            np.load(directory / OFFSETS_FILE),
+            np.asarray(np.load(directory / ROWS_FILE, mmap_mode="r")),
+            n_probe,
+        )
@@ -0,0 +1,333 @@
+"""
+Memory-mapped vector store for the RAG index.
+
+SimpleVectorStore persists every embedding as JSON text, and the default
+docstore keeps the text of every node in another JSON file. Both are
+parsed completely at startup in every Streamlit process. NumpyVectorStore
+keeps the unit-normalized embeddings in a float32 .npy matrix and the
+text and metadata of every node in one binary file of JSON records with
+an offset table. Loading memory-maps both, so startup reads only the
+node ids, all processes share the pages, and a query decodes only the
+top_k records. Similarity search is one matrix-vector product, or with
+an IVFIndex (rag.ivf_index) only over the rows of the probed lists.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+from llama_index.core.schema import BaseNode, MetadataMode
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryMode,
+    VectorStoreQueryResult,
+)
+from llama_index.core.vector_stores.utils import (
+    metadata_dict_to_node,
+    node_to_metadata_dict,
+)
+from pydantic import PrivateAttr
+
+from rag.ivf_index import IVFIndex
+
+FORMAT_VERSION: int = 1
+DEFAULT_NAMESPACE: str = "default"
+NODES_FILE: str = "nodes.json"
+EMBEDDINGS_FILE: str = "embeddings.npy"
+RECORDS_FILE: str = "records.bin"
+OFFSETS_FILE: str = "offsets.npy"
+
+
+def store_directory(persist_dir: str | Path, namespace: str = DEFAULT_NAMESPACE):
+    """Directory of the store, next to the other files of the index."""
+    return Path(persist_dir) / f"{namespace}__vector_store"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(
+    matrix: np.ndarray,
+    query_vector: np.ndarray,
+    k: int,
+    excluded: np.ndarray | None = None,
+    ann_index: IVFIndex | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Rows of matrix with the largest inner product with query_vector.
+
+    Args:
+        matrix: (rows, dim) embeddings
+        query_vector: (dim,) query embedding
+        k: Number of rows to return
+        excluded: Boolean mask of the rows that are skipped
+        ann_index: Only score the rows this index proposes, exact if None
+
+    Returns:
+        (rows, scores), best first
+    """
+    if ann_index is None:
+        rows = None
+        scores = matrix @ query_vector
+    else:
+        rows, scores = ann_index.score(matrix, query_vector)
+    if excluded is not None:
+        scores[excluded if rows is None else excluded[rows]] = -np.inf
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    top = top[np.isfinite(scores[top])]
+    return (top if rows is None else rows[top]), scores[top]
+
+
+class NumpyVectorStore(BasePydanticVectorStore):
+    """
+    Vector store backed by a memory-mapped float32 matrix.
+
+    Rows are only appended or marked deleted while the store is in use,
+    persist() writes a compacted copy and swaps it in, so processes that
+    still map the old files keep reading them. With an ANN index, rows
+    added after its build are searched exhaustively until persist()
+    assigns them to lists.
+    """
+
+    stores_text: bool = True
+
+    _ids: list[str] = PrivateAttr(default_factory=list)
+    _ref_doc_ids: list[str] = PrivateAttr(default_factory=list)
+    _rows_by_ref_doc: dict[str, list[int]] = PrivateAttr(default_factory=dict)
+    _deleted: set[int] = PrivateAttr(default_factory=set)
+    _matrix: np.ndarray | None = PrivateAttr(default=None)
+    _pending: list[np.ndarray] = PrivateAttr(default_factory=list)
+    # Records of rows below _n_mapped are read from the mapped file
+    _n_mapped: int = PrivateAttr(default=0)
+    _records: np.ndarray | None = PrivateAttr(default=None)
+    _offsets: np.ndarray | None = PrivateAttr(default=None)
+    _new_records: list[bytes] = PrivateAttr(default_factory=list)
+    _ann_index: IVFIndex | None = PrivateAttr(default=None)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "NumpyVectorStore"
+
+    @property
+    def client(self) -> Any:
+        return None
+
+    # No __len__, StorageContext.from_defaults() ignores a falsy vector store
+    @property
+    def num_nodes(self) -> int:
+        """Number of nodes that were not deleted."""
+        return len(self._ids) - len(self._deleted)
+
+    @property
+    def ann_index(self) -> IVFIndex | None:
+        """Approximate nearest-neighbour index, None for exact search."""
+        return self._ann_index
+
+    def ref_doc_ids(self) -> set[str]:
+        """Ids of the documents that have nodes in the store."""
+        return set(self._rows_by_ref_doc)
+
+    def build_ann_index(
+        self, n_lists: int | None = None, n_probe: int | None = None
+    ) -> IVFIndex:
+        """Build an IVFIndex over all rows, saved by the next persist()."""
+        self._ann_index = IVFIndex.build(
+            self.embeddings(), n_lists=n_lists, n_probe=n_probe
+        )
+        return self._ann_index
+
+    def drop_ann_index(self) -> None:
+        """Go back to exact search."""
+        self._ann_index = None
+
+    @classmethod
+    def from_persist_dir(
+        cls,
+        persist_dir: str | Path,
+        namespace: str = DEFAULT_NAMESPACE,
+        n_probe: int | None = None,
+    ) -> "NumpyVectorStore":
+        """
+        Map a store written by persist(), with its ANN index if it has one.
+
+        Raises:
+            FileNotFoundError: If the index has no NumpyVectorStore
+            ValueError: If the format version or the files do not match
+        """
+        directory = store_directory(persist_dir, namespace)
+        with open(directory / NODES_FILE, encoding="utf-8") as nodes_file:
+            nodes = json.load(nodes_file)
+        if nodes.get("format_version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported vector store format: {nodes.get('format_version')}"
+            )
+
+        store = cls()
+        # np.asarray drops the np.memmap subclass but keeps the mapped buffer
+        matrix = np.asarray(np.load(directory / EMBEDDINGS_FILE, mmap_mode="r"))
+        offsets = np.asarray(np.load(directory / OFFSETS_FILE, mmap_mode="r"))
+        if not len(nodes["ids"]) == len(matrix) == len(offsets) - 1:
+            raise ValueError(f"Vector store files in {directory} do not match")
+        if offsets[-1]:
+            records = np.memmap(directory / RECORDS_FILE, dtype=np.uint8, mode="r")
+            store._records = np.asarray(records)
+        store._matrix = matrix
+        store._offsets = offsets
+        store._n_mapped = len(matrix)
+        store._ann_index = IVFIndex.load(directory, n_probe)
+        store._ids = nodes["ids"]
+        store._ref_doc_ids = nodes["ref_doc_ids"]
+        for row, ref_doc_id in enumerate(store._ref_doc_ids):
+            store._rows_by_ref_doc.setdefault(ref_doc_id, []).append(row)
+        return store
+
+    def add(self, nodes: Sequence[BaseNode], **kwargs: Any) -> list[str]:
+        """Append nodes with their embeddings."""
+        if not nodes:
+            return []
+        vectors = _normalize(
+            np.array([node.get_embedding() for node in nodes], dtype=np.float32)
+        )
+        self._pending.append(vectors)
+        for node in nodes:
+            row = len(self._ids)
+            ref_doc_id = node.ref_doc_id or node.node_id
+            self._ids.append(node.node_id)
+            self._ref_doc_ids.append(ref_doc_id)
+            self._rows_by_ref_doc.setdefault(ref_doc_id, []).append(row)
+            record = {
+                "text": node.get_content(metadata_mode=MetadataMode.NONE),
+                "metadata": node_to_metadata_dict(
+                    node, remove_text=True, flat_metadata=False
+                ),
+            }
+            self._new_records.append(json.dumps(record).encode("utf-8"))
+        return [node.node_id for node in nodes]
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        """Mark the nodes of a document deleted."""
+        self._deleted.update(self._rows_by_ref_doc.pop(ref_doc_id, []))
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        """
+        Cosine similarity search over all rows, or over the candidates of
+        the ANN index when the query is not restricted to ids.
+
+        Raises:
+            NotImplementedError: For metadata filters or other query modes
+        """
+        if query.filters is not None or query.mode != VectorStoreQueryMode.DEFAULT:
+            raise NotImplementedError(
+                "NumpyVectorStore only supports plain similarity search"
+            )
+        matrix = self.embeddings()
+        if query.query_embedding is None or not self.num_nodes:
+            return VectorStoreQueryResult(nodes=[], similarities=[], ids=[])
+
+        query_vector = _normalize(np.asarray(query.query_embedding, dtype=np.float32))
+        # Empty lists do not restrict, as in the other stores
+        restricted = bool(query.doc_ids or query.node_ids)
+        excluded: np.ndarray | None = None
+        if self._deleted or restricted:
+            excluded = np.zeros(len(matrix), dtype=bool)
+            excluded[list(self._deleted)] = True
+            if query.doc_ids:
+                excluded |= ~np.isin(self._ref_doc_ids, query.doc_ids)
+            if query.node_ids:
+                excluded |= ~np.isin(self._ids, query.node_ids)
+
+        rows, scores = top_k(
+            matrix,
+            query_vector,
+            query.similarity_top_k,
+            excluded,
+            None if restricted else self._ann_index,
+        )
+        return VectorStoreQueryResult(
+            nodes=[self._node(int(row)) for row in rows],
+            similarities=scores.tolist(),
+            ids=[self._ids[row] for row in rows],
+        )
+
+    def embeddings(self) -> np.ndarray:
+        """(rows, dim) unit-normalized embeddings, deleted rows included."""
+        if self._pending:
+            blocks = self._pending if self._matrix is None else [self._matrix]
+            if self._matrix is not None:
+                blocks += self._pending
+            self._matrix = np.concatenate(blocks)
+            self._pending = []
+        if self._matrix is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._matrix
+
+    def persist(self, persist_path: str, fs: Any = None) -> None:
+        """
+        Write the live rows to the directory next to persist_path.
+
+        StorageContext.persist() passes <persist_dir>/default__vector_store.json,
+        the store writes the directory of that name without the suffix.
+        With an ANN index the rows are written in list order.
+        """
+        directory = Path(persist_path).with_suffix("")
+        rows = [row for row in range(len(self._ids)) if row not in self._deleted]
+        temporary = Path(f"{directory}.tmp-{os.getpid()}")
+        shutil.rmtree(temporary, ignore_errors=True)
+        temporary.mkdir(parents=True)
+
+        matrix = self.embeddings()
+        dim = matrix.shape[1] if matrix.ndim == 2 else 0
+        if self._ann_index is not None and rows:
+            ann_index, order = self._ann_index.compact(np.array(rows), matrix)
+            ann_index.save(temporary)
+            rows = order.tolist()
+        np.save(
+            temporary / EMBEDDINGS_FILE,
+            matrix[rows] if len(rows) else np.zeros((0, dim), np.float32),
+        )
+        offsets: np.ndarray = np.zeros(len(rows) + 1, dtype=np.int64)
+        with open(temporary / RECORDS_FILE, "wb") as records_file:
+            for i, row in enumerate(rows):
+                record = self._record(row)
+                records_file.write(record)
+                offsets[i + 1] = offsets[i] + len(record)
+        np.save(temporary / OFFSETS_FILE, offsets)
+        with open(temporary / NODES_FILE, "w", encoding="utf-8") as nodes_file:
+            json.dump(
+                {
+                    "format_version": FORMAT_VERSION,
+                    "dim": dim,
+                    "ids": [self._ids[row] for row in rows],
+                    "ref_doc_ids": [self._ref_doc_ids[row] for row in rows],
+                },
+                nodes_file,
+            )
+
+        # Processes that mapped the old files keep reading them until they reload
+        previous = Path(f"{directory}.old-{os.getpid()}")
+        if directory.exists():
+            os.rename(directory, previous)
+        os.rename(temporary, directory)
+        shutil.rmtree(previous, ignore_errors=True)
+
+    def _record(self, row: int) -> bytes:
+        if row >= self._n_mapped:
+            return self._new_records[row - self._n_mapped]
+        assert self._offsets is not None and self._records is not None
+        start, end = self._offsets[row], self._offsets[row + 1]
+        return self._records[start:end].tobytes()
+
+    def _node(self, row: int) -> BaseNode:
+        record = json.loads(self._record(row))
+        return metadata_dict_to_node(record["metadata"], text=record["text"])
@@ -1,12 +1,11 @@
-import time
-from collections import Counter
-
 import streamlit as st
 from streamlit_webrtc import WebRtcMode, webrtc_streamer
 
+from hand_signs_engine.notifier import UI_REFRESH_SECONDS
 from hand_signs_recognition_for_rag.frame_processor import create_frame_callback
 from hand_signs_recognition_for_rag.mediapipe_config import MediaPipeConfig
 from hand_signs_recognition_for_rag.prediction_state import PredictionState
+from st_components.sub_components.frame_callback import stream_frame_callback
 from st_components.sub_components.rag import render_rag_chat
 
 # Question database
@@ -253,18 +252,12 @@ def render_learning_chat():
     # st.title("MediaPipe Hands -
     # Landmarks Overlay with Inference Classifier")
 
-    # Load MediaPipe config and model (cached)
-    @st.cache_resource
-    def load_config():
-        return MediaPipeConfig()
-
-    config = load_config()
+    # Model and hand detectors are shared by the whole process
+    config = MediaPipeConfig()
 
     # Initialize prediction state in session
     if "prediction_state" not in st.session_state:
         st.session_state.prediction_state = PredictionState()
-    if "prediction_history" not in st.session_state:
-        st.session_state.prediction_history = []
     if "stable_prediction" not in st.session_state:
         st.session_state.stable_prediction = "No hand detected"
     if "chat_query" not in st.session_state:
@@ -286,33 +279,19 @@ def render_learning_chat():
 
         if st.button("🔙 Back to sign detection"):
             st.session_state.chat_query = None
-            st.session_state.prediction_history = []
+            st.session_state.prediction_state.reset_smoothing()
             st.rerun()
 
     st.markdown("---")
 
     prediction_state = st.session_state.prediction_state
 
-    # Create callback function
-    callback = create_frame_callback(config, prediction_state)
-
-    def get_stable_prediction(current_pred, history, window_size=10, threshold=0.6):
-        """
-        Stabilize prediction by requiring consistency over multiple frames
-        """
-        history.append(current_pred)
-        if len(history) > window_size:
-            history.pop(0)
-
-        if len(history) >= window_size:
-            # Get most common prediction in window
-            counter = Counter(history)
-            most_common, count = counter.most_common(1)[0]
-            # Only update if it appears in threshold% of frames
-            if count >= window_size * threshold:
-                return most_common
-
-        return st.session_state.stable_prediction
+    # Created once per stream, so reruns keep the engine state of the stream
+    callback = stream_frame_callback(
+        "learning_chat",
+        ("dgs-rec", prediction_state),
+        lambda: create_frame_callback(config, prediction_state),
+    )
 
     right_col, left_col = st.columns([1, 1], vertical_alignment="center")
     with left_col:
@@ -329,23 +308,24 @@ def render_learning_chat():
             # Add a "Detect New Sign" button
             if st.button("🔄 Detect New Sign"):
                 st.session_state.stable_prediction = "No hand detected"
-                st.session_state.prediction_history = []
+                prediction_state.reset_smoothing()
                 st.rerun()
 
     # Display current prediction with live updates
 
     # Update display while streaming
     if webrtc_ctx.state.playing:
-        # Get raw prediction from current frame
-        current_pred = prediction_state.get_prediction()
-
-        # Stabilize the prediction
-        stable_pred = get_stable_prediction(
-            current_pred,
-            st.session_state.prediction_history,
-            window_size=10,
-            threshold=0.6,  # 40% consistency required
-        )
+        # Version of what is shown now, returns at once
+        version = prediction_state.wait_for_change()
+        # The prediction state already smooths the predictions over time
+        stable = prediction_state.get_stable_prediction()
+        if stable is not None:
+            stable_pred = config.labels_dict.get(stable.class_id)
+        elif prediction_state.get_prediction() == "No hand detected":
+            stable_pred = "No hand detected"
+        else:
+            # Not sure yet, keep showing the last stable sign
+            stable_pred = st.session_state.stable_prediction
 
         if stable_pred and stable_pred != st.session_state.stable_prediction:
             st.session_state.stable_prediction = stable_pred
@@ -380,12 +360,13 @@ def render_learning_chat():
                                         question_idx
                                     ]
                                     # Stop the prediction loop to focus on chat
-                                    st.session_state.prediction_history = []
+                                    prediction_state.reset_smoothing()
                                     st.rerun()
 
         if (
             st.session_state.stable_prediction == "No hand detected"
             or st.session_state.stable_prediction not in QUESTIONS_DB
         ):
-            time.sleep(0.1)
+            # Rerun once the stable sign changed instead of polling
+            prediction_state.wait_for_change(version, UI_REFRESH_SECONDS)
             st.rerun()
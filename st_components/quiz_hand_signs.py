@@ -4,11 +4,13 @@ import time
 import streamlit as st
 from streamlit_webrtc import WebRtcMode, webrtc_streamer
 
+from hand_signs_engine.notifier import UI_REFRESH_SECONDS
 from hand_signs_recognition_for_quiz.frame_processor import create_frame_callback
 from hand_signs_recognition_for_quiz.mediapipe_config import MediaPipeConfig
 from hand_signs_recognition_for_quiz.prediction_state import PredictionState
 from utils import translate
 
+from .sub_components.frame_callback import stream_frame_callback
 from .sub_components.highscore_redis import main as highscores
 
 quiz_classes = ["6", "12", "11", "28", "14"]
@@ -64,12 +66,8 @@ def render_quiz_hand_signs():
             else "Verwende Handzeichen für dieses Quiz."
         )
 
-        # Load MediaPipe config and model (cached)
-        @st.cache_resource
-        def load_config():
-            return MediaPipeConfig()
-
-        config = load_config()
+        # Model and hand detectors are shared by the whole process
+        config = MediaPipeConfig()
         if "correct_class_index" not in st.session_state:
             st.session_state.correct_class_index = random.randint(
                 0, len(quiz_classes) - 1
@@ -89,9 +87,12 @@ def render_quiz_hand_signs():
 
         quiz_container, cam_webrtc = st.columns([1, 1], vertical_alignment="top")
 
-        # Create callback function
-        callback = create_frame_callback(
-            config, prediction_state, st.session_state.correct_class
+        # Created once per stream, so reruns keep the engine state of the stream
+        correct_class = st.session_state.correct_class
+        callback = stream_frame_callback(
+            "quiz_hand_signs",
+            ("mediapipe-hands-landmarks", prediction_state, correct_class),
+            lambda: create_frame_callback(config, prediction_state, correct_class),
         )
 
         # WebRTC Streamer
@@ -118,7 +119,10 @@ def render_quiz_hand_signs():
             prediction_weight = 0
         # Update display while streaming
         if webrtc_ctx.state.playing:
+            version = None
             while webrtc_ctx.state.playing:
+                # Wakes up as soon as the strength changed
+                version = prediction_state.wait_for_change(version, UI_REFRESH_SECONDS)
                 current_strength = prediction_state.get_prediction_strength()
                 bar_percent = current_strength if 0.05 < current_strength <= 1 else 0
                 progress.progress(bar_percent)
@@ -158,7 +162,6 @@ def render_quiz_hand_signs():
                     time.sleep(2)
                     succes_msg.empty()
                     st.rerun()
-                time.sleep(0.5)  # Small delay to avoid overwhelming the UI
         else:
             prediction_placeholder.markdown(
                 translate(
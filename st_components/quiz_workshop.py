@@ -3,10 +3,12 @@ import random
 import streamlit as st
 from streamlit_webrtc import WebRtcMode, webrtc_streamer
 
+from hand_signs_engine.notifier import UI_REFRESH_SECONDS
 # KORREKTUR: Import der umbenannten Datei mit korrekter Signatur
 from hand_signs_recognition_for_quiz.frame_processor_quiz import create_frame_callback
 from hand_signs_recognition_for_quiz.mediapipe_config import MediaPipeConfig
 from hand_signs_recognition_for_quiz.prediction_state_quiz import PredictionStateQuiz
+from st_components.sub_components.frame_callback import stream_frame_callback
 
 # --- 1. GRUNDDATEN FÜR DAS QUIZ ---
 quiz_classes = [
@@ -62,14 +64,6 @@ def translate(english_text, german_text):
     return english_text
 
 
-@st.cache_resource
-def load_config():
-    """Lädt die MediaPipe Config einmalig."""
-    return MediaPipeConfig()
-
-
-config = load_config()
-
 # Zuordnung von Gebärdenname zur ML-Klasse (ID) für die DGS-Challenge
 QUIZ_DGS_CLASSES = {
     "ANREISSNADEL": "20",
@@ -637,8 +631,17 @@ def render_dgs_challenge_ui(expected_gebärde, current_lf):
         )
         return
 
-    # Erzeuge Callback (mit der neuesten Frame-Processor-Logik)
-    callback = create_frame_callback(config, prediction_state, correct_class_id)
+    # Modell und Hand-Detektoren teilt sich der ganze Prozess
+    config = MediaPipeConfig()
+
+    # Erzeuge Callback (mit der neuesten Frame-Processor-Logik), einmal pro
+    # Stream, damit Reruns den Zustand der Engine nicht zurücksetzen
+    dynamic_key = f"quiz_dgs_challenge_{st.session_state.quiz_index}"
+    callback = stream_frame_callback(
+        "quiz_workshop",
+        (dynamic_key, prediction_state, correct_class_id),
+        lambda: create_frame_callback(config, prediction_state, correct_class_id),
+    )
 
     # VORSCHLAG FÜR NEUE CONSTRAINTS ZUR AUFLÖSUNGSSENKUNG
     video_constraints = {
@@ -651,7 +654,6 @@ def render_dgs_challenge_ui(expected_gebärde, current_lf):
 
     # WebRTC Streamer (Key ist wieder dynamisch, wie zuletzt vorgeschlagen)
     with cam_webrtc:
-        dynamic_key = f"quiz_dgs_challenge_{st.session_state.quiz_index}"
         webrtc_ctx = webrtc_streamer(
             key=dynamic_key,
             mode=WebRtcMode.SENDRECV,
@@ -683,10 +685,15 @@ def render_dgs_challenge_ui(expected_gebärde, current_lf):
     # Diese Logik basiert auf Ihrer funktionierenden alten Version
     if webrtc_ctx and webrtc_ctx.state.playing and not st.session_state.dgs_challenge_passed:
         
+        version = None
         while (
             webrtc_ctx.state.playing
             and not st.session_state.dgs_challenge_passed
         ):
+            # Wacht auf, sobald sich die Stärke ändert, spätestens nach
+            # UI_REFRESH_SECONDS, damit Streamlit Klicks verarbeiten kann
+            version = prediction_state.wait_for_change(version, UI_REFRESH_SECONDS)
+
             # 1. Live-Fortschritt anzeigen (wird bei jedem Schleifendurchlauf aktualisiert)
             current_strength = prediction_state.get_prediction_strength()
             bar_percent = current_strength if 0.05 < current_strength <= 1 else 0
@@ -702,10 +709,6 @@ def render_dgs_challenge_ui(expected_gebärde, current_lf):
                 time.sleep(1) # Kurze Pause, bevor UI neu startet
                 st.rerun() # Trigger das UI, um die Buttons anzuzeigen
 
-            # WICHTIG: Die Pause, die den Streamlit-Hauptthread blockiert, 
-            # aber den WebRTC-Stream am Laufen hält
-            time.sleep(0.5)
-
     # --- BUTTONS ---
     st.divider()
     col1, col2, _ = st.columns([1, 1, 3])
@@ -2,10 +2,15 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import streamlit as st
 
+from st_components.sub_components.engine_metrics import render_engine_metrics
+
 
 def render_stats_page():
     st.title("📊 Lernstatistik – Metalltechnik")
 
+    with st.expander("⚙️ Video-Performance"):
+        render_engine_metrics()
+
     # =============================================
     # 1) Load REAL quiz history from session state
     # =============================================
@@ -0,0 +1,93 @@
+import pandas as pd
+import streamlit as st
+
+from hand_signs_engine.inference_worker import get_inference_worker
+from hand_signs_engine.mediapipe_config import (
+    get_model_registry,
+    get_resource_manager,
+)
+from hand_signs_engine.metrics import get_metrics_registry
+
+
+def render_engine_metrics():
+    """Per-stage latency and frame counters of the video streams."""
+    registry = get_metrics_registry()
+    snapshot = registry.snapshot()
+    total = snapshot["total"]
+
+    counters = total["counters"]
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Frames in", counters["frames_in"])
+    c2.metric("Frames out", counters["frames_out"])
+    c3.metric("Inferences", counters["inferences"])
+    c4.metric("Errors", counters["errors"])
+
+    st.caption(
+        f"{len(snapshot['sessions'])} active stream(s), "
+        f"{total['closed_sessions']} closed, latency in ms"
+    )
+    stages = pd.DataFrame(total["stages"]).T
+    st.dataframe(stages[["count", "p50_ms", "p95_ms", "p99_ms", "max_ms"]])
+
+    degraded = {
+        level: seconds
+        for level, seconds in total["seconds_at_level"].items()
+        if level != "full" and seconds > 0
+    }
+    if degraded:
+        st.caption(
+            "Degraded (s): "
+            + ", ".join(f"{level} {seconds:.0f}" for level, seconds in degraded.items())
+        )
+
+    worker = get_inference_worker().stats()
+    st.caption(
+        f"Inference worker: queue {worker['queue_depth']}, "
+        f"mean batch {worker['mean_batch_size']:.1f}, "
+        f"p95 latency {worker['latency']['p95_ms']:.1f} ms"
+    )
+
+    resources = get_resource_manager().stats()
+    pool = resources["hands_pool"]
+    memory = (
+        f", RSS {resources['rss_mb']:.0f} MB" if resources["rss_mb"] is not None else ""
+    )
+    st.caption(
+        f"Hand detectors: {pool['in_use']}/{pool['created']} in use "
+        f"(max {pool['size']}), p95 wait {pool['wait_time']['p95_ms']:.1f} ms" + memory
+    )
+
+    models = get_model_registry().stats()
+    predictions = ", ".join(
+        f"{version}: {count}" for version, count in total["models"].items()
+    )
+    st.caption(
+        f"Model: version {models['version'] or 'unversioned'}, "
+        f"{models['swaps']} swap(s), {models['rejected']} rejected"
+        + (f" — predictions per version: {predictions}" if predictions else "")
+    )
+
+    cache = _embedding_cache_stats()
+    if cache is not None:
+        st.caption(
+            f"Embedding cache: {cache['cached']} vectors, "
+            f"{cache['hits']} hits, {cache['misses']} misses "
+            f"({100 * cache['hit_rate']:.0f}%), "
+            f"{cache['saved_seconds']:.1f} s saved"
+        )
+
+    st.download_button(
+        "Download metrics (JSON)",
+        registry.to_json(),
+        file_name="frame_metrics.json",
+        mime="application/json",
+    )
+
+
+def _embedding_cache_stats():
+    # The RAG dependencies are optional for the video pages
+    try:
+        from rag.embedding_cache import embedding_cache_stats
+    except ImportError:
+        return None
+    return embedding_cache_stats()
@@ -0,0 +1,25 @@
+import streamlit as st
+
+
+def stream_frame_callback(slot, key, create):
+    """
+    Return the frame callback of a page's stream, created once per stream.
+
+    Streamlit reruns the page while the camera streams (at the latest every
+    UI_REFRESH_SECONDS). A new callback on every rerun would start the
+    scheduler, motion gate, ROI tracker and backpressure state of the
+    running stream from scratch, so it is kept in the session state.
+
+    Args:
+        slot: Name of the page's stream, one callback is kept per slot
+        key: Tuple identifying the stream, e.g. the webrtc key, the
+            prediction state and the expected sign; a different key
+            creates a new callback
+        create: Function without arguments that creates the callback
+    """
+    name = f"frame_callback_{slot}"
+    cached = st.session_state.get(name)
+    if cached is None or cached[0] != key:
+        cached = (key, create())
+        st.session_state[name] = cached
+    return cached[1]
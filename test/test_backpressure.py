@@ -0,0 +1,71 @@
+"""Simple tests for the backpressure controller."""
+
+from hand_signs_engine.backpressure import (
+    FULL,
+    LOW_RESOLUTION,
+    NO_OVERLAY,
+    PASS_THROUGH,
+    BackpressureController,
+)
+
+FRAME_INTERVAL = 1 / 30
+
+
+def feed(controller, n_frames, duration_s, start=0):
+    """Feed frames 1/30 s apart that each took duration_s to process."""
+    for i in range(start, start + n_frames):
+        level = controller.observe(i * FRAME_INTERVAL, int(duration_s * 1e9))
+    return level
+
+
+def test_fast_callback_stays_at_full_quality():
+    """Test that a callback faster than the camera is never degraded."""
+    controller = BackpressureController()
+    assert feed(controller, 200, 0.005) == FULL
+    assert controller.degradations == 0
+
+
+def test_overload_degrades_step_by_step():
+    """Test that a slow callback walks through the levels in order."""
+    controller = BackpressureController(escalate_after=5, smoothing=1.0)
+    assert feed(controller, 6, 0.05) == NO_OVERLAY
+    assert feed(controller, 5, 0.05, start=6) == PASS_THROUGH
+    assert feed(controller, 5, 0.05, start=11) == LOW_RESOLUTION
+    assert feed(controller, 20, 0.05, start=16) == LOW_RESOLUTION
+    assert controller.degradations == 3
+
+
+def test_recovery_records_degradation_events():
+    """Test that recovering logs how long each degraded level lasted."""
+    controller = BackpressureController(
+        escalate_after=5, recover_after=10, smoothing=1.0
+    )
+    feed(controller, 6, 0.05)
+    assert feed(controller, 11, 0.005, start=6) == FULL
+
+    stats = controller.stats()
+    assert stats["level"] == "full"
+    assert [event["level"] for event in stats["events"]] == ["no_overlay"]
+    assert stats["events"][0]["duration_s"] >= 0
+    assert set(stats["seconds_at_level"]) == {
+        "full",
+        "no_overlay",
+        "pass_through",
+        "low_resolution",
+    }
+
+
+def test_missing_timestamps_use_arrival_time():
+    """Test that frames without a timestamp do not raise."""
+    controller = BackpressureController()
+    for _ in range(3):
+        controller.observe(None, 1_000)
+    assert controller.level == FULL
+
+
+def test_pass_through_skips_detection_on_some_frames():
+    """Test that only every detect_every-th frame is detected when overloaded."""
+    controller = BackpressureController(detect_every=2)
+    assert not any(controller.skip_detection() for _ in range(4))
+    controller.level = PASS_THROUGH
+    assert sum(controller.skip_detection() for _ in range(10)) == 5
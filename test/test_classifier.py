@@ -0,0 +1,62 @@
+"""Simple tests for the single-pass Classifier adapter."""
+
+import numpy as np
+
+from hand_signs_engine.classifier import Classifier
+
+
+class CountingModel:
+    """Model with string classes like the trained one, counts its calls."""
+
+    def __init__(self):
+        self.classes_ = np.array(["0", "6", "12"])
+        self.calls = 0
+
+    def predict_proba(self, x_input):
+        self.calls += 1
+        return np.array([[0.2, 0.7, 0.1]] * len(x_input))
+
+
+FEATURES: np.ndarray = np.zeros(84, dtype=np.float32)
+
+
+def test_predict_returns_class_confidence_and_proba():
+    """Test that one call gives class id, confidence and probabilities."""
+    prediction = Classifier(CountingModel()).predict(FEATURES)
+    assert prediction.class_id == 6
+    assert prediction.confidence == 0.7
+    assert len(prediction.proba) == 3
+
+
+def test_predict_runs_model_once():
+    """Test that predict needs a single predict_proba pass."""
+    model = CountingModel()
+    Classifier(model).predict(FEATURES)
+    assert model.calls == 1
+
+
+def test_index_of_accepts_string_and_int_ids():
+    """Test the cached lookup of a class column."""
+    classifier = Classifier(CountingModel())
+    assert classifier.index_of("12") == 2
+    assert classifier.index_of(12) == 2
+
+
+def test_probability_of_target_class():
+    """Test reading the probability of a quiz target class."""
+    classifier = Classifier(CountingModel())
+    prediction = classifier.predict(FEATURES)
+    assert classifier.probability_of(prediction, "0") == 0.2
+
+
+def test_probability_of_uses_the_predicting_model():
+    """Test that a prediction of a swapped-out model keeps its columns."""
+    old = Classifier(CountingModel(), version="1")
+    prediction = old.predict(FEATURES)
+
+    new_model = CountingModel()
+    new_model.classes_ = np.array(["12", "6", "0"])
+    new = Classifier(new_model, version="2")
+
+    assert prediction.model_version == "1"
+    assert new.probability_of(prediction, "0") == 0.2
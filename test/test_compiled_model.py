@@ -0,0 +1,82 @@
+"""Simple tests for the flat-array tree ensemble."""
+
+import numpy as np
+import pytest
+
+from hand_signs_engine.classifier import Classifier
+from hand_signs_engine.compiled_model import (
+    CompiledForest,
+    check_compiled,
+    compile_model,
+)
+
+sklearn_ensemble = pytest.importorskip("sklearn.ensemble")
+sklearn_tree = pytest.importorskip("sklearn.tree")
+
+
+def training_data(n_samples=400, n_classes=5, seed=0):
+    """Random 84-value features with string class ids like the real model."""
+    rng = np.random.default_rng(seed)
+    x_train = rng.random((n_samples, 84), dtype=np.float32)
+    y_train = rng.integers(0, n_classes, n_samples).astype(str)
+    return x_train, y_train
+
+
+def test_forest_probabilities_match():
+    """Test that a random forest and its compiled form agree."""
+    x_train, y_train = training_data()
+    model = sklearn_ensemble.RandomForestClassifier(
+        n_estimators=20, random_state=0
+    ).fit(x_train, y_train)
+    compiled = CompiledForest.from_estimator(model)
+
+    x = np.random.default_rng(1).random((300, 84), dtype=np.float32)
+    np.testing.assert_allclose(
+        compiled.predict_proba(x), model.predict_proba(x), atol=1e-6
+    )
+    # Training rows lie exactly on split thresholds
+    np.testing.assert_allclose(
+        compiled.predict_proba(x_train), model.predict_proba(x_train), atol=1e-6
+    )
+    assert (compiled.predict(x) == model.predict(x)).all()
+    assert check_compiled(model, compiled) <= 1e-6
+
+
+def test_single_row_and_classifier():
+    """Test that a single vector works through the Classifier adapter."""
+    x_train, y_train = training_data()
+    model = sklearn_ensemble.ExtraTreesClassifier(n_estimators=10, random_state=0).fit(
+        x_train, y_train
+    )
+    row = x_train[3]
+
+    expected = Classifier(model).predict(row)
+    prediction = Classifier(compile_model(model)).predict(row)
+
+    assert prediction.class_id == expected.class_id
+    assert prediction.confidence == pytest.approx(expected.confidence, abs=1e-6)
+
+
+def test_decision_tree():
+    """Test that a single decision tree compiles too."""
+    x_train, y_train = training_data()
+    model = sklearn_tree.DecisionTreeClassifier(max_depth=6, random_state=0).fit(
+        x_train, y_train
+    )
+    compiled = CompiledForest.from_estimator(model)
+
+    np.testing.assert_allclose(
+        compiled.predict_proba(x_train), model.predict_proba(x_train), atol=1e-6
+    )
+    assert compiled.classes_.tolist() == model.classes_.tolist()
+
+
+def test_unsupported_model_is_kept():
+    """Test that models other than tree classifiers are used as they are."""
+    x_train, y_train = training_data()
+    model = sklearn_ensemble.GradientBoostingClassifier(n_estimators=2).fit(
+        x_train, y_train
+    )
+    with pytest.raises(TypeError):
+        CompiledForest.from_estimator(model)
+    assert compile_model(model) is model
@@ -0,0 +1,98 @@
+"""Simple tests for the persistent embedding cache."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from llama_index.core import Settings  # noqa: E402
+from llama_index.core.embeddings import MockEmbedding  # noqa: E402
+from pydantic import PrivateAttr  # noqa: E402
+
+from rag.embedding_cache import (  # noqa: E402
+    CachedEmbedding,
+    EmbeddingStore,
+    embedding_cache_stats,
+    text_key,
+)
+
+
+class CountingEmbedding(MockEmbedding):
+    """Mock embedding that records which texts it had to embed."""
+
+    _embedded: list = PrivateAttr(default_factory=list)
+
+    def __init__(self):
+        super().__init__(embed_dim=4, model_name="counting")
+
+    def _get_text_embeddings(self, texts):
+        self._embedded.extend(texts)
+        return [[float(len(text)), 1.0, 2.0, 3.0] for text in texts]
+
+    def _get_query_embedding(self, query):
+        self._embedded.append(query)
+        return [float(len(query)), 0.0, 0.0, 0.0]
+
+
+def test_store_persists_vectors_across_instances(tmp_path):
+    """Test that a new store maps the rows an earlier one appended."""
+    keys = [text_key("text", "Hammer"), text_key("text", "Feile")]
+    EmbeddingStore(tmp_path).add(keys, np.eye(2, 3, dtype=np.float32))
+
+    store = EmbeddingStore(tmp_path)
+    found = store.lookup([keys[1], text_key("text", "Zange")])
+
+    assert len(store) == 2
+    np.testing.assert_array_equal(found[0], [0.0, 1.0, 0.0])
+    assert found[1] is None
+
+
+def test_store_cuts_rows_without_key(tmp_path):
+    """Test that a vector written without its key does not shift later rows."""
+    store = EmbeddingStore(tmp_path)
+    store.add([text_key("text", "a")], np.ones((1, 2), dtype=np.float32))
+    with open(tmp_path / "vectors.f32", "ab") as vectors_file:
+        vectors_file.write(np.full(2, 9.0, dtype=np.float32).tobytes())
+
+    store = EmbeddingStore(tmp_path)
+    store.add([text_key("text", "b")], np.full((1, 2), 2.0, dtype=np.float32))
+
+    np.testing.assert_array_equal(store.lookup([text_key("text", "b")])[0], [2, 2])
+
+
+def test_cached_embedding_only_embeds_misses(tmp_path):
+    """Test that repeated texts and queries come from the cache."""
+    model = CountingEmbedding()
+    embedding = CachedEmbedding(model, cache_folder=tmp_path)
+
+    first = embedding.get_text_embedding_batch(["Hammer", "Feile"])
+    second = embedding.get_text_embedding_batch(["Feile", "Zange", "Hammer"])
+    embedding.get_query_embedding("Was ist ein Hammer?")
+    embedding.get_query_embedding("Was ist ein Hammer?")
+
+    assert model._embedded == ["Hammer", "Feile", "Zange", "Was ist ein Hammer?"]
+    assert second[0] == first[1]
+    assert second[2] == first[0]
+    stats = embedding.stats()
+    assert (stats["hits"], stats["misses"]) == (3, 4)
+    assert stats["hit_rate"] == pytest.approx(3 / 7)
+
+    reloaded = CachedEmbedding(CountingEmbedding(), cache_folder=tmp_path)
+    assert reloaded.get_text_embedding("Zange") == second[1]
+    assert reloaded.stats()["misses"] == 0
+
+
+def test_stats_of_the_configured_cache(tmp_path):
+    """Test that the hit rate of the model in Settings is exposed."""
+    previous = Settings._embed_model
+    try:
+        Settings.embed_model = MockEmbedding(embed_dim=4)
+        assert embedding_cache_stats() is None
+
+        embedding = CachedEmbedding(CountingEmbedding(), cache_folder=tmp_path)
+        Settings.embed_model = embedding
+        embedding.get_text_embedding("Hammer")
+        embedding.get_text_embedding("Hammer")
+        assert embedding_cache_stats()["hits"] == 1
+    finally:
+        Settings._embed_model = previous
@@ -0,0 +1,73 @@
+"""Simple tests for the shared landmark feature extraction."""
+
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from hand_signs_engine.features import (
+    FEATURE_LENGTH,
+    create_feature_buffer,
+    extract_features,
+)
+
+
+def make_hand(seed):
+    """Build a hand with 21 random landmarks like MediaPipe returns them."""
+    rng = random.Random(seed)
+    return SimpleNamespace(
+        landmark=[
+            SimpleNamespace(x=rng.random(), y=rng.random(), z=0.0) for _ in range(21)
+        ]
+    )
+
+
+def legacy_features(hands):
+    """Reference implementation: the original two-pass list version."""
+    x_ = [lm.x for hand in hands for lm in hand.landmark]
+    y_ = [lm.y for hand in hands for lm in hand.landmark]
+    data_aux = []
+    for hand in hands:
+        for lm in hand.landmark:
+            data_aux.append(lm.x - min(x_))
+            data_aux.append(lm.y - min(y_))
+    return data_aux + [0.0] * (84 - len(data_aux))
+
+
+def test_feature_vector_has_84_values():
+    """Test that the feature vector length matches the model input."""
+    features, _ = extract_features([make_hand(1)])
+    assert features.shape == (FEATURE_LENGTH,)
+    assert features.dtype == np.float32
+
+
+def test_two_hands_match_legacy_features():
+    """Test that two hands give the same values as the old loops."""
+    hands = [make_hand(1), make_hand(2)]
+    features, _ = extract_features(hands)
+    assert np.allclose(features, legacy_features(hands), atol=1e-6)
+
+
+def test_one_hand_is_zero_padded():
+    """Test that a single hand leaves the second hand slots at zero."""
+    hands = [make_hand(3)]
+    features, _ = extract_features(hands)
+    assert np.allclose(features, legacy_features(hands), atol=1e-6)
+    assert not features[42:].any()
+
+
+def test_origin_is_minimum_of_all_hands():
+    """Test that the returned origin is the minimum x and y."""
+    hands = [make_hand(4), make_hand(5)]
+    _, (x_min, y_min) = extract_features(hands)
+    assert np.isclose(x_min, min(lm.x for h in hands for lm in h.landmark))
+    assert np.isclose(y_min, min(lm.y for h in hands for lm in h.landmark))
+
+
+def test_buffer_is_reused_between_frames():
+    """Test that a second hand from an earlier frame does not leak."""
+    buffer = create_feature_buffer()
+    extract_features([make_hand(6), make_hand(7)], buffer)
+    features, _ = extract_features([make_hand(8)], buffer)
+    assert np.shares_memory(features, buffer)
+    assert not features[42:].any()
@@ -0,0 +1,42 @@
+"""Simple tests for the reused frame buffer."""
+
+import numpy as np
+
+from hand_signs_engine.frame_buffer import FrameBuffer, reuse_buffer
+from hand_signs_engine.roi import RoiTracker
+
+
+def test_mirror_flips_into_reused_buffer():
+    """Test that frames are mirrored into the same buffer every time."""
+    frame_buffer = FrameBuffer()
+    image = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+
+    first = frame_buffer.mirror(image)
+    np.testing.assert_array_equal(first, image[:, ::-1])
+    second = frame_buffer.mirror(image)
+    assert second is first
+    assert frame_buffer.allocations == 1
+
+
+def test_resolution_change_reallocates():
+    """Test that a new frame size gets a new buffer."""
+    frame_buffer = FrameBuffer()
+    frame_buffer.mirror(np.zeros((2, 3, 3), dtype=np.uint8))
+    frame_buffer.mirror(np.zeros((4, 6, 3), dtype=np.uint8))
+    assert frame_buffer.image.shape == (4, 6, 3)
+    assert frame_buffer.allocations == 2
+
+
+def test_reuse_buffer_checks_shape_and_dtype():
+    """Test that only matching buffers are reused."""
+    buffer = np.empty((2, 2), dtype=np.uint8)
+    assert reuse_buffer(buffer, (2, 2)) is buffer
+    assert reuse_buffer(buffer, (2, 3)) is not buffer
+    assert reuse_buffer(buffer, (2, 2), np.float32) is not buffer
+
+
+def test_downscale_reuses_working_buffer():
+    """Test that the downscaled detection image is written in place."""
+    tracker = RoiTracker(working_width=320)
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    assert tracker.downscale(image) is tracker.downscale(image)
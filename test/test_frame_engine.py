@@ -0,0 +1,151 @@
+"""Simple tests for the frame callback of the engine, without MediaPipe."""
+
+import gc
+from fractions import Fraction
+from types import SimpleNamespace
+
+import av
+import numpy as np
+
+from hand_signs_engine.backpressure import LEVEL_NAMES
+from hand_signs_engine.classifier import Classifier
+from hand_signs_engine.frame_engine import create_frame_callback
+from hand_signs_engine.inference_worker import InferenceWorker
+from hand_signs_engine.metrics import FrameMetrics
+from hand_signs_engine.policies import FreeRecognitionPolicy
+from hand_signs_engine.resources import HandsPool
+from hand_signs_engine.roi import RoiTracker
+from hand_signs_engine.scheduler import AdaptiveScheduler
+from hand_signs_recognition.prediction_state import PredictionState
+
+HEIGHT, WIDTH = 480, 640
+HAND = SimpleNamespace(
+    landmark=[SimpleNamespace(x=0.4 + i * 0.01, y=0.35 + i * 0.015) for i in range(21)]
+)
+
+
+class StubHands:
+    """Detector that finds the same hand while present is True."""
+
+    present = True
+
+    def process(self, image):
+        return SimpleNamespace(
+            multi_hand_landmarks=[HAND] if StubHands.present else None
+        )
+
+
+class FixedModel:
+    """Classifier that always returns the same probabilities."""
+
+    classes_ = np.array(["0", "1", "2"])
+
+    def predict_proba(self, x_input):
+        return np.tile([0.1, 0.1, 0.8], (len(x_input), 1))
+
+
+def make_frame(index, image=None):
+    if image is None:
+        image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    frame = av.VideoFrame.from_ndarray(image, format="rgb24")
+    frame.pts = index
+    frame.time_base = Fraction(1, 30)
+    return frame
+
+
+def make_callback(state, hands=None):
+    config = SimpleNamespace(
+        hands=hands or HandsPool(StubHands, size=1),
+        classifier=Classifier(FixedModel()),
+        labels_dict={0: "Zange", 1: "Lehrer", 2: "Hammer"},
+    )
+    worker = InferenceWorker()
+    callback = create_frame_callback(
+        config,
+        state,
+        FreeRecognitionPolicy(),
+        worker=worker,
+        scheduler=AdaptiveScheduler(),
+        # The hand is centered, so the region always covers the whole frame
+        # and the landmarks of the stub stay full-frame coordinates
+        roi_tracker=RoiTracker(min_size=1.0),
+        metrics=FrameMetrics(),
+    )
+    return callback, worker
+
+
+def test_still_hand_is_predicted_once_and_reused():
+    """Test the prediction, counters and output frames of a still hand."""
+    StubHands.present = True
+    state = PredictionState()
+    callback, worker = make_callback(state)
+    for index in range(30):
+        out = callback(make_frame(index))
+        assert worker.wait_idle(timeout=2)
+        assert out.to_ndarray(format="rgb24").shape == (HEIGHT, WIDTH, 3)
+
+    assert state.get_prediction() == "Hammer (0.80)"
+    metrics = callback.metrics
+    assert metrics.frames_in == metrics.frames_out == 30
+    assert metrics.errors == 0
+    assert metrics.no_hand == 0
+    assert metrics.inferences == 1
+    assert metrics.reused > 0
+    assert callback.scheduler.stats()["inferences"] == 1
+
+
+def test_hand_leaving_resets_prediction():
+    """Test that a frame without a hand shows the no-hand message."""
+    StubHands.present = True
+    state = PredictionState()
+    callback, worker = make_callback(state)
+    for index in range(3):
+        callback(make_frame(index))
+        assert worker.wait_idle(timeout=2)
+
+    StubHands.present = False
+    out = callback(make_frame(3))
+    assert out.to_ndarray(format="rgb24").shape == (HEIGHT, WIDTH, 3)
+    assert state.get_prediction() == "No hand detected"
+    assert callback.metrics.no_hand == 1
+    assert callback.scheduler.last_prediction is None
+
+
+def test_output_is_mirrored_at_every_backpressure_level():
+    """Test that degrading never flips the video back to the camera's view."""
+    StubHands.present = False
+    callback, worker = make_callback(PredictionState())
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    image[:, : WIDTH // 4] = 255
+    mirrored = image[:, ::-1]
+    for level in range(len(LEVEL_NAMES)):
+        # Two frames, at pass_through one of them skips the detection
+        for index in range(2):
+            callback.backpressure.level = level
+            out = callback(make_frame(index, image))
+            np.testing.assert_array_equal(out.to_ndarray(format="rgb24"), mirrored)
+    assert callback.metrics.passed_through > 0
+    assert callback.metrics.errors == 0
+
+
+def test_closed_stream_returns_its_detector():
+    """Test that a stream keeps one detector and returns it when closed."""
+    StubHands.present = True
+    pool = HandsPool(StubHands, size=1)
+    callback, worker = make_callback(PredictionState(), pool)
+    for index in range(3):
+        callback(make_frame(index))
+        assert worker.wait_idle(timeout=2)
+    assert pool.stats()["pinned"] == 1
+
+    # A second stream gets no detector while the first one is open
+    other, _ = make_callback(PredictionState(), pool)
+    other(make_frame(0))
+    assert other.metrics.no_detector == 1
+
+    del callback
+    gc.collect()
+    assert pool.stats()["pinned"] == 0
+    other(make_frame(1))
+    assert other.metrics.no_detector == 1
+    assert pool.stats()["pinned"] == 1
@@ -0,0 +1,117 @@
+"""Simple tests for the batching inference worker."""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+from hand_signs_engine.classifier import Classifier
+from hand_signs_engine.inference_worker import InferenceWorker
+from hand_signs_engine.policies import PredictionPolicy
+
+
+class BatchModel:
+    """Model that records the batch sizes it was called with."""
+
+    def __init__(self, block=None):
+        self.classes_ = np.array(["0", "1"])
+        self.batch_sizes = []
+        self.block = block
+
+    def predict_proba(self, x_input):
+        if self.block is not None:
+            self.block.wait(timeout=2)
+            self.block = None
+        self.batch_sizes.append(len(x_input))
+        return np.tile([0.3, 0.7], (len(x_input), 1))
+
+
+class RecordingPolicy(PredictionPolicy):
+    """Policy that stores the class id and the thread it ran on."""
+
+    def on_prediction(self, config, prediction_state, prediction):
+        prediction_state.results.append(prediction.class_id)
+        prediction_state.threads.append(threading.current_thread())
+
+
+def make_session():
+    return SimpleNamespace(results=[], threads=[])
+
+
+def make_config(model):
+    return SimpleNamespace(classifier=Classifier(model))
+
+
+def features(value):
+    return np.full(84, value, dtype=np.float32)
+
+
+def test_prediction_runs_on_worker_thread():
+    """Test that the policy is applied outside the calling thread."""
+    worker = InferenceWorker()
+    state = make_session()
+    worker.submit("a", features(0), make_config(BatchModel()), state, RecordingPolicy())
+    assert worker.wait_idle(timeout=2)
+    assert state.results == [1]
+    assert state.threads[0] is not threading.current_thread()
+
+
+def test_sessions_are_batched_into_one_model_call():
+    """Test that pending sessions share one predict_proba call."""
+    release = threading.Event()
+    model = BatchModel(block=release)
+    config = make_config(model)
+    worker = InferenceWorker(max_wait_ms=0)
+    policy = RecordingPolicy()
+
+    worker.submit("first", features(0), config, make_session(), policy)
+    while worker.stats()["queue_depth"]:
+        pass
+    sessions = [make_session() for _ in range(3)]
+    for i, state in enumerate(sessions):
+        worker.submit(i, features(i), config, state, policy)
+    release.set()
+
+    assert worker.wait_idle(timeout=2)
+    assert model.batch_sizes == [1, 3]
+    assert all(state.results == [1] for state in sessions)
+    assert worker.stats()["max_batch_size"] == 3
+
+
+def test_latest_request_wins_while_worker_is_busy():
+    """Test that pending requests of a session are replaced, not queued."""
+    release = threading.Event()
+    config = make_config(BatchModel(block=release))
+    worker = InferenceWorker(max_wait_ms=0)
+    policy = RecordingPolicy()
+    state = make_session()
+
+    worker.submit("other", features(0), config, make_session(), policy)
+    while worker.stats()["queue_depth"]:
+        pass
+    for i in range(3):
+        worker.submit("session", features(i), config, state, policy)
+    release.set()
+
+    assert worker.wait_idle(timeout=2)
+    assert state.results == [1]
+    assert worker.stats()["dropped"] == 2
+
+
+def test_discard_drops_pending_request():
+    """Test that discard removes a request that has not started yet."""
+    release = threading.Event()
+    config = make_config(BatchModel(block=release))
+    worker = InferenceWorker(max_wait_ms=0)
+    policy = RecordingPolicy()
+    state = make_session()
+
+    worker.submit("other", features(0), config, make_session(), policy)
+    while worker.stats()["queue_depth"]:
+        pass
+    worker.submit("session", features(1), config, state, policy)
+    worker.discard("session")
+    release.set()
+
+    assert worker.wait_idle(timeout=2)
+    assert state.results == []
@@ -0,0 +1,139 @@
+"""Simple tests for the incremental index builds of the RAG documents."""
+
+import pytest
+
+pytest.importorskip("llama_index.embeddings.huggingface")
+pytest.importorskip("llama_index.llms.groq")
+
+from llama_index.core import Settings  # noqa: E402
+from llama_index.core.embeddings import MockEmbedding  # noqa: E402
+
+from rag.ingestion import (  # noqa: E402
+    MANIFEST_FILE,
+    diff_documents,
+    load_manifest,
+    parse_files,
+    scan_documents,
+    update_index,
+)
+from rag.numpy_vector_store import store_directory  # noqa: E402
+
+
+@pytest.fixture
+def documents(tmp_path):
+    directory = tmp_path / "documents"
+    directory.mkdir()
+    (directory / "hammer.txt").write_text("Der Hammer schlägt Nägel ein.")
+    (directory / "feile.txt").write_text("Die Feile glättet Kanten.")
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def offline_settings():
+    """Embed without downloading the sentence transformer."""
+    Settings.embed_model = MockEmbedding(embed_dim=8)
+
+
+def test_scan_reuses_hash_of_unmodified_files(documents):
+    """Test that unchanged size and mtime keep the previous hash."""
+    first = scan_documents(documents)
+    first["hammer.txt"]["sha256"] = "cached"
+
+    second = scan_documents(documents, first)
+
+    assert second["hammer.txt"]["sha256"] == "cached"
+    assert second["feile.txt"] == first["feile.txt"]
+
+
+def test_diff_finds_added_changed_and_removed(documents):
+    """Test the comparison of two scans by content hash."""
+    previous = scan_documents(documents)
+    (documents / "hammer.txt").write_text("Der Hammer ist ein Werkzeug.")
+    (documents / "feile.txt").unlink()
+    (documents / "zange.txt").write_text("Die Zange greift.")
+
+    changes = diff_documents(previous, scan_documents(documents))
+
+    assert changes.added == ["zange.txt"]
+    assert changes.changed == ["hammer.txt"]
+    assert changes.removed == ["feile.txt"]
+
+
+def test_parse_files_in_pool_keeps_order(documents):
+    """Test that the process pool yields the same files in the same order."""
+    paths = ["hammer.txt", "feile.txt"]
+
+    serial = list(parse_files(documents, paths, workers=1))
+    pooled = list(parse_files(documents, paths, workers=2))
+
+    assert [parsed.path for parsed in pooled] == paths
+    assert [[node.text for node in parsed.nodes] for parsed in pooled] == [
+        [node.text for node in parsed.nodes] for parsed in serial
+    ]
+    assert all(parsed.seconds > 0 for parsed in pooled)
+
+
+def test_pool_workers_are_spawned(documents, monkeypatch):
+    """Test that pool workers start fresh instead of forking this process."""
+
+    def forked(*args):
+        raise AssertionError("The worker inherited this process")
+
+    monkeypatch.setattr("rag.ingestion.load_document", forked)
+    pooled = list(parse_files(documents, ["hammer.txt", "feile.txt"], workers=2))
+    assert [parsed.path for parsed in pooled] == ["hammer.txt", "feile.txt"]
+
+
+def test_update_index_only_processes_changes(documents, tmp_path):
+    """Test that a second update embeds only the changed document."""
+    persist_dir = tmp_path / "vector_store"
+    index, changes = update_index(documents, persist_dir)
+    assert changes.added == ["feile.txt", "hammer.txt"]
+    assert load_manifest(persist_dir) is not None
+
+    _, changes = update_index(documents, persist_dir)
+    assert not changes
+
+    (documents / "feile.txt").unlink()
+    (documents / "zange.txt").write_text("Die Zange greift.")
+    index, changes = update_index(documents, persist_dir)
+
+    assert changes.added == ["zange.txt"]
+    assert changes.removed == ["feile.txt"]
+    nodes = index.as_retriever(similarity_top_k=10).retrieve("Werkzeug")
+    files = {node.metadata["file_name"] for node in nodes}
+    assert files == {"hammer.txt", "zange.txt"}
+    manifest = load_manifest(persist_dir)
+    assert (persist_dir / MANIFEST_FILE).exists()
+    assert set(manifest["files"]) == {"hammer.txt", "zange.txt"}
+    assert "parse_seconds" in manifest["files"]["hammer.txt"]
+
+
+def test_update_index_builds_ann_index_for_large_stores(documents, tmp_path):
+    """Test that the IVF index follows the node count of the store."""
+    persist_dir = tmp_path / "vector_store"
+    index, _ = update_index(documents, persist_dir, ann_min_nodes=2)
+    assert index.vector_store.ann_index is not None
+
+    (documents / "feile.txt").unlink()
+    index, _ = update_index(documents, persist_dir, ann_min_nodes=2)
+
+    assert index.vector_store.ann_index is None
+    assert index.as_retriever().retrieve("Hammer")[0].metadata["file_name"] == (
+        "hammer.txt"
+    )
+
+
+def test_update_index_rebuilds_a_missing_store(documents, tmp_path):
+    """Test that a manifest without its store files leads to a full rebuild."""
+    persist_dir = tmp_path / "vector_store"
+    update_index(documents, persist_dir)
+    for path in store_directory(persist_dir).iterdir():
+        path.unlink()
+    assert load_manifest(persist_dir) is not None
+
+    index, changes = update_index(documents, persist_dir)
+
+    assert changes.added == ["feile.txt", "hammer.txt"]
+    assert index.vector_store.num_nodes == 2
+    assert load_manifest(persist_dir)["nodes"] == 2
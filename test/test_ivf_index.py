@@ -0,0 +1,66 @@
+"""Simple tests for the IVF index of the RAG retriever."""
+
+import numpy as np
+import pytest
+
+from rag.ivf_index import IVFIndex
+
+
+@pytest.fixture
+def matrix():
+    """Unit vectors in 20 well separated clusters."""
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, 16)).astype(np.float32)
+    vectors = centers[rng.integers(0, 20, 2000)]
+    vectors += 0.1 * rng.standard_normal(vectors.shape).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top(matrix, query, k):
+    return set(np.argsort(-(matrix @ query))[:k])
+
+
+def test_build_puts_every_row_in_one_list(matrix):
+    """Test that the lists partition the rows of the matrix."""
+    index = IVFIndex.build(matrix, n_lists=20)
+
+    assert index.n_lists == 20
+    assert index.offsets[-1] == len(matrix)
+    np.testing.assert_array_equal(np.sort(index.rows), np.arange(len(matrix)))
+
+
+def test_score_finds_exact_neighbours(matrix):
+    """Test that probing a few lists finds the exact top 5 of clustered data."""
+    index = IVFIndex.build(matrix, n_lists=20, n_probe=3)
+
+    for query in matrix[:50]:
+        rows, scores = index.score(matrix, query)
+        found = set(rows[np.argsort(-scores)[:5]])
+        assert found == exact_top(matrix, query, 5)
+        assert len(rows) < len(matrix) / 2
+
+
+def test_score_includes_rows_added_after_build(matrix):
+    """Test that rows appended to the matrix are scored without a rebuild."""
+    index = IVFIndex.build(matrix[:1000], n_lists=10, n_probe=1)
+
+    rows, _ = index.score(matrix, matrix[1500])
+
+    assert set(range(1000, 2000)) <= set(rows)
+
+
+def test_compact_orders_rows_by_list(matrix, tmp_path):
+    """Test that compaction drops rows, assigns new ones and saves in list order."""
+    index = IVFIndex.build(matrix[:1000], n_lists=10)
+    keep = np.arange(0, 2000, 2)
+
+    compacted, order = index.compact(keep, matrix)
+    compacted.save(tmp_path)
+    loaded = IVFIndex.load(tmp_path, n_probe=10)
+
+    np.testing.assert_array_equal(np.sort(order), keep)
+    assert loaded is not None and loaded.contiguous
+    assert loaded.n_rows == len(keep)
+    rows, scores = loaded.score(matrix[order], matrix[0])
+    np.testing.assert_allclose(scores, matrix[order][rows] @ matrix[0], rtol=1e-6)
+    assert IVFIndex.load(tmp_path / "missing") is None
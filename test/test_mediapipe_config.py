@@ -3,6 +3,9 @@ Simple tests for MediaPipeConfig - only basic checks.
 Note: These tests require the actual model file to exist at 'st_components/model.p'
 """
 
+from types import SimpleNamespace
+
+from hand_signs_engine.mediapipe_config import display_labels
 from hand_signs_recognition.mediapipe_config import MediaPipeConfig
 
 
@@ -34,3 +37,11 @@ def test_model_is_loaded():
     """Test that ML model is loaded."""
     config = MediaPipeConfig()
     assert config.model is not None
+
+
+def test_explicit_labels_are_merged_over_model_labels():
+    """Test that classes missing from the explicit labels keep the model's names."""
+    classifier = SimpleNamespace(labels={0: "Zange", 29: "Zirkel"})
+    labels = display_labels(classifier, {0: "Pliers"})
+    assert labels == {0: "Pliers", 29: "Zirkel"}
+    assert display_labels(classifier) == classifier.labels
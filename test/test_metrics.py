@@ -0,0 +1,120 @@
+"""Simple tests for the latency histogram and frame metrics."""
+
+import json
+
+from hand_signs_engine.metrics import (
+    FRAME_STAGES,
+    FrameMetrics,
+    LatencyHistogram,
+    MetricsRegistry,
+)
+
+
+def test_empty_histogram_reports_zero():
+    """Test that percentiles of an empty histogram are 0."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0
+    assert histogram.summary()["count"] == 0
+
+
+def test_percentiles_are_close_to_recorded_values():
+    """Test that percentiles are within one bucket (~19%) of the data."""
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms * 1_000_000)
+
+    assert 50e6 <= histogram.percentile(50) <= 50e6 * 1.19
+    assert 99e6 <= histogram.percentile(99) <= 100e6
+    assert histogram.summary()["max_ms"] == 100
+
+
+def test_merge_adds_counts():
+    """Test that merged histograms report the combined data."""
+    first = LatencyHistogram()
+    second = LatencyHistogram()
+    first.record(1_000_000)
+    second.record(9_000_000)
+    first.merge(second)
+    assert first.count == 2
+    assert first.max_ns == 9_000_000
+    assert first.percentile(100) == 9_000_000
+
+
+def test_frame_metrics_snapshot_has_every_stage():
+    """Test that a snapshot reports all stages, inference and counters."""
+    metrics = FrameMetrics(name="cam")
+    metrics.frames_in += 1
+    metrics.record("detect", 5_000_000)
+    metrics.record_inference(2_000_000)
+
+    snapshot = metrics.snapshot()
+    assert set(snapshot["stages"]) == set(FRAME_STAGES) | {"inference"}
+    assert snapshot["stages"]["detect"]["count"] == 1
+    assert snapshot["counters"]["frames_in"] == 1
+    assert snapshot["counters"]["inferences"] == 1
+
+
+def test_registry_totals_and_json():
+    """Test that the registry sums all streams and dumps valid JSON."""
+    registry = MetricsRegistry()
+    streams = [registry.register(FrameMetrics()) for _ in range(2)]
+    for metrics in streams:
+        metrics.frames_out += 3
+        metrics.record("total", 10_000_000)
+
+    data = json.loads(registry.to_json())
+    assert len(data["sessions"]) == 2
+    assert data["total"]["counters"]["frames_out"] == 6
+    assert data["total"]["stages"]["total"]["count"] == 2
+
+
+def test_registry_forgets_closed_streams():
+    """Test that streams are dropped once their metrics are gone."""
+    registry = MetricsRegistry()
+    registry.register(FrameMetrics())
+    assert registry.sessions() == []
+
+
+def test_registry_keeps_totals_of_closed_streams():
+    """Test that a closed stream's counters and histograms stay in the totals."""
+    registry = MetricsRegistry()
+    live = registry.register(FrameMetrics())
+    live.frames_in += 1
+    closed = registry.register(FrameMetrics())
+    closed.frames_in += 2
+    closed.record("detect", 5_000_000)
+    closed.record_inference(1_000_000, "1")
+    del closed
+
+    total = registry.snapshot()["total"]
+    assert len(registry.sessions()) == 1
+    assert total["closed_sessions"] == 1
+    assert total["counters"]["frames_in"] == 3
+    assert total["stages"]["detect"]["count"] == 1
+    assert total["models"] == {"1": 1}
+
+
+def test_registry_folds_closed_streams_without_snapshot():
+    """Test that closed streams do not pile up when no snapshot is taken."""
+    registry = MetricsRegistry()
+    for _ in range(1000):
+        metrics = registry.register(FrameMetrics())
+        metrics.frames_in += 1
+        del metrics
+    assert len(registry._closing) <= 1
+    total = registry.snapshot()["total"]
+    assert total["closed_sessions"] == 1000
+    assert total["counters"]["frames_in"] == 1000
+
+
+def test_predictions_are_counted_per_model_version():
+    """Test that the registry reports which model made the predictions."""
+    registry = MetricsRegistry()
+    streams = [registry.register(FrameMetrics()) for _ in range(2)]
+    streams[0].record_inference(1_000_000, "1")
+    streams[1].record_inference(1_000_000, "2")
+    streams[1].record_inference(1_000_000)
+
+    total = registry.snapshot()["total"]
+    assert total["models"] == {"1": 1, "2": 1, "unversioned": 1}
+    assert total["counters"]["inferences"] == 3
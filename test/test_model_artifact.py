@@ -0,0 +1,70 @@
+"""Simple tests for the memory-mapped model artifact."""
+
+import json
+
+import numpy as np
+import pytest
+
+from hand_signs_engine.classifier import Classifier
+from hand_signs_engine.model_artifact import (
+    METADATA_FILE,
+    is_artifact,
+    load_artifact,
+    save_artifact,
+)
+
+sklearn_ensemble = pytest.importorskip("sklearn.ensemble")
+
+LABELS = {0: "Zange", 1: "Lehrer", 2: "Hammer"}
+
+
+def fitted_forest(seed=0):
+    """Small random forest with string class ids like the real model."""
+    rng = np.random.default_rng(seed)
+    x_train = rng.random((200, 84), dtype=np.float32)
+    y_train = rng.integers(0, 3, 200).astype(str)
+    model = sklearn_ensemble.RandomForestClassifier(n_estimators=5, random_state=0)
+    return model.fit(x_train, y_train), x_train
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    """Test that a saved artifact loads mapped and predicts the same."""
+    model, x_train = fitted_forest()
+    directory = tmp_path / "model"
+    save_artifact(directory, model, LABELS, version="7")
+
+    artifact = load_artifact(directory)
+
+    assert is_artifact(directory)
+    assert artifact.version == "7"
+    assert artifact.labels == LABELS
+    assert artifact.feature_length == 84
+    assert not artifact.model.values.flags.writeable
+    np.testing.assert_allclose(
+        artifact.model.predict_proba(x_train), model.predict_proba(x_train), atol=1e-6
+    )
+    classifier = Classifier(artifact.model, artifact.labels, artifact.version)
+    assert classifier.feature_length == 84
+
+
+def test_save_replaces_previous_version(tmp_path):
+    """Test that saving again swaps in the new artifact."""
+    directory = tmp_path / "model"
+    save_artifact(directory, fitted_forest(0)[0], LABELS, version="1")
+    save_artifact(directory, fitted_forest(1)[0], LABELS, version="2")
+
+    assert load_artifact(directory).version == "2"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["model"]
+
+
+def test_unknown_format_version_is_rejected(tmp_path):
+    """Test that artifacts of another format version are not loaded."""
+    directory = tmp_path / "model"
+    save_artifact(directory, fitted_forest()[0], LABELS)
+    metadata_path = directory / METADATA_FILE
+    metadata = json.loads(metadata_path.read_text())
+    metadata["format_version"] = 99
+    metadata_path.write_text(json.dumps(metadata))
+
+    with pytest.raises(ValueError):
+        load_artifact(directory)
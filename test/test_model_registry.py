@@ -0,0 +1,93 @@
+"""Simple tests for swapping model versions at runtime."""
+
+import numpy as np
+import pytest
+
+from hand_signs_engine.classifier import Classifier
+from hand_signs_engine.features import FEATURE_SHAPE
+from hand_signs_engine.model_artifact import load_artifact, save_artifact
+from hand_signs_engine.model_registry import ModelRegistry
+from hand_signs_engine.recording import LandmarkRecording, normalize_landmarks
+from hand_signs_engine.resources import ResourceManager
+
+sklearn_ensemble = pytest.importorskip("sklearn.ensemble")
+
+LABELS = {0: "Zange", 1: "Lehrer", 2: "Hammer"}
+PROTOTYPES = np.random.default_rng(0).uniform(0.2, 0.5, (3, 21, 2))
+
+
+def recording(n_per_class=30, seed=1):
+    """Labelled one-hand frames around three class prototypes."""
+    rng = np.random.default_rng(seed)
+    coords = np.zeros((3 * n_per_class,) + FEATURE_SHAPE, dtype=np.float32)
+    labels = np.repeat(np.arange(3), n_per_class).astype(np.int16)
+    coords[:, 0] = PROTOTYPES[labels] + rng.normal(0, 0.01, (len(labels), 21, 2))
+    n = len(labels)
+    return LandmarkRecording(
+        coords.reshape(n, -1), np.ones(n, np.uint8), labels, np.arange(n) / 30
+    )
+
+
+def train(shuffle=False):
+    """Random forest on the prototypes, useless if the labels are shuffled."""
+    landmarks, hands, labels, _ = recording(seed=2)
+    if shuffle:
+        labels = np.random.default_rng(3).permutation(labels)
+    model = sklearn_ensemble.RandomForestClassifier(n_estimators=10, random_state=0)
+    return model.fit(normalize_landmarks(landmarks, hands), labels.astype(str))
+
+
+def registry_for(directory, **kwargs):
+    """Registry over directory with version 1 already serving."""
+    save_artifact(directory / "v1", train(), LABELS, version="1")
+
+    def loader():
+        artifact = load_artifact(directory / "v1")
+        return Classifier(artifact.model, artifact.labels, artifact.version)
+
+    resources = ResourceManager(loader, object, 1)
+    resources.classifier
+    registry = ModelRegistry(resources, directory, fixtures=recording(), **kwargs)
+    registry._current = registry.scan()
+    return resources, registry
+
+
+def test_new_version_is_swapped_in(tmp_path):
+    """Test that a valid new artifact replaces the serving classifier."""
+    resources, registry = registry_for(tmp_path)
+    in_flight = resources.classifier
+    assert not registry.check()
+
+    save_artifact(tmp_path / "v2", train(), LABELS, version="2")
+    assert registry.check()
+
+    assert resources.model_version == "2"
+    # A frame that already got the old classifier finishes on it
+    assert in_flight.predict(np.zeros(84, np.float32)).model_version == "1"
+    event = registry.stats()["events"][-1]
+    assert event["event"] == "swapped"
+    assert event["previous_version"] == "1"
+    assert event["accuracy"] >= 0.8
+    assert event["load_seconds"] >= 0 and event["swap_seconds"] >= 0
+
+
+def test_inaccurate_version_is_rejected(tmp_path):
+    """Test that a version failing the fixtures does not go live."""
+    resources, registry = registry_for(tmp_path, min_accuracy=0.9)
+    save_artifact(tmp_path / "v2", train(shuffle=True), LABELS, version="2")
+
+    assert not registry.check()
+    assert resources.model_version == "1"
+    assert registry.stats()["rejected"] == 1
+    # The same files are not tried again
+    assert not registry.check()
+    assert registry.stats()["rejected"] == 1
+
+
+def test_version_without_labels_is_rejected(tmp_path):
+    """Test that every class of a new version needs a label."""
+    resources, registry = registry_for(tmp_path)
+    save_artifact(tmp_path / "v2", train(), {0: "Zange"}, version="2")
+
+    assert not registry.check()
+    assert resources.model_version == "1"
@@ -0,0 +1,51 @@
+"""Simple tests for the motion gate."""
+
+import numpy as np
+import pytest
+
+from hand_signs_engine.motion import MotionGate
+
+
+def features(value):
+    return np.full(84, value, dtype=np.float32)
+
+
+def test_first_frame_is_never_still():
+    """Test that the gate never skips without an earlier prediction."""
+    assert not MotionGate().is_still(features(0.5))
+
+
+def test_camera_noise_reuses_prediction():
+    """Test that changes below epsilon count as a still hand."""
+    gate = MotionGate(epsilon=0.01)
+    gate.mark_predicted(features(0.5))
+    assert gate.is_still(features(0.505))
+    assert gate.stats()["skipped"] == 1
+
+
+def test_movement_triggers_prediction():
+    """Test that changes above epsilon are predicted again."""
+    gate = MotionGate(epsilon=0.01)
+    gate.mark_predicted(features(0.5))
+    assert not gate.is_still(features(0.55))
+
+
+def test_l2_norm_sums_all_coordinates():
+    """Test that the l2 norm sees many small changes."""
+    gate = MotionGate(epsilon=0.05, norm="l2")
+    gate.mark_predicted(features(0.5))
+    # 0.009 per coordinate is still for "max" but sqrt(84) * 0.009 > 0.05
+    assert not gate.is_still(features(0.509))
+
+
+def test_update_returns_frame_to_frame_motion():
+    """Test the motion value passed to the scheduler."""
+    gate = MotionGate()
+    gate.update(features(0.2))
+    assert gate.update(features(0.3)) == pytest.approx(0.1)
+
+
+def test_unknown_norm_is_rejected():
+    """Test that only max and l2 are accepted."""
+    with pytest.raises(ValueError):
+        MotionGate(norm="l1")
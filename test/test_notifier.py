@@ -0,0 +1,76 @@
+"""Simple tests for the change notification of the prediction states."""
+
+import threading
+
+import numpy as np
+
+from hand_signs_engine.notifier import ChangeNotifier
+from hand_signs_recognition.prediction_state import PredictionState
+from hand_signs_recognition_for_quiz.prediction_state import (
+    PredictionState as QuizPredictionState,
+)
+from hand_signs_recognition_for_quiz.prediction_state_quiz import PredictionStateQuiz
+
+CLASS_IDS = np.array([0, 6, 12])
+
+
+def test_wait_returns_current_version_at_once():
+    """Test that waiting without a version does not block."""
+    notifier = ChangeNotifier(threading.Lock())
+    assert notifier.wait() == 0
+
+
+def test_wait_times_out_without_change():
+    """Test that the same version comes back after the timeout."""
+    notifier = ChangeNotifier(threading.Lock())
+    assert notifier.wait(0, timeout=0.01) == 0
+
+
+def test_notify_wakes_waiting_thread():
+    """Test that a change from another thread ends the wait."""
+    lock = threading.Lock()
+    notifier = ChangeNotifier(lock)
+    versions = []
+    waiter = threading.Thread(target=lambda: versions.append(notifier.wait(0, 5.0)))
+    waiter.start()
+    with lock:
+        notifier.notify()
+    waiter.join(timeout=5.0)
+
+    assert versions == [1]
+
+
+def test_stable_class_change_notifies():
+    """Test that only a new stable class, not every prediction, notifies."""
+    state = PredictionState()
+    version = state.wait_for_change()
+    proba = np.array([0.0, 0.9, 0.1], dtype=np.float32)
+
+    state.add_prediction(CLASS_IDS, proba)
+    assert state.wait_for_change(version, timeout=0.01) == version
+
+    while not state.add_prediction(CLASS_IDS, proba):
+        pass
+    version = state.wait_for_change(version, timeout=0.01)
+    state.add_prediction(CLASS_IDS, proba)
+    assert state.wait_for_change(version, timeout=0.01) == version
+
+    state.reset_smoothing()
+    assert state.wait_for_change(version, timeout=0.01) != version
+
+
+def test_strength_change_notifies():
+    """Test that both quiz states notify only when the strength changes."""
+    quiz_state = QuizPredictionState()
+    version = quiz_state.wait_for_change()
+    quiz_state.set_prediction_strength(0.05)
+    assert quiz_state.wait_for_change(version, timeout=0.01) == version
+    quiz_state.set_prediction_strength(0.8)
+    assert quiz_state.wait_for_change(version, timeout=0.01) != version
+
+    challenge_state = PredictionStateQuiz()
+    version = challenge_state.wait_for_change()
+    challenge_state.decrease_prediction_strength()
+    assert challenge_state.wait_for_change(version, timeout=0.01) == version
+    challenge_state.increase_prediction_strength(0.9)
+    assert challenge_state.wait_for_change(version, timeout=0.01) != version
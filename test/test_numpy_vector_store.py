@@ -0,0 +1,124 @@
+"""Simple tests for the memory-mapped vector store of the RAG index."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from llama_index.core import VectorStoreIndex  # noqa: E402
+from llama_index.core.embeddings import MockEmbedding  # noqa: E402
+from llama_index.core.schema import (  # noqa: E402
+    NodeRelationship,
+    RelatedNodeInfo,
+    TextNode,
+)
+from llama_index.core.vector_stores.types import VectorStoreQuery  # noqa: E402
+
+from rag.numpy_vector_store import NumpyVectorStore  # noqa: E402
+
+
+def make_node(text, doc_id, embedding):
+    node = TextNode(text=text, embedding=embedding, metadata={"file_name": doc_id})
+    node.relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(node_id=doc_id)
+    return node
+
+
+@pytest.fixture
+def store():
+    store = NumpyVectorStore()
+    store.add(
+        [
+            make_node("Der Hammer schlägt Nägel ein.", "hammer", [1.0, 0.0, 0.0]),
+            make_node("Die Feile glättet Kanten.", "feile", [0.0, 2.0, 0.0]),
+            make_node("Die Zange greift.", "zange", [0.6, 0.8, 0.0]),
+        ]
+    )
+    return store
+
+
+def ranked(store, embedding, top_k=3):
+    result = store.query(
+        VectorStoreQuery(query_embedding=embedding, similarity_top_k=top_k)
+    )
+    return [node.metadata["file_name"] for node in result.nodes], result.similarities
+
+
+def test_query_ranks_by_cosine_similarity(store):
+    """Test that scores ignore the length of the stored vectors."""
+    files, similarities = ranked(store, [0.0, 5.0, 0.0])
+
+    assert files == ["feile", "zange", "hammer"]
+    np.testing.assert_allclose(similarities, [1.0, 0.8, 0.0], atol=1e-6)
+
+
+def test_delete_hides_rows_of_document(store):
+    """Test that deleted documents are no longer returned."""
+    store.delete("feile")
+
+    files, _ = ranked(store, [0.0, 1.0, 0.0])
+
+    assert files == ["zange", "hammer"]
+    assert store.num_nodes == 2
+
+
+def test_persist_compacts_and_maps_rows(store, tmp_path):
+    """Test that a reloaded store returns the same nodes from mapped files."""
+    store.delete("hammer")
+    store.persist(str(tmp_path / "default__vector_store.json"))
+
+    loaded = NumpyVectorStore.from_persist_dir(tmp_path)
+    files, _ = ranked(loaded, [1.0, 0.0, 0.0])
+    result = loaded.query(VectorStoreQuery(query_embedding=[0.0, 1.0, 0.0]))
+
+    assert loaded.num_nodes == 2
+    assert files == ["zange", "feile"]
+    assert result.nodes[0].get_content() == "Die Feile glättet Kanten."
+    assert result.nodes[0].ref_doc_id == "feile"
+    assert not loaded.embeddings().flags.writeable
+
+    loaded.add([make_node("Der Hammer ist zurück.", "hammer", [1.0, 0.0, 0.0])])
+    loaded.persist(str(tmp_path / "default__vector_store.json"))
+    files, _ = ranked(NumpyVectorStore.from_persist_dir(tmp_path), [1.0, 0.0, 0.0])
+    assert files == ["hammer", "zange", "feile"]
+
+
+def test_index_retrieves_from_persisted_store(tmp_path):
+    """Test the reloaded store behind a VectorStoreIndex retriever."""
+    store = NumpyVectorStore()
+    store.add([make_node("Der Hammer schlägt Nägel ein.", "hammer", [1.0] * 8)])
+    store.persist(str(tmp_path / "default__vector_store"))
+
+    index = VectorStoreIndex.from_vector_store(
+        NumpyVectorStore.from_persist_dir(tmp_path),
+        embed_model=MockEmbedding(embed_dim=8),
+    )
+    nodes = index.as_retriever().retrieve("Hammer")
+
+    assert [node.get_content() for node in nodes] == ["Der Hammer schlägt Nägel ein."]
+    assert nodes[0].score == pytest.approx(1.0)
+
+
+def test_ann_index_survives_persist(tmp_path):
+    """Test that a reloaded store with an IVF index finds the nearest node."""
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((300, 8))
+    store = NumpyVectorStore()
+    store.add(
+        [
+            make_node(f"Abschnitt {i}", f"doc-{i // 10}", embedding.tolist())
+            for i, embedding in enumerate(embeddings)
+        ]
+    )
+    store.build_ann_index(n_lists=10, n_probe=10)
+    store.delete("doc-0")
+    store.persist(str(tmp_path / "default__vector_store"))
+
+    loaded = NumpyVectorStore.from_persist_dir(tmp_path, n_probe=10)
+    result = loaded.query(
+        VectorStoreQuery(query_embedding=embeddings[42].tolist(), similarity_top_k=1)
+    )
+
+    assert loaded.ann_index is not None and loaded.ann_index.contiguous
+    assert loaded.ann_index.n_rows == loaded.num_nodes == 290
+    assert result.nodes[0].get_content() == "Abschnitt 42"
+    assert result.similarities[0] == pytest.approx(1.0)
@@ -0,0 +1,130 @@
+"""Simple tests for the prediction policies of the frame engine."""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from hand_signs_engine.classifier import Classifier
+from hand_signs_engine.policies import (
+    ChallengePolicy,
+    FreeRecognitionPolicy,
+    ScoreCadence,
+    TargetStrengthPolicy,
+)
+from hand_signs_recognition.prediction_state import PredictionState
+from hand_signs_recognition_for_quiz.prediction_state import (
+    PredictionState as QuizPredictionState,
+)
+from hand_signs_recognition_for_quiz.prediction_state_quiz import PredictionStateQuiz
+
+
+class FixedModel:
+    """Classifier that always returns the same probabilities."""
+
+    def __init__(self, proba):
+        self.classes_ = np.array(["0", "1", "2"])
+        self.proba = np.array([proba])
+
+    def predict(self, x_input):
+        return self.classes_[self.proba.argmax(axis=1)]
+
+    def predict_proba(self, x_input):
+        return self.proba
+
+
+def make_config(proba):
+    model = FixedModel(proba)
+    return SimpleNamespace(
+        model=model,
+        classifier=Classifier(model),
+        labels_dict={0: "Zange", 1: "Lehrer", 2: "Hammer"},
+    )
+
+
+FEATURES = np.linspace(0, 1, 84, dtype=np.float32)
+
+
+def test_free_recognition_shows_label_with_confidence():
+    """Test that the label and confidence are shown."""
+    state = PredictionState()
+    FreeRecognitionPolicy().predict(make_config([0.1, 0.1, 0.8]), state, FEATURES)
+    assert state.get_prediction() == "Hammer (0.80)"
+
+
+def test_free_recognition_without_confidence():
+    """Test the RAG style label without confidence."""
+    state = PredictionState()
+    policy = FreeRecognitionPolicy(threshold=0.1, show_confidence=False)
+    policy.predict(make_config([0.1, 0.1, 0.8]), state, FEATURES)
+    assert state.get_prediction() == "Hammer"
+
+
+def test_free_recognition_below_threshold_is_unknown():
+    """Test that low confidence gives an unknown gesture."""
+    state = PredictionState()
+    policy = FreeRecognitionPolicy(threshold=0.5)
+    policy.predict(make_config([0.3, 0.3, 0.4]), state, FEATURES)
+    assert state.get_prediction() == "Unknown gesture"
+
+
+def test_target_strength_increases_for_correct_class():
+    """Test that the quiz policy raises strength for the target class."""
+    state = QuizPredictionState()
+    TargetStrengthPolicy("2").predict(make_config([0.1, 0.1, 0.8]), state, FEATURES)
+    assert state.get_prediction() == "Good.."
+    assert state.get_prediction_strength() > 0
+
+
+def test_challenge_rewards_expected_class():
+    """Test that the expected sign increases the challenge strength."""
+    state = PredictionStateQuiz()
+    ChallengePolicy("2").predict(make_config([0.1, 0.1, 0.8]), state, FEATURES)
+    assert state.get_prediction().startswith("Hammer ✅")
+    assert state.get_prediction_strength() > 0
+
+
+def test_challenge_strength_does_not_depend_on_prediction_rate():
+    """Test that the strength rises with time, not with the prediction count."""
+    config = make_config([0.1, 0.1, 0.8])
+    strengths = []
+    for predictions_per_second in (2, 16):
+        now = [0.0]
+        cadence = ScoreCadence(rate=4, clock=lambda: now[0])
+        policy = ChallengePolicy("2", cadence=cadence)
+        state = PredictionStateQuiz()
+        for frame in range(2 * predictions_per_second + 1):
+            now[0] = frame / predictions_per_second
+            policy.predict(config, state, FEATURES)
+        strengths.append(state.get_prediction_strength())
+    assert strengths[0] == strengths[1] > 0
+
+
+def test_challenge_no_hand_decreases_strength():
+    """Test that a missing hand decays the challenge strength."""
+    state = PredictionStateQuiz()
+    state.prediction_strength = 0.5
+    ChallengePolicy("2").on_no_hand(state)
+    assert state.get_prediction() == "Keine Hand erkannt"
+    assert state.get_prediction_strength() < 0.5
+
+
+def test_challenge_no_hand_decays_on_every_frame():
+    """Test that the no-hand decay does not wait for the score cadence."""
+    state = PredictionStateQuiz()
+    state.prediction_strength = 1.0
+    policy = ChallengePolicy("2", cadence=ScoreCadence(clock=lambda: 0.0))
+    for _ in range(10):
+        policy.on_no_hand(state)
+    assert abs(state.get_prediction_strength() - (1.0 - 10 * state.decay_rate)) < 1e-9
+
+
+def test_free_recognition_feeds_smoothing():
+    """Test that accepted and rejected predictions reach the smoothing."""
+    state = PredictionState()
+    policy = FreeRecognitionPolicy()
+    for _ in range(5):
+        policy.predict(make_config([0.1, 0.1, 0.8]), state, FEATURES)
+    assert state.get_stable_prediction().class_id == 2
+
+    policy.on_no_hand(state)
+    assert state.get_stable_prediction() is None
@@ -8,6 +8,7 @@ from llama_index.llms.groq import Groq
 
 from rag.configuration.config_llama import configure_llamaindex
 from rag.configuration.config_llm import get_llm
+from rag.embedding_cache import CachedEmbedding
 
 
 @pytest.fixture
@@ -33,5 +34,6 @@ def test_configure_llamaindex():
     """Test that configure_llamaindex sets the LLM correctly."""
     configure_llamaindex()
     assert isinstance(Settings.llm, Groq)
-    assert isinstance(Settings.embed_model, HuggingFaceEmbedding)
+    assert isinstance(Settings.embed_model, CachedEmbedding)
+    assert isinstance(Settings.embed_model._embed_model, HuggingFaceEmbedding)
     assert isinstance(Settings.transformations[0], SentenceSplitter)
@@ -0,0 +1,100 @@
+"""Simple tests for landmark recordings and the session recorder."""
+
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from hand_signs_engine.features import FEATURE_LENGTH, extract_features
+from hand_signs_engine.recording import (
+    NO_LABEL,
+    LandmarkRecorder,
+    LandmarkRecording,
+    load_recording,
+    normalize_landmarks,
+    save_recording,
+)
+
+
+def make_hand(seed):
+    """Build a hand with 21 random landmarks like MediaPipe returns them."""
+    rng = random.Random(seed)
+    return SimpleNamespace(
+        landmark=[
+            SimpleNamespace(x=rng.random(), y=rng.random(), z=0.0) for _ in range(21)
+        ]
+    )
+
+
+def record_frames(recorder):
+    """Record one frame with two hands, one without and one with a hand."""
+    for hands in ([make_hand(1), make_hand(2)], [], [make_hand(3)]):
+        if hands:
+            features, origin = extract_features(hands)
+            recorder.record(features, origin, len(hands))
+        else:
+            recorder.record_no_hand()
+
+
+def test_normalize_matches_extract_features():
+    """Test that recorded landmarks normalize to the live feature vectors."""
+    recorder = LandmarkRecorder()
+    record_frames(recorder)
+    recording = recorder.recording()
+
+    features = normalize_landmarks(recording.landmarks, recording.hands)
+
+    expected_two, _ = extract_features([make_hand(1), make_hand(2)])
+    expected_one, _ = extract_features([make_hand(3)])
+    assert features.shape == (3, FEATURE_LENGTH)
+    np.testing.assert_allclose(features[0], expected_two, atol=1e-6)
+    assert not features[1].any()
+    np.testing.assert_allclose(features[2], expected_one, atol=1e-6)
+
+
+def test_recorder_grows_and_keeps_labels():
+    """Test that the recorder grows past its capacity and stores the label."""
+    recorder = LandmarkRecorder(label=6, capacity=2)
+    record_frames(recorder)
+    recorder.label = NO_LABEL
+    recorder.record_no_hand(timestamp=12.5)
+
+    recording = recorder.recording()
+    assert recorder.frames == 4
+    assert recording.hands.tolist() == [2, 0, 1, 0]
+    assert recording.labels.tolist() == [6, 6, 6, NO_LABEL]
+    assert recording.timestamps[-1] == 12.5
+
+    recorder.reset()
+    assert len(recorder.recording().hands) == 0
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Test that a recording survives the .npz round trip."""
+    recorder = LandmarkRecorder(label=3)
+    record_frames(recorder)
+    path = tmp_path / "session.npz"
+    recorder.save(path)
+
+    loaded = load_recording(path)
+    original = recorder.recording()
+    for name in LandmarkRecording._fields:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(original, name))
+    assert loaded.landmarks.dtype == np.float32
+
+
+def test_load_rejects_wrong_feature_length(tmp_path):
+    """Test that recordings with another feature length are rejected."""
+    path = tmp_path / "broken.npz"
+    save_recording(
+        path,
+        LandmarkRecording(
+            np.zeros((2, 42), np.float32),
+            np.ones(2, np.uint8),
+            np.zeros(2, np.int16),
+            np.zeros(2),
+        ),
+    )
+    with pytest.raises(ValueError):
+        load_recording(path)
@@ -0,0 +1,82 @@
+"""Simple tests for the batched landmark renderer."""
+
+import math
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from hand_signs_engine.features import extract_features
+from hand_signs_engine.renderer import (
+    CONNECTION_PATHS,
+    LANDMARK_GROUPS,
+    LandmarkRenderer,
+)
+
+
+def make_hand(points):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y in points])
+
+
+def grid_hand():
+    # Landmarks far apart on exact pixel positions, so dots do not overlap
+    return make_hand(
+        [(0.125 + 0.1875 * (i % 5), 0.125 + 0.1875 * (i // 5)) for i in range(21)]
+    )
+
+
+def draw_per_call(image, hand):
+    """Reference: one cv2 call per connection and landmark like mp_drawing."""
+    h, w = image.shape[:2]
+    pixels = [
+        (min(math.floor(lm.x * w), w - 1), min(math.floor(lm.y * h), h - 1))
+        for lm in hand.landmark
+    ]
+    for path, color, thickness in CONNECTION_PATHS:
+        for start, end in zip(path, path[1:]):
+            cv2.line(image, pixels[start], pixels[end], color, thickness)
+    for indices, color in LANDMARK_GROUPS:
+        for i in indices:
+            cv2.circle(image, pixels[i], 6, (224, 224, 224), -1)
+            cv2.circle(image, pixels[i], 5, color, -1)
+
+
+def test_matches_per_call_drawing():
+    """Test that batched drawing gives the same pixels as per-call drawing."""
+    hand = grid_hand()
+    expected = np.zeros((480, 640, 3), dtype=np.uint8)
+    draw_per_call(expected, hand)
+
+    image = np.zeros_like(expected)
+    features, origin = extract_features([hand])
+    LandmarkRenderer().draw(image, features, origin, 1)
+    np.testing.assert_array_equal(image, expected)
+
+
+def test_disabled_renderer_draws_nothing():
+    """Test that the overlay-off mode leaves the frame untouched."""
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    features, origin = extract_features([grid_hand()])
+    LandmarkRenderer(enabled=False).draw(image, features, origin, 1)
+    assert not image.any()
+
+
+def test_landmarks_outside_frame_are_skipped():
+    """Test that landmarks outside the frame are not drawn at the border."""
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    hand = make_hand([(0.3 + 0.01 * i, 0.5) for i in range(20)] + [(1.5, 0.5)])
+    features, origin = extract_features([hand])
+    LandmarkRenderer().draw(image, features, origin, 1)
+    assert image.any()
+    assert not image[:, 90:].any()
+
+
+def test_draws_every_detected_hand():
+    """Test that both hands of the feature vector are drawn."""
+    left = make_hand([(0.1 + 0.01 * i, 0.5) for i in range(21)])
+    right = make_hand([(0.7 + 0.01 * i, 0.5) for i in range(21)])
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    features, origin = extract_features([left, right])
+    LandmarkRenderer().draw(image, features, origin, 2)
+    assert image[:, 20:60].any()
+    assert image[:, 140:180].any()
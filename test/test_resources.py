@@ -0,0 +1,108 @@
+"""Simple tests for the shared detector pool and resource manager."""
+
+import threading
+
+import pytest
+
+from hand_signs_engine.resources import HandsPool, ResourceManager
+
+
+class Detector:
+    """Stand-in for mp.solutions.hands.Hands."""
+
+
+def test_pool_creates_at_most_size_detectors():
+    """Test that detectors are created lazily up to the pool size."""
+    pool = HandsPool(Detector, size=2)
+    with pool.checkout() as first, pool.checkout() as second:
+        assert first is not second
+    with pool.checkout():
+        pass
+    assert pool.stats()["created"] == 2
+    assert pool.stats()["in_use"] == 0
+
+
+def test_stream_gets_its_previous_detector():
+    """Test that a stream keeps the detector that tracks its hand."""
+    pool = HandsPool(Detector, size=2)
+    a, b = object(), object()
+    with pool.checkout(a) as detector_a, pool.checkout(b) as detector_b:
+        pass
+    for _ in range(3):
+        with pool.checkout(b) as detector:
+            assert detector is detector_b
+        with pool.checkout(a) as detector:
+            assert detector is detector_a
+
+
+def test_pinned_detector_is_kept_until_release():
+    """Test that no other stream gets a detector that is pinned to a stream."""
+    pool = HandsPool(Detector, size=1)
+    owner = object()
+    detector = pool.pin(owner)
+    assert pool.pin(owner) is detector
+    with pytest.raises(TimeoutError):
+        pool.pin(object(), timeout=0.01)
+
+    pool.release(owner)
+    assert pool.pin(object(), timeout=0.01) is detector
+    assert pool.stats()["pinned"] == 1
+
+
+def test_checkout_waits_for_a_free_detector():
+    """Test that a full pool blocks until a detector is returned."""
+    pool = HandsPool(Detector, size=1)
+    released = threading.Event()
+
+    def hold():
+        with pool.checkout():
+            released.wait(1)
+
+    holder = threading.Thread(target=hold)
+    with pool.checkout():
+        holder.start()
+        while pool.stats()["waits"] == 0:
+            pass
+    released.set()
+    holder.join(1)
+    assert pool.stats()["checkouts"] == 2
+    assert pool.stats()["wait_time"]["count"] == 2
+
+
+def test_checkout_timeout():
+    """Test that waiting for a busy pool can time out."""
+    pool = HandsPool(Detector, size=1)
+    with pool.checkout():
+        with pytest.raises(TimeoutError):
+            with pool.checkout(timeout=0.01):
+                pass
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_failed_detector_creation_frees_the_slot():
+    """Test that a factory error does not shrink the pool."""
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("no GPU")
+        return Detector()
+
+    pool = HandsPool(factory, size=1)
+    with pytest.raises(RuntimeError):
+        with pool.checkout():
+            pass
+    with pool.checkout() as detector:
+        assert isinstance(detector, Detector)
+
+
+def test_classifier_is_loaded_once():
+    """Test that every config shares a single classifier load."""
+    loads = []
+    manager = ResourceManager(lambda: loads.append(1) or object(), Detector, 1)
+    assert manager.classifier is manager.classifier
+    assert len(loads) == 1
+    stats = manager.stats()
+    assert stats["model_loaded"]
+    assert stats["hands_pool"]["size"] == 1
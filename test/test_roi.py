@@ -0,0 +1,94 @@
+"""Simple tests for the region-of-interest tracker."""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from hand_signs_engine.features import extract_features
+from hand_signs_engine.roi import RoiTracker
+
+
+def make_hand(points):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y in points])
+
+
+def test_downscale_keeps_aspect_ratio():
+    """Test that large frames are resized to the working width."""
+    tracker = RoiTracker(working_width=640)
+    image = np.zeros((720, 1280, 3), dtype=np.uint8)
+    assert tracker.downscale(image).shape == (360, 640, 3)
+
+
+def test_small_frames_are_not_resized():
+    """Test that frames below the working width are passed through."""
+    tracker = RoiTracker(working_width=640)
+    image = np.zeros((240, 320, 3), dtype=np.uint8)
+    assert tracker.downscale(image) is image
+
+
+def test_prepare_without_region_uses_whole_frame():
+    """Test that the whole frame is searched until a hand was tracked."""
+    detect_image, roi = RoiTracker().prepare(np.zeros((480, 640, 3), np.uint8))
+    assert roi is None
+    assert detect_image.shape == (480, 640, 3)
+
+
+def test_update_pads_bounding_box():
+    """Test that the tracked region is the padded landmark bounding box."""
+    tracker = RoiTracker(padding=0.5, min_size=0.0)
+    features, origin = extract_features([make_hand([(0.4, 0.4)] * 20 + [(0.6, 0.5)])])
+    tracker.update(features, origin)
+    np.testing.assert_allclose(tracker.roi, (0.3, 0.35, 0.7, 0.55), atol=1e-6)
+
+
+def test_region_is_clamped_and_has_min_size():
+    """Test that tiny hands at the border get a clamped min-size region."""
+    tracker = RoiTracker(padding=0.0, min_size=0.2)
+    features, origin = extract_features([make_hand([(0.0, 0.5)] * 21)])
+    tracker.update(features, origin)
+    np.testing.assert_allclose(tracker.roi, (0.0, 0.4, 0.1, 0.6), atol=1e-6)
+
+
+def test_region_outside_frame_is_not_inverted():
+    """Test that landmarks beyond the border give ordered bounds."""
+    tracker = RoiTracker(padding=0.5, min_size=0.0)
+    features, origin = extract_features([make_hand([(1.2, 0.5)] * 20 + [(1.4, 0.6)])])
+    tracker.update(features, origin)
+    x0, y0, x1, y1 = tracker.roi
+    assert 0.0 <= x0 <= x1 <= 1.0
+    assert 0.0 <= y0 <= y1 <= 1.0
+
+
+def test_tiny_region_falls_back_to_whole_frame():
+    """Test that an empty or few-pixel region searches the whole frame."""
+    tracker = RoiTracker()
+    tracker.roi = (1.0, 0.4, 1.0, 0.6)
+    detect_image, roi = tracker.prepare(np.zeros((480, 640, 3), np.uint8))
+    assert roi is None
+    assert detect_image.shape == (480, 640, 3)
+
+
+def test_prepare_crops_to_region():
+    """Test that the detection image is a contiguous crop of the region."""
+    tracker = RoiTracker()
+    tracker.roi = (0.25, 0.5, 0.75, 1.0)
+    detect_image, roi = tracker.prepare(np.zeros((480, 640, 3), np.uint8))
+    assert detect_image.shape == (240, 320, 3)
+    assert detect_image.flags["C_CONTIGUOUS"]
+    assert roi == (0.25, 0.5, 0.75, 1.0)
+    detect_image, roi = tracker.prepare(
+        np.zeros((480, 640, 3), np.uint8), full_frame=True
+    )
+    assert roi is None
+
+
+def test_region_landmarks_map_to_full_frame():
+    """Test that landmarks found in a region match full-frame features."""
+    roi = (0.2, 0.4, 0.6, 0.8)
+    full = [(0.3 + i * 0.01, 0.5 + i * 0.005) for i in range(21)]
+    relative = [((x - 0.2) / 0.4, (y - 0.4) / 0.4) for x, y in full]
+
+    expected, expected_origin = extract_features([make_hand(full)])
+    features, origin = extract_features([make_hand(relative)], roi=roi)
+    np.testing.assert_allclose(features, expected, atol=1e-6)
+    np.testing.assert_allclose(origin, expected_origin, atol=1e-6)
@@ -0,0 +1,97 @@
+"""Simple tests for the adaptive prediction scheduler."""
+
+import numpy as np
+
+from hand_signs_engine.classifier import Prediction
+from hand_signs_engine.scheduler import AdaptiveScheduler, InferenceBudget
+
+
+def prediction(class_id):
+    return Prediction(class_id, 0.9, np.zeros(29))
+
+
+def count_predictions(scheduler, motion, frames=100):
+    return sum(
+        scheduler.should_predict(motion) and scheduler.start_inference()
+        for _ in range(frames)
+    )
+
+
+def test_still_hand_backs_off():
+    """Test that a static hand is predicted less often than every 10th frame."""
+    scheduler = AdaptiveScheduler()
+    assert count_predictions(scheduler, motion=0.0) < 10
+    assert scheduler.interval == scheduler.max_interval
+
+
+def test_moving_hand_is_predicted_often():
+    """Test that a moving hand is predicted every min_interval frames."""
+    scheduler = AdaptiveScheduler(min_interval=2)
+    assert count_predictions(scheduler, motion=0.1) == 50
+
+
+def test_moving_hand_with_agreeing_predictions_backs_off():
+    """Test that agreeing predictions back off for a slightly moving hand."""
+    scheduler = AdaptiveScheduler(min_interval=2, moving_max_interval=10)
+    predicted = 0
+    for _ in range(100):
+        if scheduler.should_predict(0.05) and scheduler.start_inference():
+            predicted += 1
+            scheduler.record_prediction(prediction(3))
+    assert predicted < 20
+    assert scheduler.interval == scheduler.moving_max_interval
+
+
+def test_sign_change_motion_resets_interval():
+    """Test that a jump of the landmarks resets the interval."""
+    scheduler = AdaptiveScheduler()
+    for _ in range(3):
+        scheduler.record_prediction(prediction(3))
+    count_predictions(scheduler, motion=0.01)
+    assert scheduler.interval == scheduler.max_interval
+
+    scheduler.should_predict(0.3)
+    assert scheduler.interval == scheduler.min_interval
+
+
+def test_class_change_resets_interval():
+    """Test that a new predicted class makes the scheduler react quickly."""
+    scheduler = AdaptiveScheduler()
+    scheduler.record_prediction(prediction(3))
+    count_predictions(scheduler, motion=0.0)
+    scheduler.record_prediction(prediction(3))
+    assert scheduler.interval == scheduler.max_interval
+
+    scheduler.record_prediction(prediction(5))
+    assert scheduler.interval == scheduler.min_interval
+
+
+def test_exhausted_budget_blocks_predictions():
+    """Test that the process budget caps predictions of all sessions."""
+    budget = InferenceBudget(cpu_fraction=0.001)
+    budget.charge(1.0)
+    scheduler = AdaptiveScheduler(budget=budget)
+    assert count_predictions(scheduler, motion=0.1) == 0
+    assert budget.stats()["denied"] > 0
+
+
+def test_effective_rate_is_reported():
+    """Test that the scheduler reports its prediction rate."""
+    scheduler = AdaptiveScheduler(min_interval=1)
+    count_predictions(scheduler, motion=0.1, frames=10)
+    assert scheduler.stats()["inferences"] == 10
+    assert scheduler.effective_rate() > 0
+
+
+def test_reuse_is_not_an_inference():
+    """Test that reusing the last prediction uses no budget and no rate."""
+    budget = InferenceBudget()
+    scheduler = AdaptiveScheduler(budget=budget, min_interval=1)
+    for _ in range(10):
+        if scheduler.should_predict(0.0):
+            scheduler.record_reuse()
+    stats = scheduler.stats()
+    assert stats["reuses"] > 0
+    assert stats["inferences"] == 0
+    assert scheduler.effective_rate() == 0.0
+    assert budget.stats()["granted"] == 0
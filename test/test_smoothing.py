@@ -0,0 +1,61 @@
+"""Simple tests for the temporal smoothing of predictions."""
+
+import numpy as np
+import pytest
+
+from hand_signs_engine.smoothing import PredictionSmoother
+from hand_signs_recognition.prediction_state import PredictionState
+
+CLASS_IDS = np.array([0, 6, 12])
+
+
+def proba(*values):
+    return np.array(values, dtype=np.float32)
+
+
+def test_class_becomes_stable_after_consistent_predictions():
+    """Test that a single frame is not enough, a few agreeing ones are."""
+    smoother = PredictionSmoother(alpha=0.3)
+    assert not smoother.update(CLASS_IDS, proba(0.7, 0.2, 0.1))
+    assert smoother.stable() is None
+
+    changed = [smoother.update(CLASS_IDS, proba(0.1, 0.9, 0.0)) for _ in range(5)]
+
+    assert any(changed)
+    stable = smoother.stable()
+    assert stable.class_id == 6
+    assert stable.confidence >= 0.6
+    assert stable.support == pytest.approx(5 / 6)
+
+
+def test_hysteresis_ignores_a_single_outlier():
+    """Test that one disagreeing frame does not flip the stable class."""
+    smoother = PredictionSmoother()
+    for _ in range(10):
+        smoother.update(CLASS_IDS, proba(0.05, 0.9, 0.05))
+
+    assert not smoother.update(CLASS_IDS, proba(0.1, 0.1, 0.8))
+    assert smoother.stable().class_id == 6
+
+
+def test_new_model_columns_start_over():
+    """Test that predictions of a swapped model are not mixed with old ones."""
+    smoother = PredictionSmoother()
+    for _ in range(10):
+        smoother.update(CLASS_IDS, proba(0.05, 0.9, 0.05))
+
+    smoother.update(np.array([0, 6, 12, 28]), proba(0.7, 0.1, 0.1, 0.1))
+
+    assert smoother.count == 1
+    assert smoother.stable() is None
+
+
+def test_prediction_state_exposes_stable_prediction():
+    """Test the thread-safe smoothing methods of the prediction state."""
+    state = PredictionState()
+    for _ in range(5):
+        state.add_prediction(CLASS_IDS, proba(0.0, 0.1, 0.9))
+    assert state.get_stable_prediction().class_id == 12
+
+    assert state.reset_smoothing()
+    assert state.get_stable_prediction() is None